@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+适配器清洗基准：旧的逐条 re.sub 链 vs 编译后的 CleanupRules。
+
+用法:
+  python3 scripts/bench_adapter_rules.py [--kb 200] [--rounds 20]
+
+旧链原样保留在本文件（从迁移前的 transform() 复制），
+同时校验两种实现输出一致，不一致的适配器会标出来（EXPECTED_DIFF 为已知的有意差异）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from spider.adapters.finance import (
+    BloombergAdapter,
+    FTAdapter,
+    InvestingAdapter,
+    MyfxbookAdapter,
+    WSJAdapter,
+    YahooFinanceAdapter,
+)
+from spider.adapters.news import BBCAdapter, CNBCAdapter, Jin10Adapter, ReutersAdapter
+from spider.adapters.social import MediumAdapter, RedditAdapter, Trends24Adapter
+from spider.adapters.tech import HackerNewsAdapter, TechCrunchAdapter, TheVergeAdapter, WikipediaAdapter
+
+_BBC_NAV = r"(?:^|\n)\s*\[(?:Home|News|Sport|Business|Technology|Health|Culture|Arts|Travel|Earth|Audio|Video|Live|Weather|Newsletters)\]\([^\)]+\)\s*\n?"
+
+# 迁移前的 transform() 正则链（不含长度判断等非清洗逻辑）
+LEGACY: dict[str, list[tuple[str, str, int]]] = {
+    "investing": [
+        (r"(?:Download the App|Install|Sign In|Join for free)[^\n]*\n?", "", 0),
+        (r"(?:Advertisement|Advertise)[^\n]*\n?", "", 0),
+    ],
+    "yahoo_finance": [(r"(?:Sign in|Try the app|Get the app|Yahoo Finance Plus)[^\n]*\n?", "", 0)],
+    "myfxbook": [(r"(?:Join|Login|Register|Sign Up|Free Sign Up)[^\n]*\n?", "", 0)],
+    "bloomberg": [(r"(?:Subscribe|Sign In|Already a subscriber)[^\n]*\n?", "", 0)],
+    "wsj": [(r"(?:Subscribe|Sign In|Already a member)[^\n]*\n?", "", 0)],
+    "ft": [(r"(?:Subscribe|Sign In|Already a subscriber|Try for \$1)[^\n]*\n?", "", 0)],
+    "bbc": [(r"Advertisement\s*\n", "", 0), (_BBC_NAV, "\n", 0)],
+    "cnbc": [(r"\[Skip Navigation\][^\n]*\n?", "", 0)],
+    "reuters": [],
+    "jin10": [(r"(?:下载APP|扫码下载|开通VIP|免费试用)[^\n]*\n?", "", 0)],
+    "reddit": [
+        (r"(?:Get the Reddit app|Log In|Sign Up|Get app)[^\n]*\n?", "", 0),
+        (r"(?:Share|Save|Hide|Report|More)\s*\n", "", 0),
+    ],
+    "trends24": [(r"# .* Trends for last.*\n+", "", 0), (r"### \d+ .* ago\n+", "", 0)],
+    "medium": [
+        (r"(?:Open in app|Sign up|Sign in|Member-only story|Get started)[^\n]*\n?", "", 0),
+        (r"(?:Follow|Clap|Share|Listen)[^\n]*\n?", "", 0),
+    ],
+    "techcrunch": [
+        (r"(?:Log in|Sign up|Newsletter|Subscribe)[^\n]*\n?", "", 0),
+        (r"(?:© 20\d\d TechCrunch)[^\n]*\n?", "", 0),
+    ],
+    "theverge": [(r"(?:The Verge homepage|Site search|Filed under)[^\n]*\n?", "", 0)],
+    "wikipedia": [
+        (r"\[edit\]", "", 0),
+        (r"\[\d+\]", "", 0),
+        (r"(?:From Wikipedia|Jump to navigation|Jump to search)[^\n]*\n?", "", 0),
+    ],
+    "hackernews": [
+        (r"\|[^\n]*\|", "", 0),
+        (r"^\s*-+\s*$", "", re.MULTILINE),
+        (r"\[hide\]\([^\)]+\)", "", 0),
+        (r"\[login\]\([^\)]+\)", "", 0),
+        (r"\[More\]\([^\)]+\)", "", 0),
+        (r"\d+\.\s*$", "", re.MULTILINE),
+    ],
+}
+
+# 已知的有意差异：旧链的 (?:^|\n) 会被上一处匹配吃掉换行，相邻导航行只删掉一半
+EXPECTED_DIFF = {"bbc"}
+
+ADAPTERS = [
+    InvestingAdapter(), YahooFinanceAdapter(), MyfxbookAdapter(), BloombergAdapter(), WSJAdapter(), FTAdapter(),
+    BBCAdapter(), CNBCAdapter(), ReutersAdapter(), Jin10Adapter(),
+    RedditAdapter(), Trends24Adapter(), MediumAdapter(),
+    TechCrunchAdapter(), TheVergeAdapter(), WikipediaAdapter(), HackerNewsAdapter(),
+]
+
+_NOISE = [
+    "Sign In to continue", "Subscribe now", "Advertisement", "[Home](https://bbc.com/)",
+    "[Skip Navigation](#main)", "下载APP 看更多", "Share", "More", "Get the app",
+    "| 1. | [Story](https://x.com) | 120 points |", "-----", "[hide](hide?id=1)",
+    "From Wikipedia, the free encyclopedia", "Filed under: Tech", "Follow", "", "",
+]
+
+
+def make_document(kb: int, seed: int = 7) -> str:
+    """造一份夹杂各站 UI 噪音的 markdown。"""
+    rng = random.Random(seed)
+    prose = "Markets rallied on Tuesday as investors weighed the latest inflation data [3] and earnings."
+    lines: list[str] = []
+    size = 0
+    while size < kb * 1024:
+        line = rng.choice(_NOISE) if rng.random() < 0.3 else prose
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def legacy_clean(name: str, md: str) -> str:
+    for pattern, repl, flags in LEGACY[name]:
+        md = re.sub(pattern, repl, md, flags=flags)
+    return re.sub(r"\n{3,}", "\n\n", md).strip()
+
+
+def _timeit(fn, rounds: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - t0) / rounds * 1000
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="适配器清洗规则基准")
+    p.add_argument("--kb", type=int, default=200, help="测试文档大小（KB）")
+    p.add_argument("--rounds", type=int, default=20)
+    args = p.parse_args()
+
+    doc = make_document(args.kb)
+    print(f"文档 {len(doc) / 1024:.0f} KB，每项 {args.rounds} 轮\n")
+    print(f"{'adapter':<15}{'legacy ms':>11}{'rules ms':>11}{'speedup':>9}  same")
+
+    total_legacy = total_rules = 0.0
+    for adapter in ADAPTERS:
+        rules = adapter.rules
+        assert rules is not None
+        rules.compile()  # 编译不计入
+        same = legacy_clean(adapter.name, doc) == rules.apply(doc)
+        legacy_ms = _timeit(lambda a=adapter: legacy_clean(a.name, doc), args.rounds)
+        rules_ms = _timeit(lambda r=rules: r.apply(doc), args.rounds)
+        total_legacy += legacy_ms
+        total_rules += rules_ms
+        mark = "✓" if same else ("≠ 预期" if adapter.name in EXPECTED_DIFF else "✗")
+        print(f"{adapter.name:<15}{legacy_ms:>11.2f}{rules_ms:>11.2f}{legacy_ms / rules_ms:>8.2f}x  {mark}")
+
+    print(f"\n{'total':<15}{total_legacy:>11.2f}{total_rules:>11.2f}{total_legacy / total_rules:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
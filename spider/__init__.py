@@ -4,14 +4,15 @@ juanjuan-spider 🕷️ — 通用网页爬取工具。
 快速使用:
     from spider import crawl
     result = await crawl("https://example.com")
+    results = await crawl_many(["https://en.wikipedia.org/wiki/Python", ...])
 """
 
 import logging
 
 from spider.core.result import CrawlResult
-from spider.main import crawl
+from spider.main import crawl, crawl_many
 
-__all__ = ["crawl", "CrawlResult"]
+__all__ = ["crawl", "crawl_many", "CrawlResult"]
 __version__ = "0.5.0"
 
 # 默认 NullHandler — 调用方决定日志配置
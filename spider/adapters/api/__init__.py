@@ -0,0 +1,71 @@
+"""
+站点结构化快速通道 — 适配器 fast_fetch() 的实现。
+
+每个模块把站点 URL 改写为 JSON/API 端点，经共享的 HttpEngine 拉取，
+再从结构化数据直接渲染 markdown，不经过浏览器和正文提取。
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Awaitable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from spider.core.result import CrawlResult
+
+if TYPE_CHECKING:
+    from spider.engines.http_engine import HttpEngine
+
+
+# 网络错误和数据结构不符（站点改版）
+_EXPECTED_ERRORS = (httpx.HTTPError, ValueError, LookupError, TypeError)
+
+
+@dataclass
+class ApiPage:
+    """快速通道渲染出的页面。"""
+
+    title: str
+    markdown: str
+    metadata: dict[str, Any] = field(default_factory=dict)
+    links: list[str] = field(default_factory=list)
+
+
+async def run(url: str, source: str, http: HttpEngine, pending: Awaitable[ApiPage]) -> CrawlResult:
+    """
+    执行一次快速通道，统一计时和错误处理。
+
+    网络错误和数据结构不符（站点改版）都返回 failed，由 crawl() 回退常规引擎。
+    """
+    t0 = time.monotonic()
+    try:
+        page: ApiPage | Exception = await pending
+    except _EXPECTED_ERRORS as e:
+        page = e
+    return to_result(url, source, http, page, int((time.monotonic() - t0) * 1000))
+
+
+def to_result(url: str, source: str, http: HttpEngine, page: ApiPage | Exception, duration_ms: int = 0) -> CrawlResult:
+    """ApiPage（或取该页时的异常）→ CrawlResult。批量快速通道逐条调用。"""
+    if isinstance(page, Exception):
+        return CrawlResult(
+            url=url,
+            engine=http.name,
+            status="failed",
+            error=f"{source}: {page}",
+            duration_ms=duration_ms,
+        )
+    return CrawlResult(
+        url=url,
+        title=page.title,
+        markdown=page.markdown,
+        fit_markdown=page.markdown,
+        links=page.links,
+        engine=http.name,
+        status="success" if page.markdown else "partial",
+        duration_ms=duration_ms,
+        metadata={**page.metadata, "fast_path": source},
+    )
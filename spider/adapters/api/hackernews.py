@@ -0,0 +1,254 @@
+"""
+Hacker News Firebase API — 列表页/帖子/用户页改写为 /v0/ JSON 端点。
+
+- /、/news、/newest、/best、/ask、/show、/jobs（?p=N 翻页）→ *stories.json + 逐条 item
+- /item?id=N   → 帖子（或评论）+ 评论树
+- /user?id=X   → 用户资料 + 最近提交
+
+API 每个条目一个请求，条目 ID 通过共享 HttpEngine client 并发拉取（Semaphore 限流）。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qs, urlsplit
+
+from markdownify import markdownify
+
+from spider.adapters.api import ApiPage
+
+if TYPE_CHECKING:
+    from spider.core.engine import FetchConfig
+    from spider.engines.http_engine import HttpEngine
+
+logger = logging.getLogger("spider.adapters")
+
+API = "https://hacker-news.firebaseio.com/v0"
+SITE = "https://news.ycombinator.com"
+PAGE_SIZE = 30  # 与网页版每页条数一致
+
+# 网页路径 → 列表端点
+_LISTS = {
+    "/": "topstories",
+    "/news": "topstories",
+    "/newest": "newstories",
+    "/best": "beststories",
+    "/ask": "askstories",
+    "/show": "showstories",
+    "/jobs": "jobstories",
+}
+
+
+def resolve(url: str) -> tuple[str, str, int] | None:
+    """URL → (类型, 参数, 页码)：("list", "topstories", 1) / ("item", "123", 1) / ("user", "pg", 1)。"""
+    parts = urlsplit(url)
+    query = parse_qs(parts.query)
+    path = parts.path.rstrip("/") or "/"
+    if path in _LISTS:
+        page = query.get("p", ["1"])[0]
+        return ("list", _LISTS[path], int(page) if page.isdigit() and int(page) > 0 else 1)
+    if path == "/item" and query.get("id", [""])[0].isdigit():
+        return ("item", query["id"][0], 1)
+    if path == "/user" and query.get("id"):
+        return ("user", query["id"][0], 1)
+    return None
+
+
+class _Client:
+    """条目拉取：共享 client + 并发上限。单个条目失败只记日志并跳过，不拖垮整页。"""
+
+    def __init__(self, http: HttpEngine, config: FetchConfig, concurrency: int):
+        self._http = http
+        self._config = config
+        self._sem = asyncio.Semaphore(concurrency)
+
+    async def get(self, path: str) -> Any:
+        async with self._sem:
+            return await self._http.get_json(f"{API}/{path}.json", self._config)
+
+    async def items(self, ids: list[int]) -> list[dict]:
+        """并发拉取一批条目，保持原顺序，丢掉失败/已删除/dead 的。"""
+        fetched = await asyncio.gather(*(self.get(f"item/{i}") for i in ids), return_exceptions=True)
+        out = []
+        for item_id, item in zip(ids, fetched, strict=True):
+            if isinstance(item, BaseException):
+                logger.debug("hn item %s failed: %s", item_id, item)
+            elif item and not item.get("deleted") and not item.get("dead"):
+                out.append(item)
+        return out
+
+
+async def fetch(
+    url: str,
+    config: FetchConfig,
+    http: HttpEngine,
+    *,
+    max_items: int = PAGE_SIZE,
+    max_comments: int = 200,
+    max_depth: int = 6,
+    concurrency: int = 16,
+) -> ApiPage:
+    target = resolve(url)
+    if target is None:
+        raise ValueError(f"not a hacker news list/item/user url: {url}")
+    kind, arg, page = target
+    client = _Client(http, config, concurrency)
+
+    if kind == "list":
+        ids = await client.get(arg)
+        start = (page - 1) * PAGE_SIZE
+        items = await client.items(ids[start:start + max_items])
+        return render_list(arg, items, start=start + 1)
+
+    if kind == "item":
+        root = await client.get(f"item/{arg}")
+        if not root:
+            raise LookupError(f"hn: no item {arg}")
+        comments = await _comment_tree(client, root, max_comments, max_depth)
+        return render_item(root, comments)
+
+    user = await client.get(f"user/{arg}")
+    if not user:
+        raise LookupError(f"hn: no user {arg}")
+    submitted = await client.items(user.get("submitted", [])[:max_items])
+    return render_user(user, submitted)
+
+
+async def _comment_tree(client: _Client, root: dict, budget: int, max_depth: int) -> dict[int, dict]:
+    """
+    按层并发拉评论：每层一次 gather，层数受 max_depth、总数受 budget 限制。
+
+    返回 {id: comment}，渲染时按各自的 kids 顺序组树。
+    """
+    comments: dict[int, dict] = {}
+    level = root.get("kids", [])
+    for _ in range(max_depth):
+        level = level[: budget - len(comments)]
+        if not level:
+            break
+        fetched = await client.items(level)
+        comments.update((c["id"], c) for c in fetched)
+        level = [k for c in fetched for k in c.get("kids", [])]
+    return comments
+
+
+# --- 渲染 ---
+
+
+def render_list(endpoint: str, items: list[dict], *, start: int = 1) -> ApiPage:
+    title = f"Hacker News — {endpoint.removesuffix('stories')}"
+    lines = [f"# {title}", ""]
+    links: list[str] = []
+    for n, item in enumerate(items, start):
+        link = item.get("url") or _item_url(item["id"])
+        links.append(link)
+        lines.append(f"{n}. [{item.get('title', '')}]({link}) — {_byline(item)}")
+    return ApiPage(
+        title=title,
+        markdown="\n".join(lines).strip(),
+        metadata={"list": endpoint, "items": len(items)},
+        links=links,
+    )
+
+
+def render_item(root: dict, comments: dict[int, dict]) -> ApiPage:
+    title = root.get("title") or f"Comment by {root.get('by', '')}"
+    lines = [f"# {title}", "", _byline(root), ""]
+    if root.get("url"):
+        lines += [f"Link: {root['url']}", ""]
+    if root.get("text"):
+        lines += [_html(root["text"]), ""]
+
+    rendered: list[str] = []
+    _render_comments(root.get("kids", []), comments, 0, rendered)
+    if rendered:
+        lines += [f"## Comments ({root.get('descendants', len(rendered))})", "", *rendered]
+
+    links = [_item_url(root["id"])]
+    if root.get("url"):
+        links.append(root["url"])
+    return ApiPage(
+        title=title,
+        markdown="\n".join(lines).strip(),
+        metadata={
+            "item_id": root["id"],
+            "type": root.get("type", ""),
+            "author": root.get("by", ""),
+            "score": root.get("score", 0),
+            "num_comments": root.get("descendants", 0),
+            "date": _iso(root.get("time")),
+            "comments_rendered": len(rendered),
+        },
+        links=links,
+    )
+
+
+def _render_comments(kids: list[int], comments: dict[int, dict], depth: int, out: list[str]) -> None:
+    indent = "  " * depth
+    for kid in kids:
+        c = comments.get(kid)
+        if c is None:
+            continue  # 超出预算/深度，或已删除
+        body = _continue_lines(_html(c.get("text", "")), indent + "  ")
+        out.append(f"{indent}- **{c.get('by', '')}** ({_iso(c.get('time'))}): {body}")
+        _render_comments(c.get("kids", []), comments, depth + 1, out)
+
+
+def render_user(user: dict, submitted: list[dict]) -> ApiPage:
+    title = f"User {user['id']}"
+    lines = [f"# {title}", "", f"karma {user.get('karma', 0)} · created {_iso(user.get('created'))}", ""]
+    if user.get("about"):
+        lines += [_html(user["about"]), ""]
+    links: list[str] = []
+    if submitted:
+        lines += ["## Recent submissions", ""]
+        for item in submitted:
+            link = _item_url(item["id"])
+            links.append(link)
+            if item.get("type") == "comment":
+                text = _html(item.get("text", "")).replace("\n", " ")
+                lines.append(f"- [comment]({link}): {text[:200]}")
+            else:
+                lines.append(f"- [{item.get('title', '')}]({link}) — {_byline(item)}")
+    return ApiPage(
+        title=title,
+        markdown="\n".join(lines).strip(),
+        metadata={"user": user["id"], "karma": user.get("karma", 0)},
+        links=links,
+    )
+
+
+def _byline(item: dict) -> str:
+    parts = []
+    if "score" in item:
+        parts.append(f"{item['score']} points")
+    parts.append(f"by {item.get('by', '')}")
+    if item.get("time"):
+        parts.append(_iso(item["time"]))
+    if "descendants" in item:
+        parts.append(f"[{item['descendants']} comments]({_item_url(item['id'])})")
+    return " · ".join(parts)
+
+
+def _html(text: str) -> str:
+    """HN 的文本字段是 HTML 片段（<p>、<a>、<i>、<pre>）。"""
+    return markdownify(text).strip()
+
+
+def _continue_lines(text: str, pad: str) -> str:
+    """多段评论的续行缩进到列表项下（空行不加缩进）。"""
+    first, *rest = text.split("\n")
+    return "\n".join([first, *(pad + line if line else line for line in rest)])
+
+
+def _item_url(item_id: int | str) -> str:
+    return f"{SITE}/item?id={item_id}"
+
+
+def _iso(ts: int | None) -> str:
+    if not ts:
+        return ""
+    return datetime.fromtimestamp(ts, tz=UTC).strftime("%Y-%m-%d %H:%M UTC")
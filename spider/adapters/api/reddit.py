@@ -0,0 +1,174 @@
+"""
+Reddit JSON 端点 — 帖子/列表页 URL 加 .json，直接渲染 markdown。
+
+- /r/{sub}/comments/{id}/...          → 帖子正文 + 评论树
+- /、/r/{sub}/[hot|new|top|...]       → 帖子列表
+- /user/{name}/[submitted|comments]   → 用户的帖子/评论
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from spider.adapters.api import ApiPage
+
+if TYPE_CHECKING:
+    from spider.core.engine import FetchConfig
+    from spider.engines.http_engine import HttpEngine
+
+# Reddit 要求 JSON 请求带可识别的 UA，浏览器 UA / 默认 UA 容易被 429
+USER_AGENT = "juanjuan-spider/0.5 (+https://github.com/Ashersun1207/juanjuan-spider)"
+
+_SORTS = "hot|new|top|rising|best|controversial"
+_THREAD = re.compile(r"^/r/[^/]+/comments/[a-z0-9]+(?:/[^/]*)?(?:/[a-z0-9]+)?/?$", re.IGNORECASE)
+_LISTING = re.compile(
+    rf"^/(?:(?:{_SORTS})/?)?$"
+    rf"|^/r/[^/]+/?(?:(?:{_SORTS})/?)?$"
+    r"|^/u(?:ser)?/[^/]+/?(?:(?:submitted|comments|overview)/?)?$",
+    re.IGNORECASE,
+)
+
+
+def json_url(url: str) -> str | None:
+    """把帖子/列表页 URL 改写为 .json 端点；不支持的页面返回 None。"""
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    if path.endswith(".json"):
+        path = path[: -len(".json")] or "/"
+    if not (_THREAD.match(path) or _LISTING.match(path)):
+        return None
+
+    host = parts.netloc.lower()
+    if host in ("reddit.com", "m.reddit.com", "new.reddit.com"):
+        host = "www.reddit.com"
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k != "raw_json"]
+    query.append(("raw_json", "1"))  # 不转义 &amp; 等 HTML 实体
+    path = path.rstrip("/")
+    return urlunsplit(("https", host, f"{path}.json" if path else "/.json", urlencode(query), ""))
+
+
+async def fetch(
+    url: str,
+    config: FetchConfig,
+    http: HttpEngine,
+    *,
+    max_comments: int = 200,
+    max_depth: int = 8,
+) -> ApiPage:
+    """拉取 .json 并渲染。"""
+    api_url = json_url(url)
+    if api_url is None:
+        raise ValueError(f"not a reddit thread/listing url: {url}")
+    data = await http.get_json(api_url, config, headers={"User-Agent": USER_AGENT})
+    return render(data, max_comments=max_comments, max_depth=max_depth)
+
+
+def render(data: Any, *, max_comments: int = 200, max_depth: int = 8) -> ApiPage:
+    """帖子返回 [帖子 Listing, 评论 Listing]，列表页返回单个 Listing。"""
+    if isinstance(data, list):
+        return _render_thread(data, max_comments, max_depth)
+    if data.get("kind") == "Listing":
+        return _render_listing(data)
+    raise ValueError(f"unexpected reddit payload kind: {data.get('kind')!r}")
+
+
+def _render_thread(data: list, max_comments: int, max_depth: int) -> ApiPage:
+    post = data[0]["data"]["children"][0]["data"]
+    permalink = _abs(post.get("permalink", ""))
+
+    lines = [f"# {post['title']}", "", _post_byline(post), ""]
+    if not post.get("is_self") and post.get("url"):
+        lines += [f"Link: {post['url']}", ""]
+    if post.get("selftext"):
+        lines += [post["selftext"].strip(), ""]
+
+    comments = data[1]["data"]["children"] if len(data) > 1 else []
+    rendered: list[str] = []
+    _render_comments(comments, 0, max_depth, max_comments, rendered)
+    if rendered:
+        lines += [f"## Comments ({post.get('num_comments', len(rendered))})", "", *rendered]
+
+    links = [permalink]
+    if not post.get("is_self") and post.get("url"):
+        links.append(post["url"])
+
+    return ApiPage(
+        title=post["title"],
+        markdown="\n".join(lines).strip(),
+        metadata={
+            "subreddit": post.get("subreddit", ""),
+            "author": post.get("author", ""),
+            "score": post.get("score", 0),
+            "num_comments": post.get("num_comments", 0),
+            "date": _iso(post.get("created_utc")),
+            "post_id": post.get("id", ""),
+            "comments_rendered": len(rendered),
+        },
+        links=links,
+    )
+
+
+def _render_comments(children: list, depth: int, max_depth: int, budget: int, out: list[str]) -> None:
+    """深度优先渲染评论树为嵌套列表；out 达到 budget 条后停止。"""
+    indent = "  " * depth
+    for child in children:
+        if len(out) >= budget:
+            return
+        if child.get("kind") != "t1":
+            continue  # "more" 占位（折叠的评论）
+        c = child["data"]
+        body = (c.get("body") or "").strip().replace("\n", "\n" + indent + "  ")
+        out.append(f"{indent}- **u/{c.get('author', '[deleted]')}** ({c.get('score', 0)} points): {body}")
+        replies = c.get("replies")
+        if depth + 1 < max_depth and isinstance(replies, dict):
+            _render_comments(replies["data"]["children"], depth + 1, max_depth, budget, out)
+
+
+def _render_listing(data: dict) -> ApiPage:
+    children = data["data"]["children"]
+    subreddits = {c["data"].get("subreddit") for c in children if c.get("kind") == "t3"}
+    title = f"r/{subreddits.pop()}" if len(subreddits) == 1 else "Reddit"
+
+    lines = [f"# {title}", ""]
+    links: list[str] = []
+    for i, child in enumerate(children, 1):
+        d = child["data"]
+        link = _abs(d.get("permalink", ""))
+        links.append(link)
+        if child.get("kind") == "t3":
+            lines.append(f"{i}. [{d['title']}]({link}) — {_post_byline(d)}")
+        elif child.get("kind") == "t1":
+            body = (d.get("body") or "").strip().replace("\n", " ")
+            lines.append(f"{i}. u/{d.get('author', '')} on [{d.get('link_title', '')}]({link}): {body}")
+
+    return ApiPage(
+        title=title,
+        markdown="\n".join(lines).strip(),
+        metadata={"items": len(children), "after": data["data"].get("after")},
+        links=links,
+    )
+
+
+def _post_byline(post: dict) -> str:
+    parts = [
+        f"r/{post.get('subreddit', '')}",
+        f"u/{post.get('author', '[deleted]')}",
+        f"{post.get('score', 0)} points",
+        f"{post.get('num_comments', 0)} comments",
+    ]
+    if post.get("created_utc"):
+        parts.append(_iso(post["created_utc"]))
+    return " · ".join(parts)
+
+
+def _abs(permalink: str) -> str:
+    return f"https://www.reddit.com{permalink}" if permalink.startswith("/") else permalink
+
+
+def _iso(ts: float | None) -> str:
+    if not ts:
+        return ""
+    return datetime.fromtimestamp(ts, tz=UTC).strftime("%Y-%m-%d %H:%M UTC")
@@ -0,0 +1,284 @@
+"""
+Wikipedia API 端点 — 条目 URL 改写为 MediaWiki API，直接拿条目正文 HTML / 摘要。
+
+- parse 模式：action=parse 只返回正文 HTML（无皮肤/导航），可按章节取
+- summary 模式：REST page/summary 取导语纯文本
+
+批量（fetch_many）：summary 模式用 action=query&prop=extracts 一次请求最多 20 个标题；
+全文 extracts 不支持多标题，parse 模式改为有限并发的逐条 action=parse。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+from bs4 import BeautifulSoup
+from markdownify import MarkdownConverter
+
+from spider.adapters.api import ApiPage
+
+if TYPE_CHECKING:
+    from spider.core.engine import FetchConfig
+    from spider.engines.http_engine import HttpEngine
+
+# Wikimedia API 礼仪：带可识别的 UA；显式要求 gzip
+HEADERS = {
+    "Api-User-Agent": "juanjuan-spider/0.5 (+https://github.com/Ashersun1207/juanjuan-spider)",
+    "Accept-Encoding": "gzip",
+}
+
+BATCH_SIZE = 20  # prop=extracts 的 exlimit 上限
+PARSE_CONCURRENCY = 4  # parse 模式批量时的并发请求数
+
+# 不是条目正文的命名空间（parse 能解析但没意义 / 直接报错）
+_SKIP_NAMESPACES = ("Special:", "Media:", "File:", "Category:", "Template:", "Help:", "Portal:")
+
+# 正文里要丢掉的元素：引用角标、编辑链接、导航框、维护模板、参考文献列表
+_DROP_SELECTORS = (
+    "style", "script", "sup.reference", "span.mw-editsection", ".navbox", ".vertical-navbox",
+    ".metadata", ".noprint", ".mw-empty-elt", ".mw-references-wrap", "ol.references", ".reflist",
+)
+
+
+def parse_url(url: str) -> tuple[str, str] | None:
+    """条目 URL → (API 主机, 标题)；不是条目页返回 None。移动版主机归一到桌面版。"""
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    if not host.endswith("wikipedia.org"):
+        return None
+    host = host.replace(".m.wikipedia.org", ".wikipedia.org")
+    if host == "wikipedia.org":
+        return None  # 门户首页，没有条目
+
+    if parts.path.startswith("/wiki/"):
+        title = unquote(parts.path[len("/wiki/"):])
+    elif parts.path == "/w/index.php":
+        query = parse_qs(parts.query)
+        if query.get("action", ["view"])[0] != "view" or "oldid" in query:
+            return None
+        title = query.get("title", [""])[0]
+    else:
+        return None
+
+    title = title.replace("_", " ").strip()
+    if not title or title.startswith(_SKIP_NAMESPACES):
+        return None
+    return host, title
+
+
+def canonical_url(host: str, title: str) -> str:
+    return f"https://{host}/wiki/{quote(title.replace(' ', '_'), safe=':/()')}"
+
+
+async def fetch(
+    url: str,
+    config: FetchConfig,
+    http: HttpEngine,
+    *,
+    mode: str = "parse",
+    section: int | str | None = None,
+) -> ApiPage:
+    """取单个条目。section 可为章节序号或章节标题（仅 parse 模式）。"""
+    target = parse_url(url)
+    if target is None:
+        raise ValueError(f"not a wikipedia article url: {url}")
+    host, title = target
+    if mode == "summary":
+        return await _fetch_summary(host, title, config, http)
+    return await _fetch_parse(host, title, config, http, section)
+
+
+async def fetch_many(
+    urls: list[str],
+    config: FetchConfig,
+    http: HttpEngine,
+    *,
+    mode: str = "parse",
+) -> list[ApiPage | Exception | None]:
+    """
+    批量取条目，返回与 urls 一一对应的列表。
+
+    元素：ApiPage / 该条目的异常（缺失、网络错误）/ None（不是条目 URL）。
+    """
+    out: list[ApiPage | Exception | None] = [None] * len(urls)
+    targets = [parse_url(u) for u in urls]
+
+    if mode == "summary":
+        by_host: dict[str, list[int]] = defaultdict(list)
+        for i, target in enumerate(targets):
+            if target is not None:
+                by_host[target[0]].append(i)
+        for host, indices in by_host.items():
+            for chunk in _chunks(indices, BATCH_SIZE):
+                titles = [targets[i][1] for i in chunk]  # type: ignore[index]
+                try:
+                    pages = await _query_extracts(host, titles, config, http)
+                except Exception as e:
+                    for i in chunk:
+                        out[i] = e
+                    continue
+                for i, title in zip(chunk, titles, strict=True):
+                    out[i] = pages.get(title) or LookupError(f"wikipedia: missing page {title!r}")
+        return out
+
+    sem = asyncio.Semaphore(PARSE_CONCURRENCY)
+
+    async def one(i: int, host: str, title: str) -> None:
+        async with sem:
+            try:
+                out[i] = await _fetch_parse(host, title, config, http, None)
+            except Exception as e:
+                out[i] = e
+
+    await asyncio.gather(*(one(i, *t) for i, t in enumerate(targets) if t is not None))
+    return out
+
+
+# --- action=parse（全文 / 章节）---
+
+
+async def _fetch_parse(
+    host: str,
+    title: str,
+    config: FetchConfig,
+    http: HttpEngine,
+    section: int | str | None,
+) -> ApiPage:
+    params: dict[str, Any] = {
+        "action": "parse",
+        "page": title,
+        "prop": "text|sections|displaytitle",
+        "redirects": 1,
+        "disableeditsection": 1,
+        "disabletoc": 1,
+        "format": "json",
+        "formatversion": 2,
+    }
+    if isinstance(section, str):
+        section = await _section_index(host, title, section, config, http)
+    if section is not None:
+        params["section"] = section
+
+    data = await http.get_json(f"https://{host}/w/api.php", config, params=params, headers=HEADERS)
+    if "error" in data:
+        raise LookupError(f"wikipedia: {data['error'].get('info', data['error'])}")
+    parsed = data["parse"]
+    page_title = parsed["title"]
+    markdown = html_to_markdown(parsed["text"])
+    if section is None or section == 0:
+        markdown = f"# {page_title}\n\n{markdown}"
+
+    return ApiPage(
+        title=page_title,
+        markdown=markdown,
+        metadata={
+            "pageid": parsed.get("pageid"),
+            "sections": [s["line"] for s in parsed.get("sections", [])],
+            **({"section": section} if section is not None else {}),
+        },
+        links=[canonical_url(host, page_title)],
+    )
+
+
+async def _section_index(host: str, title: str, name: str, config: FetchConfig, http: HttpEngine) -> int:
+    """章节标题 → 章节序号（多一次轻量 prop=sections 请求）。"""
+    data = await http.get_json(
+        f"https://{host}/w/api.php",
+        config,
+        params={"action": "parse", "page": title, "prop": "sections", "redirects": 1,
+                "format": "json", "formatversion": 2},
+        headers=HEADERS,
+    )
+    wanted = name.replace("_", " ").casefold()
+    for s in data.get("parse", {}).get("sections", []):
+        if re.sub(r"<[^>]+>", "", s["line"]).casefold() == wanted:
+            return int(s["index"])
+    raise LookupError(f"wikipedia: no section {name!r} in {title!r}")
+
+
+def html_to_markdown(html: str) -> str:
+    """parse 输出的正文 HTML → markdown（先删掉引用角标、导航框等）。"""
+    soup = BeautifulSoup(html, "html.parser")
+    for el in soup.select(", ".join(_DROP_SELECTORS)):
+        el.decompose()
+    md = MarkdownConverter(heading_style="ATX").convert_soup(soup)
+    return re.sub(r"\n{3,}", "\n\n", md).strip()
+
+
+# --- 摘要（REST summary / 批量 extracts）---
+
+
+async def _fetch_summary(host: str, title: str, config: FetchConfig, http: HttpEngine) -> ApiPage:
+    data = await http.get_json(
+        f"https://{host}/api/rest_v1/page/summary/{quote(title.replace(' ', '_'), safe='')}",
+        config,
+        headers=HEADERS,
+    )
+    page_title = data.get("title", title)
+    lines = [f"# {page_title}", ""]
+    if data.get("description"):
+        lines += [f"*{data['description']}*", ""]
+    lines.append(data.get("extract", ""))
+    return ApiPage(
+        title=page_title,
+        markdown="\n".join(lines).strip(),
+        metadata={"pageid": data.get("pageid"), "description": data.get("description", "")},
+        links=[data.get("content_urls", {}).get("desktop", {}).get("page") or canonical_url(host, page_title)],
+    )
+
+
+async def _query_extracts(host: str, titles: list[str], config: FetchConfig, http: HttpEngine) -> dict[str, ApiPage]:
+    """一次请求取多个条目的导语，返回 {请求的标题: ApiPage}（经过规范化/重定向映射）。"""
+    data = await http.get_json(
+        f"https://{host}/w/api.php",
+        config,
+        params={
+            "action": "query",
+            "prop": "extracts|description",
+            "exintro": 1,
+            "explaintext": 1,
+            "exlimit": "max",
+            "redirects": 1,
+            "titles": "|".join(titles),
+            "format": "json",
+            "formatversion": 2,
+        },
+        headers=HEADERS,
+    )
+    query = data.get("query", {})
+    # 请求标题 → 最终标题：先规范化（首字母大写、下划线），再跟随重定向
+    alias = {n["from"]: n["to"] for n in query.get("normalized", [])}
+    redirects = {r["from"]: r["to"] for r in query.get("redirects", [])}
+
+    pages: dict[str, ApiPage] = {}
+    for p in query.get("pages", []):
+        if p.get("missing") or p.get("invalid"):
+            continue
+        lines = [f"# {p['title']}", ""]
+        if p.get("description"):
+            lines += [f"*{p['description']}*", ""]
+        lines.append(p.get("extract", ""))
+        pages[p["title"]] = ApiPage(
+            title=p["title"],
+            markdown="\n".join(lines).strip(),
+            metadata={"pageid": p.get("pageid"), "description": p.get("description", "")},
+            links=[canonical_url(host, p["title"])],
+        )
+
+    result: dict[str, ApiPage] = {}
+    for title in titles:
+        final = alias.get(title, title)
+        final = redirects.get(final, final)
+        if final in pages:
+            result[title] = pages[final]
+    return result
+
+
+def _chunks(items: list[int], size: int) -> Iterable[list[int]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
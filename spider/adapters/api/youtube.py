@@ -0,0 +1,226 @@
+"""
+YouTube 页面内嵌 JSON — 静态 HTML 里就有 ytInitialPlayerResponse / ytInitialData，不用浏览器渲染。
+
+- /watch?v=、youtu.be/、/shorts/、/live/、/embed/  → 视频：标题、简介、频道、时长、播放量、章节
+- /@handle、/channel/UC…、/c/…、/user/…          → 频道：简介 + 最新视频列表（/videos 标签页）
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qs, urlsplit
+
+from spider.adapters.api import ApiPage
+
+if TYPE_CHECKING:
+    from spider.core.engine import FetchConfig
+    from spider.engines.http_engine import HttpEngine
+
+SITE = "https://www.youtube.com"
+
+# 固定英文界面（数字/日期格式稳定）
+HEADERS = {"Accept-Language": "en-US,en;q=0.9"}
+# CONSENT 跳过欧盟 cookie 同意页（并进 jar，不顶掉 cookie 文件 / Set-Cookie 给的会话）
+COOKIES = {"CONSENT": "YES+1"}
+
+_VIDEO_ID = re.compile(r"^[\w-]{11}$")
+_VIDEO_PATH = re.compile(r"^/(?:shorts|live|embed)/([\w-]{11})")
+_CHANNEL_PATH = re.compile(r"^/(@[^/]+|channel/UC[\w-]+|c/[^/]+|user/[^/]+)(?:/(?:videos|featured|about))?/?$")
+# 简介里的章节时间戳行："0:00 Intro" / "1:02:03 - Outro"
+_TIMESTAMP_LINE = re.compile(r"^\s*\(?((?:\d{1,2}:)?\d{1,2}:\d{2})\)?\s*[-–—:]?\s*(.+?)\s*$", re.MULTILINE)
+
+
+def resolve(url: str) -> tuple[str, str] | None:
+    """URL → ("video", 视频 ID) / ("channel", 频道路径)；其他页面返回 None。"""
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    if host == "youtu.be":
+        video_id = parts.path.strip("/")
+        return ("video", video_id) if _VIDEO_ID.match(video_id) else None
+    if not (host == "youtube.com" or host.endswith(".youtube.com")):
+        return None
+    if parts.path == "/watch":
+        video_id = parse_qs(parts.query).get("v", [""])[0]
+        return ("video", video_id) if _VIDEO_ID.match(video_id) else None
+    if m := _VIDEO_PATH.match(parts.path):
+        return ("video", m.group(1))
+    if m := _CHANNEL_PATH.match(parts.path):
+        return ("channel", m.group(1))
+    return None
+
+
+async def fetch(url: str, config: FetchConfig, http: HttpEngine, *, max_videos: int = 30) -> ApiPage:
+    target = resolve(url)
+    if target is None:
+        raise ValueError(f"not a youtube video/channel url: {url}")
+    kind, key = target
+    if kind == "video":
+        resp = await http.get(f"{SITE}/watch", config, params={"v": key, "hl": "en"}, headers=HEADERS, cookies=COOKIES)
+        return render_video(
+            embedded_json(resp.text, "ytInitialPlayerResponse"),
+            embedded_json(resp.text, "ytInitialData"),
+        )
+    resp = await http.get(f"{SITE}/{key}/videos", config, params={"hl": "en"}, headers=HEADERS, cookies=COOKIES)
+    data = embedded_json(resp.text, "ytInitialData")
+    if data is None:
+        raise LookupError("youtube: no ytInitialData on channel page")
+    return render_channel(data, max_videos=max_videos)
+
+
+def embedded_json(html: str, name: str) -> dict | None:
+    """
+    取页面脚本里 `var name = {...};` / `window["name"] = {...};` 的 JSON 对象。
+
+    raw_decode 只解析对象本身，不受后续脚本影响。
+    """
+    m = re.search(rf"\b{name}(?:\"\])?\s*=\s*\{{", html)
+    if m is None:
+        return None
+    obj, _ = json.JSONDecoder().raw_decode(html, m.end() - 1)
+    return obj
+
+
+# --- 视频 ---
+
+
+def render_video(player: dict | None, data: dict | None) -> ApiPage:
+    details = (player or {}).get("videoDetails")
+    if not details:
+        status = (player or {}).get("playabilityStatus", {})
+        raise LookupError(f"youtube: no videoDetails ({status.get('status', 'no player response')})")
+
+    video_id = details["videoId"]
+    micro = (player or {}).get("microformat", {}).get("playerMicroformatRenderer", {})
+    description = details.get("shortDescription", "")
+    length = int(details.get("lengthSeconds") or 0)
+    views = int(details.get("viewCount") or 0)
+    chapters = _chapters(data) or _description_chapters(description)
+
+    byline = [details.get("author", ""), _duration(length) if length else "", f"{views:,} views"]
+    if micro.get("publishDate"):
+        byline.append(micro["publishDate"][:10])
+    lines = [f"# {details['title']}", "", " · ".join(p for p in byline if p), ""]
+    if chapters:
+        lines += ["## Chapters", ""]
+        lines += [f"- [{_duration(c['start'])}]({SITE}/watch?v={video_id}&t={c['start']}s) {c['title']}" for c in chapters]
+        lines.append("")
+    if description:
+        lines += ["## Description", "", description.strip()]
+
+    return ApiPage(
+        title=details["title"],
+        markdown="\n".join(lines).strip(),
+        metadata={
+            "video_id": video_id,
+            "channel": details.get("author", ""),
+            "channel_id": details.get("channelId", ""),
+            "duration_seconds": length,
+            "view_count": views,
+            "publish_date": micro.get("publishDate", ""),
+            "category": micro.get("category", ""),
+            "keywords": details.get("keywords", []),
+            "is_live": bool(details.get("isLiveContent")),
+            "chapters": chapters,
+        },
+        links=[f"{SITE}/watch?v={video_id}", f"{SITE}/channel/{details.get('channelId', '')}"],
+    )
+
+
+def _chapters(data: dict | None) -> list[dict]:
+    """播放器进度条上的章节（chapterRenderer），没有则返回空列表。"""
+    # 同一组章节可能在多个 markersMap 里重复出现，按起始时间去重
+    chapters: dict[int, str] = {}
+    for c in _walk(data, "chapterRenderer"):
+        chapters.setdefault(int(c.get("timeRangeStartMillis", 0)) // 1000, _text(c.get("title")))
+    return [{"start": start, "title": title} for start, title in sorted(chapters.items())]
+
+
+def _description_chapters(description: str) -> list[dict]:
+    """简介里的时间戳列表。按 YouTube 的规则：从 0:00 开始、至少 3 条才算章节。"""
+    chapters = [{"start": _seconds(ts), "title": title} for ts, title in _TIMESTAMP_LINE.findall(description)]
+    if len(chapters) < 3 or chapters[0]["start"] != 0:
+        return []
+    return chapters
+
+
+# --- 频道 ---
+
+
+def render_channel(data: dict, *, max_videos: int = 30) -> ApiPage:
+    meta = data.get("metadata", {}).get("channelMetadataRenderer", {})
+    title = meta.get("title") or "YouTube channel"
+    subscribers = next((_text(s) for s in _walk(data, "subscriberCountText")), "")
+
+    videos = []
+    for v in _walk(data, "videoRenderer", "gridVideoRenderer"):
+        if "videoId" in v:
+            videos.append(v)
+        if len(videos) >= max_videos:
+            break
+
+    lines = [f"# {title}", ""]
+    if subscribers:
+        lines += [subscribers, ""]
+    if meta.get("description"):
+        lines += [meta["description"].strip(), ""]
+    links: list[str] = []
+    if videos:
+        lines += ["## Videos", ""]
+        for v in videos:
+            link = f"{SITE}/watch?v={v['videoId']}"
+            links.append(link)
+            info = [_text(v.get(k)) for k in ("lengthText", "viewCountText", "publishedTimeText")]
+            lines.append(f"- [{_text(v.get('title'))}]({link}) — {' · '.join(i for i in info if i)}")
+
+    return ApiPage(
+        title=title,
+        markdown="\n".join(lines).strip(),
+        metadata={
+            "channel_id": meta.get("externalId", ""),
+            "channel_url": meta.get("vanityChannelUrl") or meta.get("channelUrl", ""),
+            "subscribers": subscribers,
+            "videos": len(videos),
+        },
+        links=links,
+    )
+
+
+# --- 工具 ---
+
+
+def _walk(obj: Any, *keys: str) -> Iterator[dict]:
+    """深度优先找出所有指定 key 下的对象（ytInitialData 结构经常调整，不写死路径）。"""
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            if k in keys and isinstance(v, dict):
+                yield v
+            else:
+                yield from _walk(v, *keys)
+    elif isinstance(obj, list):
+        for v in obj:
+            yield from _walk(v, *keys)
+
+
+def _text(obj: Any) -> str:
+    """YouTube 文本对象：{"simpleText": ...} 或 {"runs": [{"text": ...}]}。"""
+    if not isinstance(obj, dict):
+        return ""
+    if "simpleText" in obj:
+        return obj["simpleText"]
+    return "".join(r.get("text", "") for r in obj.get("runs", []))
+
+
+def _seconds(ts: str) -> int:
+    total = 0
+    for part in ts.split(":"):
+        total = total * 60 + int(part)
+    return total
+
+
+def _duration(seconds: int) -> str:
+    h, rem = divmod(seconds, 3600)
+    m, s = divmod(rem, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
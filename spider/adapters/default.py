@@ -7,11 +7,17 @@
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 
+from spider.adapters.rules import CleanupRules
 from spider.core.engine import FetchConfig
 from spider.core.result import CrawlResult
 
+if TYPE_CHECKING:
+    from spider.engines.http_engine import HttpEngine
+
 
 @dataclass
 class DefaultAdapter:
@@ -38,6 +44,18 @@ class DefaultAdapter:
     js_code: str | None = None  # 页面加载后执行的 JS
     scroll: bool = False  # 是否自动滚动
     extra_wait: float = 0  # 额外等待秒数
+    rules: CleanupRules | None = None  # 声明式清洗规则（transform 默认执行）
+    # 引擎偏好 + 回退链："http" / "browser"，按顺序尝试，前一个失败才用下一个。
+    # 例：("http",) 只走 HTTP；("http", "browser") 先 HTTP 再浏览器；("browser",) 只走浏览器。
+    # 空 = 交给 Router 按域名判断。
+    engines: tuple[str, ...] = ()
+    # 抓包模式（浏览器引擎）：记录 URL 匹配这些正则的 XHR/fetch JSON 响应到 metadata["xhr"]，
+    # 抓到 capture_min 个即结束页面（不滚动、不等 extra_wait），最多等 capture_timeout 秒。
+    capture: tuple[str, ...] = ()
+    capture_min: int = 1
+    capture_timeout: float = 15
+    # 缓存有效期（秒）：行情/快讯短、参考类长；None = 用 SpiderConfig.cache_ttl
+    cache_ttl: int | None = None
 
     def customize_config(self, config: FetchConfig) -> FetchConfig:
         """
@@ -56,12 +74,42 @@ class DefaultAdapter:
             updates["scroll"] = True
         if self.extra_wait > 0:
             updates["wait"] = max(config.wait, self.extra_wait)
+        if self.capture:
+            updates["extra"] = {
+                **config.extra,
+                "capture": list(self.capture),
+                "capture_min": self.capture_min,
+                "capture_timeout": self.capture_timeout,
+            }
         return replace(config, **updates) if updates else config
 
+    async def fast_fetch(self, url: str, config: FetchConfig, http: HttpEngine) -> CrawlResult | None:
+        """
+        结构化快速通道（站点 API / JSON 端点，走 HTTP 引擎）。
+
+        返回 None 表示不适用，crawl() 继续走常规引擎；返回 failed 结果同样回退常规引擎。
+        结果应在 metadata["fast_path"] 标明来源，transform() 对这类结果不再做清洗。
+        默认不提供快速通道。
+        """
+        return None
+
+    async def fast_fetch_many(
+        self, urls: list[str], config: FetchConfig, http: HttpEngine,
+    ) -> list[CrawlResult | None]:
+        """
+        批量快速通道（crawl_many() 对同一适配器的 URL 调用），返回与 urls 一一对应的结果。
+
+        默认逐个调用 fast_fetch()；站点 API 支持一次查多条时子类覆盖（如 Wikipedia）。
+        """
+        return list(await asyncio.gather(*(self.fast_fetch(url, config, http) for url in urls)))
+
     def transform(self, result: CrawlResult) -> CrawlResult:
         """
         对爬取结果做站点专用的清洗/转换。
 
-        默认原样返回。子类覆盖此方法做定制处理。
+        默认执行 rules 声明的清洗规则（没有规则或快速通道结果则原样返回）。
+        子类覆盖此方法做规则表达不了的定制处理。
         """
-        return result
+        if self.rules is None or result.metadata.get("fast_path"):
+            return result
+        return result.model_copy(update={"markdown": self.rules.apply(result.markdown)})
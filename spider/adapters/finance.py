@@ -4,10 +4,10 @@
 
 from __future__ import annotations
 
-import re
 from dataclasses import dataclass, field
 
 from spider.adapters.default import DefaultAdapter
+from spider.adapters.rules import CleanupRules
 from spider.core.result import CrawlResult
 
 
@@ -16,15 +16,14 @@ class InvestingAdapter(DefaultAdapter):
     """Investing.com 适配器。"""
     name: str = "investing"
     domains: list[str] = field(default_factory=lambda: ["investing.com"])
+    cache_ttl: int | None = 120
     scroll: bool = True
     extra_wait: float = 2
-
-    def transform(self, result: CrawlResult) -> CrawlResult:
-        md = result.markdown
-        md = re.sub(r"(?:Download the App|Install|Sign In|Join for free)[^\n]*\n?", "", md)
-        md = re.sub(r"(?:Advertisement|Advertise)[^\n]*\n?", "", md)
-        md = re.sub(r"\n{3,}", "\n\n", md).strip()
-        return result.model_copy(update={"markdown": md})
+    # 行情/图表数据来自 api.investing.com 的 XHR
+    capture: tuple[str, ...] = (r"api\.investing\.com/api/",)
+    rules: CleanupRules = field(default_factory=lambda: CleanupRules(
+        strip_phrases=("Download the App", "Install", "Sign In", "Join for free", "Advertisement", "Advertise"),
+    ))
 
 
 @dataclass
@@ -32,14 +31,12 @@ class YahooFinanceAdapter(DefaultAdapter):
     """Yahoo Finance 适配器。"""
     name: str = "yahoo_finance"
     domains: list[str] = field(default_factory=lambda: ["finance.yahoo.com"])
+    cache_ttl: int | None = 120
     scroll: bool = True
     extra_wait: float = 2
-
-    def transform(self, result: CrawlResult) -> CrawlResult:
-        md = result.markdown
-        md = re.sub(r"(?:Sign in|Try the app|Get the app|Yahoo Finance Plus)[^\n]*\n?", "", md)
-        md = re.sub(r"\n{3,}", "\n\n", md).strip()
-        return result.model_copy(update={"markdown": md})
+    rules: CleanupRules = field(default_factory=lambda: CleanupRules(
+        strip_phrases=("Sign in", "Try the app", "Get the app", "Yahoo Finance Plus"),
+    ))
 
 
 @dataclass
@@ -47,14 +44,12 @@ class MyfxbookAdapter(DefaultAdapter):
     """Myfxbook 适配器。"""
     name: str = "myfxbook"
     domains: list[str] = field(default_factory=lambda: ["myfxbook.com"])
+    cache_ttl: int | None = 300
     scroll: bool = True
     extra_wait: float = 1
-
-    def transform(self, result: CrawlResult) -> CrawlResult:
-        md = result.markdown
-        md = re.sub(r"(?:Join|Login|Register|Sign Up|Free Sign Up)[^\n]*\n?", "", md)
-        md = re.sub(r"\n{3,}", "\n\n", md).strip()
-        return result.model_copy(update={"markdown": md})
+    rules: CleanupRules = field(default_factory=lambda: CleanupRules(
+        strip_phrases=("Join", "Login", "Register", "Sign Up", "Free Sign Up"),
+    ))
 
 
 @dataclass
@@ -67,19 +62,20 @@ class BloombergAdapter(DefaultAdapter):
     """
     name: str = "bloomberg"
     domains: list[str] = field(default_factory=lambda: ["bloomberg.com"])
+    cache_ttl: int | None = 600
     scroll: bool = True
     extra_wait: float = 3
+    rules: CleanupRules = field(default_factory=lambda: CleanupRules(
+        strip_phrases=("Subscribe", "Sign In", "Already a subscriber"),
+    ))
 
     def transform(self, result: CrawlResult) -> CrawlResult:
-        md = result.markdown
-        if len(md) < 500:
+        if len(result.markdown) < 500:
             return result.model_copy(update={
                 "status": "partial",
                 "metadata": {**result.metadata, "hint": "Bloomberg 付费墙，仅抓到摘要"},
             })
-        md = re.sub(r"(?:Subscribe|Sign In|Already a subscriber)[^\n]*\n?", "", md)
-        md = re.sub(r"\n{3,}", "\n\n", md).strip()
-        return result.model_copy(update={"markdown": md})
+        return super().transform(result)
 
 
 @dataclass
@@ -91,19 +87,20 @@ class WSJAdapter(DefaultAdapter):
     """
     name: str = "wsj"
     domains: list[str] = field(default_factory=lambda: ["wsj.com"])
+    cache_ttl: int | None = 600
     scroll: bool = True
     extra_wait: float = 2
+    rules: CleanupRules = field(default_factory=lambda: CleanupRules(
+        strip_phrases=("Subscribe", "Sign In", "Already a member"),
+    ))
 
     def transform(self, result: CrawlResult) -> CrawlResult:
-        md = result.markdown
-        if len(md) < 200:
+        if len(result.markdown) < 200:
             return result.model_copy(update={
                 "status": "partial",
                 "metadata": {**result.metadata, "hint": "WSJ 付费墙，内容受限"},
             })
-        md = re.sub(r"(?:Subscribe|Sign In|Already a member)[^\n]*\n?", "", md)
-        md = re.sub(r"\n{3,}", "\n\n", md).strip()
-        return result.model_copy(update={"markdown": md})
+        return super().transform(result)
 
 
 @dataclass
@@ -111,11 +108,9 @@ class FTAdapter(DefaultAdapter):
     """Financial Times 适配器。"""
     name: str = "ft"
     domains: list[str] = field(default_factory=lambda: ["ft.com"])
+    cache_ttl: int | None = 600
     scroll: bool = True
     extra_wait: float = 2
-
-    def transform(self, result: CrawlResult) -> CrawlResult:
-        md = result.markdown
-        md = re.sub(r"(?:Subscribe|Sign In|Already a subscriber|Try for \$1)[^\n]*\n?", "", md)
-        md = re.sub(r"\n{3,}", "\n\n", md).strip()
-        return result.model_copy(update={"markdown": md})
+    rules: CleanupRules = field(default_factory=lambda: CleanupRules(
+        strip_phrases=("Subscribe", "Sign In", "Already a subscriber", "Try for $1"),
+    ))
@@ -6,11 +6,10 @@
 
 from __future__ import annotations
 
-import re
 from dataclasses import dataclass, field
 
 from spider.adapters.default import DefaultAdapter
-from spider.core.result import CrawlResult
+from spider.adapters.rules import CleanupRules
 
 
 @dataclass
@@ -18,18 +17,17 @@ class BBCAdapter(DefaultAdapter):
     """BBC News 适配器。"""
     name: str = "bbc"
     domains: list[str] = field(default_factory=lambda: ["bbc.com", "bbc.co.uk"])
+    cache_ttl: int | None = 600
     scroll: bool = True
     extra_wait: float = 1
-
-    def transform(self, result: CrawlResult) -> CrawlResult:
-        md = result.markdown
-        # 去掉 Advertisement 标记
-        md = re.sub(r"Advertisement\s*\n", "", md)
-        # 去掉重复的导航链接块
-        md = re.sub(r"(?:^|\n)\s*\[(?:Home|News|Sport|Business|Technology|Health|Culture|Arts|Travel|Earth|Audio|Video|Live|Weather|Newsletters)\]\([^\)]+\)\s*\n?", "\n", md)
-        # 合并连续空行
-        md = re.sub(r"\n{3,}", "\n\n", md).strip()
-        return result.model_copy(update={"markdown": md})
+    rules: CleanupRules = field(default_factory=lambda: CleanupRules(
+        patterns=(
+            # 去掉 Advertisement 标记
+            r"Advertisement\s*\n",
+            # 去掉重复的导航链接块
+            r"(?m:^)\s*\[(?:Home|News|Sport|Business|Technology|Health|Culture|Arts|Travel|Earth|Audio|Video|Live|Weather|Newsletters)\]\([^\)]+\)\s*\n?",
+        )),
+    )
 
 
 @dataclass
@@ -37,15 +35,11 @@ class CNBCAdapter(DefaultAdapter):
     """CNBC 适配器。"""
     name: str = "cnbc"
     domains: list[str] = field(default_factory=lambda: ["cnbc.com"])
+    cache_ttl: int | None = 600
     scroll: bool = True
     extra_wait: float = 1
-
-    def transform(self, result: CrawlResult) -> CrawlResult:
-        md = result.markdown
-        # 去掉 Skip Navigation 等
-        md = re.sub(r"\[Skip Navigation\][^\n]*\n?", "", md)
-        md = re.sub(r"\n{3,}", "\n\n", md).strip()
-        return result.model_copy(update={"markdown": md})
+    # 去掉 Skip Navigation 等
+    rules: CleanupRules = field(default_factory=lambda: CleanupRules(strip_phrases=("[Skip Navigation]",)))
 
 
 @dataclass
@@ -53,13 +47,10 @@ class ReutersAdapter(DefaultAdapter):
     """Reuters 适配器。"""
     name: str = "reuters"
     domains: list[str] = field(default_factory=lambda: ["reuters.com"])
+    cache_ttl: int | None = 600
     scroll: bool = True
     extra_wait: float = 2
-
-    def transform(self, result: CrawlResult) -> CrawlResult:
-        md = result.markdown
-        md = re.sub(r"\n{3,}", "\n\n", md).strip()
-        return result.model_copy(update={"markdown": md})
+    rules: CleanupRules = field(default_factory=lambda: CleanupRules())  # 只折叠空行
 
 
 @dataclass
@@ -67,12 +58,10 @@ class Jin10Adapter(DefaultAdapter):
     """金十数据适配器。"""
     name: str = "jin10"
     domains: list[str] = field(default_factory=lambda: ["jin10.com"])
+    cache_ttl: int | None = 60
     scroll: bool = True
     extra_wait: float = 3  # 金十 SPA 加载慢
-
-    def transform(self, result: CrawlResult) -> CrawlResult:
-        md = result.markdown
-        # 去掉广告和弹窗文本
-        md = re.sub(r"(?:下载APP|扫码下载|开通VIP|免费试用)[^\n]*\n?", "", md)
-        md = re.sub(r"\n{3,}", "\n\n", md).strip()
-        return result.model_copy(update={"markdown": md})
+    # 快讯列表来自 flash-api 的 XHR，直接抓 JSON（不等整页渲染）
+    capture: tuple[str, ...] = (r"flash-api\.jin10\.com/get_flash_list",)
+    # 去掉广告和弹窗文本
+    rules: CleanupRules = field(default_factory=lambda: CleanupRules(strip_phrases=("下载APP", "扫码下载", "开通VIP", "免费试用")))
@@ -0,0 +1,190 @@
+"""
+适配器注册表 — 域名索引启动时建一次，适配器模块按需导入。
+
+内置适配器以 AdapterSpec（名字 + 域名 + "模块:类"）声明，
+建索引不 import 任何适配器模块；URL 真正路由到某个适配器时才导入并实例化。
+
+第三方适配器包通过 entry points 接入（组名 ENTRY_POINT_GROUP）：
+
+    [project.entry-points."juanjuan_spider.adapters"]
+    zhihu = "my_pack.specs:SPECS"        # AdapterSpec 列表（推荐，保持惰性）
+    weibo = "my_pack.weibo:WeiboAdapter"  # 或直接给适配器类（加载插件时即实例化）
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from importlib import import_module
+from importlib.metadata import entry_points
+
+from spider.adapters.default import DefaultAdapter
+from spider.core.domains import DomainTrie
+
+logger = logging.getLogger("spider.adapters")
+
+ENTRY_POINT_GROUP = "juanjuan_spider.adapters"
+
+
+@dataclass(frozen=True)
+class AdapterSpec:
+    """适配器声明：不导入模块就能建域名索引。"""
+
+    name: str
+    domains: tuple[str, ...]
+    target: str  # "package.module:ClassName"
+
+    def load(self) -> DefaultAdapter:
+        """导入模块并实例化适配器。"""
+        module_name, _, attr = self.target.partition(":")
+        cls = getattr(import_module(module_name), attr)
+        return cls()
+
+
+# 内置适配器（域名需与适配器类的 domains 保持一致，tests/test_adapter.py 会校验）
+BUILTIN_ADAPTERS: tuple[AdapterSpec, ...] = (
+    # 新闻
+    AdapterSpec("bbc", ("bbc.com", "bbc.co.uk"), "spider.adapters.news:BBCAdapter"),
+    AdapterSpec("cnbc", ("cnbc.com",), "spider.adapters.news:CNBCAdapter"),
+    AdapterSpec("reuters", ("reuters.com",), "spider.adapters.news:ReutersAdapter"),
+    AdapterSpec("jin10", ("jin10.com",), "spider.adapters.news:Jin10Adapter"),
+    # 社交
+    AdapterSpec("reddit", ("reddit.com", "old.reddit.com"), "spider.adapters.social:RedditAdapter"),
+    AdapterSpec("trends24", ("trends24.in",), "spider.adapters.social:Trends24Adapter"),
+    AdapterSpec("twitter", ("x.com", "twitter.com"), "spider.adapters.social:TwitterAdapter"),
+    AdapterSpec("medium", ("medium.com",), "spider.adapters.social:MediumAdapter"),
+    AdapterSpec("youtube", ("youtube.com", "youtu.be"), "spider.adapters.social:YouTubeAdapter"),
+    # 金融
+    AdapterSpec("investing", ("investing.com",), "spider.adapters.finance:InvestingAdapter"),
+    AdapterSpec("yahoo_finance", ("finance.yahoo.com",), "spider.adapters.finance:YahooFinanceAdapter"),
+    AdapterSpec("myfxbook", ("myfxbook.com",), "spider.adapters.finance:MyfxbookAdapter"),
+    AdapterSpec("bloomberg", ("bloomberg.com",), "spider.adapters.finance:BloombergAdapter"),
+    AdapterSpec("wsj", ("wsj.com",), "spider.adapters.finance:WSJAdapter"),
+    AdapterSpec("ft", ("ft.com",), "spider.adapters.finance:FTAdapter"),
+    # 科技
+    AdapterSpec("techcrunch", ("techcrunch.com",), "spider.adapters.tech:TechCrunchAdapter"),
+    AdapterSpec("theverge", ("theverge.com",), "spider.adapters.tech:TheVergeAdapter"),
+    AdapterSpec("wikipedia", ("wikipedia.org",), "spider.adapters.tech:WikipediaAdapter"),
+    AdapterSpec("hackernews", ("news.ycombinator.com",), "spider.adapters.tech:HackerNewsAdapter"),
+)
+
+
+class AdapterRegistry:
+    """
+    域名 → 适配器索引。
+
+    register() 只记录声明，lookup() / load() 命中时才加载适配器（每个适配器只实例化一次）。
+    单个声明出错（域名是公共后缀、模块导入失败）只记日志：该域名不登记 / 该适配器按未命中处理。
+    线程安全：索引在启动时建好，之后只读；加载过程加锁。
+    """
+
+    def __init__(self, specs: Iterable[AdapterSpec | DefaultAdapter] = ()):
+        self._index: DomainTrie[AdapterSpec] = DomainTrie()
+        self._specs: dict[str, AdapterSpec] = {}
+        self._instances: dict[str, DefaultAdapter] = {}
+        self._failed: set[str] = set()  # 加载失败过的适配器名，不再重试
+        self._lock = threading.Lock()
+        for item in specs:
+            self.register(item)
+
+    def register(self, item: AdapterSpec | DefaultAdapter) -> None:
+        """登记一个适配器声明（或已实例化的适配器）。后登记的覆盖先登记的同名域名。"""
+        if isinstance(item, DefaultAdapter):
+            spec = AdapterSpec(item.name, tuple(item.domains), "")
+            self._instances[spec.name] = item
+        else:
+            spec = item
+        self._specs[spec.name] = spec
+        for domain in spec.domains:
+            try:
+                self._index.insert(domain, spec)
+            except ValueError as e:
+                logger.warning("adapter %s: domain skipped: %s", spec.name, e)
+
+    def lookup(self, domain: str) -> DefaultAdapter | None:
+        """按域名查找适配器，支持子域名匹配（最长后缀优先）。未命中返回 None。"""
+        hit = self._index.longest(domain)
+        if hit is None:
+            return None
+        return self.load(hit[1])
+
+    def get(self, name: str) -> DefaultAdapter | None:
+        """按适配器名查找（路由规则文件用名字绑定适配器）。未登记返回 None。"""
+        spec = self._specs.get(name)
+        return self.load(spec) if spec is not None else None
+
+    def items(self) -> Iterator[tuple[str, AdapterSpec]]:
+        """(域名, 声明) 全部索引项（Router 编进自己的域名树，不加载适配器）。"""
+        for domain in self._index:
+            spec = self._index.get(domain)
+            if spec is not None:
+                yield domain, spec
+
+    def load(self, spec: AdapterSpec) -> DefaultAdapter | None:
+        """声明 → 适配器实例（首次调用时导入模块）。加载失败记一次日志，返回 None。"""
+        adapter = self._instances.get(spec.name)
+        if adapter is not None or spec.name in self._failed:
+            return adapter
+        with self._lock:
+            adapter = self._instances.get(spec.name)
+            if adapter is None and spec.name not in self._failed:
+                try:
+                    adapter = spec.load()
+                except Exception as e:
+                    self._failed.add(spec.name)
+                    logger.warning("adapter %s failed to load from %s: %s", spec.name, spec.target, e)
+                    return None
+                self._instances[spec.name] = adapter
+                logger.debug("adapter %s loaded from %s", spec.name, spec.target)
+        return adapter
+
+    @property
+    def domains(self) -> list[str]:
+        """已索引的全部域名。"""
+        return list(self._index)
+
+    @property
+    def loaded(self) -> list[str]:
+        """已实例化的适配器名。"""
+        return list(self._instances)
+
+
+def discover_entry_points(group: str = ENTRY_POINT_GROUP) -> list[AdapterSpec | DefaultAdapter]:
+    """
+    读取第三方适配器包的 entry points。
+
+    每个 entry point 可指向：AdapterSpec / AdapterSpec 列表（或返回它们的函数）/ 适配器类。
+    单个插件加载失败只记日志，不影响其他适配器。
+    """
+    found: list[AdapterSpec | DefaultAdapter] = []
+    for ep in entry_points(group=group):
+        try:
+            obj = ep.load()
+            if isinstance(obj, type) and issubclass(obj, DefaultAdapter):
+                found.append(obj())
+                continue
+            if callable(obj) and not isinstance(obj, AdapterSpec):
+                obj = obj()
+            if isinstance(obj, AdapterSpec | DefaultAdapter):
+                found.append(obj)
+            else:
+                found.extend(obj)
+        except Exception as e:
+            logger.warning("adapter entry point %s failed: %s", ep.name, e)
+    return found
+
+
+_registry: AdapterRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> AdapterRegistry:
+    """进程级注册表：内置适配器 + entry points，首次调用时建好索引。"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = AdapterRegistry([*BUILTIN_ADAPTERS, *discover_entry_points()])
+    return _registry
@@ -0,0 +1,192 @@
+"""
+声明式清洗规则 — 适配器 transform() 的数据化描述。
+
+适配器不再手写一串 re.sub，而是声明 CleanupRules：
+- strip_phrases: 出现即删到行尾（"Sign in ..." 这类 UI 文本）
+- drop_line_prefixes: 以这些前缀开头的整行删除
+- drop_link_texts: 删除链接文字为这些词的 [text](url)
+- patterns: 任意正则删除（可带替换串）
+
+每套规则只编译一次。执行时先用字符串查找筛掉文档里根本不出现的规则，
+剩下的合并成一个正则一次扫描完成全部删除，最后统一折叠连续空行。
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import cache
+
+# 正则里有特殊含义的字符（遇到即停止提取字面量前缀）
+_REGEX_META = set(".^$*+?{}[]()|\\")
+_QUANTIFIERS = set("*+?{")
+
+# 每套规则最多缓存多少种分支组合的合并正则
+_MAX_MATCHERS = 64
+
+Pattern = str | tuple[str, str]
+
+
+@dataclass(frozen=True)
+class CleanupRules:
+    """
+    一个适配器的清洗规则（不可变、可哈希，编译结果按内容缓存）。
+
+    patterns 里的元素可以是正则字符串（匹配内容删除），
+    也可以是 (正则, 替换串)。需要 MULTILINE 等标志时用内联写法 (?m:...)。
+    patterns 内不要用编号反向引用（合并后分组编号会变）。
+
+    所有规则在同一次扫描里生效，前一条删掉的内容不会让后一条重新匹配，
+    需要"行首"语义时用 (?m:^) 而不是 (?:^|\n)。
+    """
+
+    strip_phrases: tuple[str, ...] = ()
+    drop_line_prefixes: tuple[str, ...] = ()
+    drop_link_texts: tuple[str, ...] = ()
+    patterns: tuple[Pattern, ...] = ()
+    collapse_blank_lines: bool = True
+
+    def compile(self) -> CompiledRules:
+        """编译为单个匹配器（按规则内容缓存，同样的规则只编译一次）。"""
+        return _compile(self)
+
+    def apply(self, text: str) -> str:
+        """对文本执行全部规则。"""
+        return self.compile().apply(text)
+
+
+class CompiledRules:
+    """
+    编译后的规则：若干备选分支 + 各自的触发字面量。
+
+    Python re 对合并后的多分支正则只能逐字符试探，而单个字面量前缀可以走快速查找，
+    所以执行时先用 `literal in text` 筛出本文档可能命中的分支，
+    再取（缓存的）只含这些分支的合并正则扫一遍。
+
+    分支不加前置捕获组（同样会让 re 丢掉字面量前缀优化）；
+    只有替换串非空的分支在末尾挂一个空的命名标记组，用 lastgroup 取替换串。
+    """
+
+    __slots__ = ("_collapse", "_matchers", "_parts")
+
+    def __init__(self, parts: list[tuple[str, str, str | None]], collapse: bool):
+        self._parts = parts
+        self._collapse = collapse
+        self._matchers: dict[tuple[int, ...], tuple[re.Pattern, str | Callable[[re.Match], str]]] = {}
+
+    def _matcher(self, active: tuple[int, ...]) -> tuple[re.Pattern, str | Callable[[re.Match], str]]:
+        """取（或编译）只含 active 分支的合并正则。"""
+        cached = self._matchers.get(active)
+        if cached is not None:
+            return cached
+
+        replacements: dict[str, str] = {}
+        alternatives: list[str] = []
+        for i in active:
+            pattern, repl, _ = self._parts[i]
+            if repl:
+                group = f"_r{i}"
+                replacements[group] = repl
+                alternatives.append(f"(?:{pattern})(?P<{group}>)")
+            else:
+                alternatives.append(f"(?:{pattern})")
+
+        regex = re.compile("|".join(alternatives))
+        repl_fn: str | Callable[[re.Match], str] = ""
+        if replacements:
+            repl_fn = lambda m: replacements.get(m.lastgroup or "", "")  # noqa: E731
+        if len(self._matchers) < _MAX_MATCHERS:
+            self._matchers[active] = (regex, repl_fn)
+        return regex, repl_fn
+
+    def apply(self, text: str) -> str:
+        if not text:
+            return text
+        active = tuple(
+            i for i, (_, _, literal) in enumerate(self._parts)
+            if literal is None or literal in text
+        )
+        if active:
+            regex, repl = self._matcher(active)
+            text = regex.sub(repl, text)
+        if self._collapse:
+            text = _collapse_blank_lines(text)
+        return text
+
+
+def _collapse_blank_lines(text: str) -> str:
+    """连续 3+ 换行折叠为 2 个（等价于 re.sub(r"\\n{3,}", "\\n\\n")，str.replace 更快）。"""
+    while "\n\n\n" in text:
+        text = text.replace("\n\n\n", "\n\n")
+    return text.strip()
+
+
+def _literal_prefix(pattern: str) -> str | None:
+    """
+    提取正则开头的字面量（命中前必须出现在文本里），提取不到返回 None。
+
+    只认普通字符和转义的标点，例如 r"\\[edit\\]" → "[edit]"、r"# .*" → "# "。
+    顶层有 | 分支时前缀不再必然出现，直接放弃。
+    """
+    if _has_top_level_alternation(pattern):
+        return None
+    out: list[str] = []
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\" and i + 1 < len(pattern) and not pattern[i + 1].isalnum():
+            ch, step = pattern[i + 1], 2
+        elif ch in _REGEX_META:
+            break
+        else:
+            step = 1
+        # 后面跟量词的字符不一定出现
+        if i + step < len(pattern) and pattern[i + step] in _QUANTIFIERS:
+            break
+        out.append(ch)
+        i += step
+    return "".join(out) or None
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = ch != "]"
+        elif ch == "[":
+            in_class = True
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "|" and depth == 0:
+            return True
+        i += 1
+    return False
+
+
+@cache
+def _compile(rules: CleanupRules) -> CompiledRules:
+    parts: list[tuple[str, str, str | None]] = []
+
+    for phrase in rules.strip_phrases:
+        parts.append((rf"{re.escape(phrase)}[^\n]*\n?", "", phrase))
+
+    for prefix in rules.drop_line_prefixes:
+        parts.append((rf"(?m:^[ \t]*{re.escape(prefix)}[^\n]*\n?)", "", prefix))
+
+    for text in rules.drop_link_texts:
+        parts.append((rf"\[{re.escape(text)}\]\([^\)]+\)", "", f"[{text}]("))
+
+    for p in rules.patterns:
+        pattern, repl = (p, "") if isinstance(p, str) else p
+        parts.append((pattern, repl, _literal_prefix(pattern)))
+
+    return CompiledRules(parts, rules.collapse_blank_lines)
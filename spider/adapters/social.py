@@ -9,38 +9,49 @@
 
 from __future__ import annotations
 
-import re
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 
+from spider.adapters import api
+from spider.adapters.api import reddit, youtube
 from spider.adapters.default import DefaultAdapter
+from spider.adapters.rules import CleanupRules
+from spider.core.engine import FetchConfig
 from spider.core.result import CrawlResult
 
+if TYPE_CHECKING:
+    from spider.engines.http_engine import HttpEngine
+
 
 @dataclass
 class RedditAdapter(DefaultAdapter):
     """
     Reddit 适配器。
 
-    Reddit 反爬严格，代理 IP 大概率被封。
-    最佳策略：走 old.reddit.com（轻量 HTML）或用 Reddit API。
+    Reddit 反爬严格，代理 IP 大概率被封，浏览器渲染又慢又吵。
+    默认走快速通道：帖子/列表页改写为 .json 端点，HTTP 拉取后直接渲染 markdown；
+    不支持的页面或 JSON 失败时才回退浏览器。
     """
     name: str = "reddit"
     domains: list[str] = field(default_factory=lambda: ["reddit.com", "old.reddit.com"])
+    cache_ttl: int | None = 600
     scroll: bool = True
     extra_wait: float = 2
-
-    def customize_config(self, config):
-        """Reddit 用 old.reddit.com 成功率更高。"""
-        config = super().customize_config(config)
-        return config
-
-    def transform(self, result: CrawlResult) -> CrawlResult:
-        md = result.markdown
-        # 去掉 Reddit 的大量 UI 文本
-        md = re.sub(r"(?:Get the Reddit app|Log In|Sign Up|Get app)[^\n]*\n?", "", md)
-        md = re.sub(r"(?:Share|Save|Hide|Report|More)\s*\n", "", md)
-        md = re.sub(r"\n{3,}", "\n\n", md).strip()
-        return result.model_copy(update={"markdown": md})
+    json_fast_path: bool = True
+    max_comments: int = 200  # 快速通道最多渲染的评论数
+    max_comment_depth: int = 8
+    # 去掉 Reddit 的大量 UI 文本（浏览器回退时用）
+    rules: CleanupRules = field(default_factory=lambda: CleanupRules(
+        strip_phrases=("Get the Reddit app", "Log In", "Sign Up", "Get app"),
+        patterns=(r"(?:Share|Save|Hide|Report|More)\s*\n",),
+    ))
+
+    async def fast_fetch(self, url: str, config: FetchConfig, http: HttpEngine) -> CrawlResult | None:
+        if not self.json_fast_path or reddit.json_url(url) is None:
+            return None
+        return await api.run(url, "reddit_json", http, reddit.fetch(
+            url, config, http, max_comments=self.max_comments, max_depth=self.max_comment_depth,
+        ))
 
 
 @dataclass
@@ -53,18 +64,15 @@ class Trends24Adapter(DefaultAdapter):
     """
     name: str = "trends24"
     domains: list[str] = field(default_factory=lambda: ["trends24.in"])
+    cache_ttl: int | None = 600
     needs_login: bool = False
     scroll: bool = False
     extra_wait: float = 1
-
-    def transform(self, result: CrawlResult) -> CrawlResult:
-        """清洗 trends24 的输出，保留趋势名称和链接。"""
-        md = result.markdown
-        # 去掉页面标题和时间戳
-        md = re.sub(r"# .* Trends for last.*\n+", "", md)
-        md = re.sub(r"### \d+ .* ago\n+", "", md)
-        md = re.sub(r"\n{3,}", "\n\n", md).strip()
-        return result.model_copy(update={"markdown": md})
+    engines: tuple[str, ...] = ("http", "browser")  # 静态页，HTTP 失败再上浏览器
+    # 去掉页面标题和时间戳，保留趋势名称和链接
+    rules: CleanupRules = field(default_factory=lambda: CleanupRules(
+        patterns=(r"# .* Trends for last.*\n+", r"### \d+ .* ago\n+"),
+    ))
 
 
 @dataclass
@@ -80,13 +88,18 @@ class TwitterAdapter(DefaultAdapter):
     """
     name: str = "twitter"
     domains: list[str] = field(default_factory=lambda: ["x.com", "twitter.com"])
+    cache_ttl: int | None = 300
     needs_login: bool = True
     scroll: bool = True
     extra_wait: float = 3
+    # 推文数据走 GraphQL XHR（有登录态 cookie 时能拿到）
+    capture: tuple[str, ...] = (
+        r"/i/api/graphql/[^/]+/(?:TweetDetail|TweetResultByRestId|UserTweets|UserByScreenName|SearchTimeline)",
+    )
 
     def transform(self, result: CrawlResult) -> CrawlResult:
         md = result.markdown
-        if len(md) < 100:
+        if len(md) < 100 and not result.metadata.get("xhr"):
             # Twitter 基本抓不到内容，标记为需要 API
             return result.model_copy(update={
                 "status": "partial",
@@ -100,15 +113,15 @@ class MediumAdapter(DefaultAdapter):
     """Medium 适配器。"""
     name: str = "medium"
     domains: list[str] = field(default_factory=lambda: ["medium.com"])
+    cache_ttl: int | None = 86400
     scroll: bool = True
-
-    def transform(self, result: CrawlResult) -> CrawlResult:
-        md = result.markdown
-        # 去掉 Medium 的推广和注册提示
-        md = re.sub(r"(?:Open in app|Sign up|Sign in|Member-only story|Get started)[^\n]*\n?", "", md)
-        md = re.sub(r"(?:Follow|Clap|Share|Listen)[^\n]*\n?", "", md)
-        md = re.sub(r"\n{3,}", "\n\n", md).strip()
-        return result.model_copy(update={"markdown": md})
+    # 去掉 Medium 的推广和注册提示
+    rules: CleanupRules = field(default_factory=lambda: CleanupRules(
+        strip_phrases=(
+            "Open in app", "Sign up", "Sign in", "Member-only story", "Get started",
+            "Follow", "Clap", "Share", "Listen",
+        ),
+    ))
 
 
 @dataclass
@@ -116,20 +129,28 @@ class YouTubeAdapter(DefaultAdapter):
     """
     YouTube 适配器。
 
-    YouTube 页面重度 SPA，直接抓几乎无内容。
-    推荐替代方案：
-    - yt-dlp 获取视频信息/字幕
-    - YouTube Data API
+    YouTube 页面重度 SPA，浏览器渲染后的 DOM 几乎无内容。
+    视频页和频道页默认走快速通道：静态 HTML 里内嵌的 ytInitialPlayerResponse / ytInitialData
+    直接给出标题、简介、频道、时长、播放量、章节（频道页给视频列表），不开浏览器。
+    字幕等更多数据：yt-dlp / YouTube Data API。
     """
     name: str = "youtube"
     domains: list[str] = field(default_factory=lambda: ["youtube.com", "youtu.be"])
+    cache_ttl: int | None = 3600
     needs_login: bool = False
     scroll: bool = True
     extra_wait: float = 3
+    page_fast_path: bool = True
+    max_videos: int = 30  # 频道页列出的视频数
+
+    async def fast_fetch(self, url: str, config: FetchConfig, http: HttpEngine) -> CrawlResult | None:
+        if not self.page_fast_path or youtube.resolve(url) is None:
+            return None
+        return await api.run(url, "youtube_page", http, youtube.fetch(url, config, http, max_videos=self.max_videos))
 
     def transform(self, result: CrawlResult) -> CrawlResult:
         md = result.markdown
-        if len(md) < 200:
+        if not result.metadata.get("fast_path") and len(md) < 200:
             return result.model_copy(update={
                 "status": "partial",
                 "metadata": {**result.metadata, "hint": "YouTube SPA 抓取受限，建议用 yt-dlp 或 YouTube API"},
@@ -4,26 +4,32 @@
 
 from __future__ import annotations
 
-import re
+import time
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 
+from spider.adapters import api
+from spider.adapters.api import hackernews, wikipedia
 from spider.adapters.default import DefaultAdapter
+from spider.adapters.rules import CleanupRules
+from spider.core.engine import FetchConfig
 from spider.core.result import CrawlResult
 
+if TYPE_CHECKING:
+    from spider.engines.http_engine import HttpEngine
+
 
 @dataclass
 class TechCrunchAdapter(DefaultAdapter):
     """TechCrunch 适配器。"""
     name: str = "techcrunch"
     domains: list[str] = field(default_factory=lambda: ["techcrunch.com"])
+    cache_ttl: int | None = 1800
     scroll: bool = True
-
-    def transform(self, result: CrawlResult) -> CrawlResult:
-        md = result.markdown
-        md = re.sub(r"(?:Log in|Sign up|Newsletter|Subscribe)[^\n]*\n?", "", md)
-        md = re.sub(r"(?:© 20\d\d TechCrunch)[^\n]*\n?", "", md)
-        md = re.sub(r"\n{3,}", "\n\n", md).strip()
-        return result.model_copy(update={"markdown": md})
+    rules: CleanupRules = field(default_factory=lambda: CleanupRules(
+        strip_phrases=("Log in", "Sign up", "Newsletter", "Subscribe"),
+        patterns=(r"© 20\d\d TechCrunch[^\n]*\n?",),
+    ))
 
 
 @dataclass
@@ -31,13 +37,11 @@ class TheVergeAdapter(DefaultAdapter):
     """The Verge 适配器。"""
     name: str = "theverge"
     domains: list[str] = field(default_factory=lambda: ["theverge.com"])
+    cache_ttl: int | None = 1800
     scroll: bool = True
-
-    def transform(self, result: CrawlResult) -> CrawlResult:
-        md = result.markdown
-        md = re.sub(r"(?:The Verge homepage|Site search|Filed under)[^\n]*\n?", "", md)
-        md = re.sub(r"\n{3,}", "\n\n", md).strip()
-        return result.model_copy(update={"markdown": md})
+    rules: CleanupRules = field(default_factory=lambda: CleanupRules(
+        strip_phrases=("The Verge homepage", "Site search", "Filed under"),
+    ))
 
 
 @dataclass
@@ -47,19 +51,44 @@ class WikipediaAdapter(DefaultAdapter):
 
     注意：Wikipedia 通过代理可能 403，Router 会标记为直连。
     内容质量高，直接用 HTTP 引擎即可。
+
+    条目页默认走 MediaWiki API 快速通道（api_mode）：
+    - "parse"：action=parse 取正文 HTML（不含皮肤/导航），FetchConfig.extra["section"] 可指定章节序号或标题
+    - "summary"：只取导语；批量抓取时一次 API 请求查 20 个标题
+    - "off"：关闭，走常规引擎抓整页
     """
     name: str = "wikipedia"
     domains: list[str] = field(default_factory=lambda: ["wikipedia.org"])
-
-    def transform(self, result: CrawlResult) -> CrawlResult:
-        md = result.markdown
-        # 去掉编辑链接和引用标记
-        md = re.sub(r"\[edit\]", "", md)
-        md = re.sub(r"\[\d+\]", "", md)
+    cache_ttl: int | None = 86400
+    engines: tuple[str, ...] = ("http", "browser")
+    rules: CleanupRules = field(default_factory=lambda: CleanupRules(
         # 去掉导航
-        md = re.sub(r"(?:From Wikipedia|Jump to navigation|Jump to search)[^\n]*\n?", "", md)
-        md = re.sub(r"\n{3,}", "\n\n", md).strip()
-        return result.model_copy(update={"markdown": md})
+        strip_phrases=("From Wikipedia", "Jump to navigation", "Jump to search"),
+        # 去掉编辑链接和引用标记
+        patterns=(r"\[edit\]", r"\[\d+\]"),
+    ))
+    api_mode: str = "parse"
+
+    async def fast_fetch(self, url: str, config: FetchConfig, http: HttpEngine) -> CrawlResult | None:
+        if self.api_mode == "off" or wikipedia.parse_url(url) is None:
+            return None
+        return await api.run(
+            url, f"wikipedia_{self.api_mode}", http,
+            wikipedia.fetch(url, config, http, mode=self.api_mode, section=config.extra.get("section")),
+        )
+
+    async def fast_fetch_many(
+        self, urls: list[str], config: FetchConfig, http: HttpEngine,
+    ) -> list[CrawlResult | None]:
+        if self.api_mode == "off":
+            return [None] * len(urls)
+        t0 = time.monotonic()
+        pages = await wikipedia.fetch_many(urls, config, http, mode=self.api_mode)
+        duration_ms = int((time.monotonic() - t0) * 1000)
+        return [
+            None if page is None else api.to_result(url, f"wikipedia_{self.api_mode}", http, page, duration_ms)
+            for url, page in zip(urls, pages, strict=True)
+        ]
 
 
 @dataclass
@@ -67,28 +96,46 @@ class HackerNewsAdapter(DefaultAdapter):
     """
     Hacker News 适配器。
 
-    HN 的 HTML 是嵌套 table 布局，markdownify 转换出大量管道符残骸。
+    列表页 / item / user 默认走 Firebase API 快速通道（/v0/topstories.json 等），
+    条目 ID 并发拉取后直接渲染（分数、评论树），不开浏览器。
+
+    其他页面（或 API 失败）仍走浏览器：HN 的 HTML 是嵌套 table 布局，markdownify 转换出大量管道符残骸。
     清洗策略：删表格标记 → 提取 "标题 (来源) / N points / N comments" 结构。
-    更好方案：Phase B 用 HN API (/v0/topstories.json)。
     """
     name: str = "hackernews"
     domains: list[str] = field(default_factory=lambda: ["news.ycombinator.com"])
+    cache_ttl: int | None = 300
+    api_fast_path: bool = True
+    max_items: int = 30  # 列表页条数 / 用户页最近提交条数
+    max_comments: int = 200
+    max_comment_depth: int = 6
+    concurrency: int = 16  # 同时在途的条目请求数
+    rules: CleanupRules = field(default_factory=lambda: CleanupRules(
+        # 删空链接和残留 UI 文本
+        drop_link_texts=("hide", "login", "More"),
+        patterns=(
+            # 删除所有表格管道符和分隔行
+            r"\|[^\n]*\|",
+            r"(?m:^\s*-+\s*$)",
+            r"(?m:\d+\.\s*$)",  # 孤立序号
+        ),
+    ))
+
+    async def fast_fetch(self, url: str, config: FetchConfig, http: HttpEngine) -> CrawlResult | None:
+        if not self.api_fast_path or hackernews.resolve(url) is None:
+            return None
+        return await api.run(url, "hn_api", http, hackernews.fetch(
+            url, config, http,
+            max_items=self.max_items,
+            max_comments=self.max_comments,
+            max_depth=self.max_comment_depth,
+            concurrency=self.concurrency,
+        ))
 
     def transform(self, result: CrawlResult) -> CrawlResult:
-        md = result.markdown
-        # 删除所有表格管道符和分隔行
-        md = re.sub(r"\|[^\n]*\|", "", md)
-        md = re.sub(r"^\s*-+\s*$", "", md, flags=re.MULTILINE)
-        # 删空链接和残留 UI 文本
-        md = re.sub(r"\[hide\]\([^\)]+\)", "", md)
-        md = re.sub(r"\[login\]\([^\)]+\)", "", md)
-        md = re.sub(r"\[More\]\([^\)]+\)", "", md)
-        md = re.sub(r"\d+\.\s*$", "", md, flags=re.MULTILINE)  # 孤立序号
-        # 合并连续空行
-        md = re.sub(r"\n{3,}", "\n\n", md).strip()
-        if not md or len(md) < 200:
+        result = super().transform(result)
+        if not result.metadata.get("fast_path") and len(result.markdown) < 200:
             return result.model_copy(update={
-                "markdown": md,
                 "metadata": {**result.metadata, "hint": "HN 表格布局清洗后内容较少，建议用 API: https://hacker-news.firebaseio.com/v0/topstories.json"},
             })
-        return result.model_copy(update={"markdown": md})
+        return result
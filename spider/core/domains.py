@@ -0,0 +1,176 @@
+"""
+域名索引 — 反转标签的后缀树 + 离线公共后缀表。
+
+"news.bbc.co.uk" 按 uk → co → bbc → news 逐级下探，一次遍历拿到沿途所有规则，
+复杂度只与主机名的标签数有关，与规则数量无关。
+
+公共后缀（co.uk、com.cn、github.io…）不能挂规则：挂上就等于匹配该后缀下的所有站点。
+PUBLIC_SUFFIXES 是 publicsuffix.org 列表里常见的多级后缀子集（单级 TLD 按 PSL 的 "*" 规则一律视为后缀），
+不联网、不依赖第三方包；遇到漏收的后缀按需补充。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Generic, TypeVar
+
+V = TypeVar("V")
+
+PUBLIC_SUFFIXES: frozenset[str] = frozenset({
+    # 英国
+    "co.uk", "org.uk", "me.uk", "ltd.uk", "plc.uk", "net.uk", "ac.uk", "gov.uk", "sch.uk", "nhs.uk",
+    # 中国 / 港台
+    "com.cn", "net.cn", "org.cn", "gov.cn", "edu.cn", "ac.cn",
+    "com.hk", "net.hk", "org.hk", "edu.hk", "gov.hk",
+    "com.tw", "net.tw", "org.tw", "edu.tw", "gov.tw", "idv.tw",
+    # 亚太
+    "co.jp", "ne.jp", "or.jp", "ac.jp", "go.jp", "gr.jp",
+    "co.kr", "or.kr", "ne.kr", "ac.kr", "go.kr",
+    "com.au", "net.au", "org.au", "edu.au", "gov.au", "asn.au", "id.au",
+    "co.nz", "org.nz", "net.nz", "ac.nz", "govt.nz",
+    "com.sg", "net.sg", "org.sg", "edu.sg", "gov.sg",
+    "com.my", "net.my", "org.my", "edu.my", "gov.my",
+    "co.in", "net.in", "org.in", "firm.in", "gen.in", "ind.in", "ac.in", "gov.in",
+    "co.id", "or.id", "ac.id", "go.id", "web.id",
+    "co.th", "in.th", "ac.th", "go.th", "or.th",
+    "com.vn", "net.vn", "org.vn", "edu.vn", "gov.vn",
+    "com.ph", "net.ph", "org.ph",
+    "com.pk", "net.pk", "org.pk",
+    # 美洲
+    "com.br", "net.br", "org.br", "gov.br", "edu.br",
+    "com.mx", "org.mx", "gob.mx", "edu.mx",
+    "com.ar", "org.ar", "gob.ar", "edu.ar",
+    "com.co", "org.co", "gov.co", "edu.co",
+    "com.pe", "org.pe", "gob.pe",
+    "com.ve", "co.ve",
+    # 欧洲 / 中东 / 非洲
+    "com.tr", "org.tr", "net.tr", "gov.tr", "edu.tr",
+    "co.il", "org.il", "ac.il", "gov.il",
+    "com.ru", "org.ru", "net.ru", "msk.ru", "spb.ru",
+    "com.ua", "org.ua", "net.ua", "kiev.ua",
+    "com.pl", "org.pl", "net.pl",
+    "co.at", "or.at", "ac.at", "gv.at",
+    "com.gr", "org.gr",
+    "co.za", "org.za", "gov.za", "ac.za", "web.za",
+    "com.eg", "com.sa", "com.ng", "com.kw", "com.qa", "co.ke",
+    # 常见的私有后缀（PSL PRIVATE 段：用户各自拥有子域名）
+    "github.io", "gitlab.io", "blogspot.com", "wordpress.com", "herokuapp.com", "netlify.app",
+    "vercel.app", "pages.dev", "workers.dev", "web.app", "firebaseapp.com", "appspot.com",
+    "azurewebsites.net", "cloudfront.net", "s3.amazonaws.com",
+})
+
+
+def is_public_suffix(domain: str) -> bool:
+    """单级 TLD 或 PUBLIC_SUFFIXES 里的后缀。"""
+    domain = domain.lower().strip(".")
+    return "." not in domain or domain in PUBLIC_SUFFIXES
+
+
+def registrable_domain(host: str) -> str:
+    """
+    可注册域名（eTLD+1）："news.bbc.co.uk" → "bbc.co.uk"，"a.b.example.com" → "example.com"。
+
+    host 本身是公共后缀或为空时原样返回。
+    """
+    labels = host.lower().strip(".").split(".")
+    # 从最长的后缀往短试，第一个命中的就是最长公共后缀；都不在表里则后缀是单级 TLD
+    for i in range(1, len(labels)):
+        if ".".join(labels[i:]) in PUBLIC_SUFFIXES:
+            return ".".join(labels[i - 1:])
+    return ".".join(labels[-2:])
+
+
+class _Node(Generic[V]):  # noqa: UP046 — 保持 3.11 可导入
+    __slots__ = ("children", "has_value", "value")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node[V]] = {}
+        self.has_value = False
+        self.value: V | None = None
+
+
+class DomainTrie(Generic[V]):  # noqa: UP046
+    """
+    反转标签后缀树：域名 → 值。
+
+    规则挂在域名上，对该域名及其所有子域名生效；多条规则命中时最深（最具体）的优先。
+    不允许把规则挂在公共后缀上（ValueError）。
+    """
+
+    def __init__(self) -> None:
+        self._root: _Node[V] = _Node()
+        self._size = 0
+
+    def insert(self, domain: str, value: V) -> None:
+        """挂规则（同一域名再次插入则覆盖）。"""
+        node = self._node(domain, create=True)
+        assert node is not None
+        if not node.has_value:
+            self._size += 1
+        node.has_value = True
+        node.value = value
+
+    def setdefault(self, domain: str, default: V) -> V:
+        node = self._node(domain, create=True)
+        assert node is not None
+        if not node.has_value:
+            self._size += 1
+            node.has_value = True
+            node.value = default
+        return node.value  # type: ignore[return-value]
+
+    def get(self, domain: str) -> V | None:
+        """精确查找（不匹配父域名）。"""
+        node = self._node(domain, create=False)
+        return node.value if node is not None and node.has_value else None
+
+    def walk(self, host: str) -> Iterator[tuple[str, V]]:
+        """沿主机名从顶级往下，依次产出命中的 (域名, 值)：先浅后深。"""
+        labels = _labels(host)
+        node = self._root
+        for depth, label in enumerate(labels, 1):
+            child = node.children.get(label)
+            if child is None:
+                return
+            node = child
+            if node.has_value:
+                yield ".".join(reversed(labels[:depth])), node.value  # type: ignore[misc]
+
+    def longest(self, host: str) -> tuple[str, V] | None:
+        """最具体的命中 (域名, 值)；没有命中返回 None。"""
+        hits = list(self.walk(host))
+        return hits[-1] if hits else None
+
+    def __contains__(self, domain: object) -> bool:
+        return isinstance(domain, str) and self.get(domain) is not None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[str]:
+        """全部已挂规则的域名。"""
+        stack: list[tuple[_Node[V], list[str]]] = [(self._root, [])]
+        while stack:
+            node, path = stack.pop()
+            if node.has_value:
+                yield ".".join(reversed(path))
+            for label, child in node.children.items():
+                stack.append((child, [*path, label]))
+
+    def _node(self, domain: str, *, create: bool) -> _Node[V] | None:
+        if create and is_public_suffix(domain):
+            raise ValueError(f"cannot attach a rule to public suffix {domain!r}")
+        node = self._root
+        for label in _labels(domain):
+            child = node.children.get(label)
+            if child is None:
+                if not create:
+                    return None
+                child = node.children[label] = _Node()
+            node = child
+        return node
+
+
+def _labels(domain: str) -> list[str]:
+    """"news.bbc.co.uk" → ["uk", "co", "bbc", "news"]"""
+    return domain.lower().strip(".").split(".")[::-1]
@@ -26,6 +26,7 @@ class FetchConfig:
     selector: str | None = None
     js_code: str | None = None
     cookie_file: str | None = None
+    save_cookies: bool = False  # HTTP 引擎关闭时把 cookie（含 Set-Cookie 更新）写回 cookie_file
     verbose: bool = False
     extra: dict[str, Any] = field(default_factory=dict)
 
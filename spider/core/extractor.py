@@ -11,9 +11,13 @@ import logging
 import re
 
 from spider.core.result import CrawlResult
+from spider.core.structured import extract_structured, is_complete
 
 logger = logging.getLogger("spider.extractor")
 
+# articleBody 短于此视为摘要/截断（付费墙站点常见），仍走 trafilatura
+MIN_ARTICLE_BODY = 500
+
 
 class ContentExtractor:
     """
@@ -21,9 +25,11 @@ class ContentExtractor:
 
     策略：
     1. 如果没有 HTML → 跳过
-    2. 用 trafilatura 从 HTML 提取正文 markdown
-    3. 与引擎的 fit_markdown 比较质量，择优
-    4. 提取元数据（标题/作者/日期）补充到 result.metadata
+    2. 先读结构化元数据（JSON-LD / 微数据 / OpenGraph），便宜且准确
+    3. 引擎已按选择器取正文则跳过；有足够长的 articleBody 时直接用它作正文候选，
+       否则用 trafilatura 从 HTML 提取正文 markdown
+    4. 与引擎的 fit_markdown 比较质量，择优
+    5. 元数据（标题/作者/日期/站点名）补充到 result.metadata；结构化数据不齐时才跑 trafilatura 元数据提取
     """
 
     def extract(self, result: CrawlResult) -> CrawlResult:
@@ -41,22 +47,31 @@ class ContentExtractor:
         """实际提取逻辑（可抛异常）。"""
         import trafilatura
 
-        # 1. trafilatura 提取正文（markdown 格式）
-        traf_md = trafilatura.extract(
-            result.html,
-            output_format="markdown",
-            include_links=True,
-            include_tables=True,
-            include_comments=False,
-            favor_precision=True,
-        )
-
-        # 2. trafilatura 提取元数据
-        meta_doc = trafilatura.bare_extraction(result.html)
+        # 1. 结构化元数据（正则扫描，不建 DOM）
+        structured = extract_structured(result.html)
+        article_body = _body_markdown(structured.pop("article_body", ""))
+
+        # 2. 正文：引擎已按 CSS 选择器取了正文，或 articleBody 够长，就不跑 trafilatura 正文提取
+        if result.metadata.get("selector_matched"):
+            traf_md = None
+        elif len(article_body) >= MIN_ARTICLE_BODY:
+            traf_md = article_body
+        else:
+            traf_md = trafilatura.extract(
+                result.html,
+                output_format="markdown",
+                include_links=True,
+                include_tables=True,
+                include_comments=False,
+                favor_precision=True,
+            )
+
+        # 3. 元数据不齐才跑 trafilatura 元数据提取（要再解析一遍整页）
+        meta_doc = None if is_complete(structured) else trafilatura.bare_extraction(result.html)
 
         updates: dict = {}
 
-        # 3. fit_markdown 择优
+        # 4. fit_markdown 择优
         if traf_md:
             engine_fit = result.fit_markdown
             traf_score = _quality_score(traf_md)
@@ -65,24 +80,34 @@ class ContentExtractor:
             if traf_score >= engine_score:
                 updates["fit_markdown"] = traf_md
 
-        # 4. 补充元数据
-        if meta_doc:
-            extra_meta: dict = {}
-            for key in ("author", "date", "sitename", "categories", "tags"):
-                val = getattr(meta_doc, key, None)
-                if val:
-                    extra_meta[key] = val
-            if extra_meta:
-                updates["metadata"] = {**result.metadata, **extra_meta}
-
-            if not result.title and getattr(meta_doc, "title", None):
-                updates["title"] = meta_doc.title
+        # 5. 补充元数据（结构化数据优先，trafilatura 补缺）
+        extra_meta: dict = {}
+        for key in ("author", "date", "sitename", "categories", "tags", "description"):
+            val = structured.get(key) or getattr(meta_doc, key, None)
+            if val:
+                extra_meta[key] = val
+        if structured.get("sources"):
+            extra_meta["structured"] = structured["sources"]
+        if extra_meta:
+            updates["metadata"] = {**result.metadata, **extra_meta}
+
+        title = structured.get("title") or getattr(meta_doc, "title", None)
+        if not result.title and title:
+            updates["title"] = title
 
         if updates:
             return result.model_copy(update=updates)
         return result
 
 
+def _body_markdown(body: str) -> str:
+    """JSON-LD articleBody 是纯文本：统一换行，段落之间留空行。"""
+    if not body:
+        return ""
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n|\r?\n", body) if p.strip()]
+    return "\n\n".join(paragraphs)
+
+
 def _quality_score(text: str) -> float:
     """
     内容质量评分（0~1）。
@@ -17,6 +17,7 @@ class CrawlResult(BaseModel):
     """单次爬取的统一结果。"""
 
     url: str
+    canonical_url: str = ""  # 规范化后的 URL（缓存/去重用的键），见 spider.core.urls
     title: str = ""
     markdown: str = ""
     fit_markdown: str = ""
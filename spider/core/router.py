@@ -7,10 +7,19 @@ URL 路由器。
 
 from __future__ import annotations
 
+import logging
+import threading
+from pathlib import Path
+from typing import Any
 from urllib.parse import urlparse
 
 from spider.adapters.default import DefaultAdapter
+from spider.adapters.registry import AdapterRegistry, get_registry
+from spider.core.domains import DomainTrie
 from spider.core.engine import BaseEngine
+from spider.core.routing import RoutingFile, get_routing_file
+
+logger = logging.getLogger("spider.router")
 
 
 class Router:
@@ -18,9 +27,18 @@ class Router:
     URL → (Engine, Adapter) 路由。
 
     规则优先级：
-    1. 精确域名匹配（注册的适配器）
-    2. 引擎类型判断（需要 JS 渲染 → Crawl4AI，静态 → HTTP）
-    3. 兜底使用默认引擎 + 默认适配器
+    1. 精确域名匹配（注册的适配器 > 规则文件按名字绑定的适配器 > AdapterRegistry 的声明）
+    2. 适配器声明的引擎偏好（adapter.engines 回退链）
+    3. 引擎类型判断（需要 JS 渲染 → Crawl4AI，静态 → HTTP）
+    4. 兜底使用默认引擎 + 默认适配器
+
+    所有域名规则（注册表的适配器声明、显式注册的适配器、BROWSER_REQUIRED、STATIC_SAFE、NO_PROXY、
+    规则文件）编译进一棵 DomainTrie，每个 URL 只沿主机名标签走一遍；同一属性多处命中时最深的域名优先。
+    注册表的适配器以声明挂在树上，路由命中时才加载。
+    规则文件（routing）改动后，下次匹配时重建索引并整体替换。
+
+    索引只和规则有关，引擎可以在 plan() 时按次传入：进程内用 get_router() 共享一个实例，
+    不必每次抓取都重新编译。
     """
 
     # 已知需要浏览器渲染的域名（持续积累）
@@ -62,73 +80,214 @@ class Router:
 
     def __init__(
         self,
-        default_engine: BaseEngine,
+        default_engine: BaseEngine | None = None,
         http_engine: BaseEngine | None = None,
         adapters: dict[str, DefaultAdapter] | None = None,
+        registry: AdapterRegistry | None = None,
+        routing: RoutingFile | None = None,
     ):
         self._default_engine = default_engine
         self._http_engine = http_engine
-        self._adapters: dict[str, DefaultAdapter] = adapters or {}
+        self._registry = registry
+        self._routing = routing
+        self._routing_version = 0
+        self._adapters: dict[str, DefaultAdapter] = {}
         self._default_adapter = DefaultAdapter()
+        self._rules = self._compile()
+        for domain, adapter in (adapters or {}).items():
+            self.register_adapter(domain, adapter)
+
+    def _compile(self) -> DomainTrie[dict[str, Any]]:
+        """把内置域名集合、注册表、规则文件和显式注册的适配器编译成 域名 → {属性: 值} 的后缀树。"""
+        rules: DomainTrie[dict[str, Any]] = DomainTrie()
+        if self._registry is not None:
+            for domain, spec in self._registry.items():
+                rules.setdefault(domain, {})["adapter_spec"] = spec
+        for domain in self.BROWSER_REQUIRED:
+            rules.setdefault(domain, {})["engine"] = "browser"
+        for domain in self.STATIC_SAFE:
+            rules.setdefault(domain, {})["engine"] = "http"
+        for domain in self.NO_PROXY:
+            rules.setdefault(domain, {})["direct"] = True
+
+        if self._routing is not None:
+            for domain, rule in self._routing.rules().items():
+                try:
+                    attrs = rules.setdefault(domain, {})
+                except ValueError as e:
+                    logger.warning("routing rule skipped: %s", e)
+                    continue
+                if rule.engine is not None:
+                    attrs["engine"] = rule.engine
+                    attrs["pinned"] = True  # 文件指定的引擎优先于适配器的 engines 声明
+                if rule.direct is not None:
+                    attrs["direct"] = rule.direct
+                if rule.adapter is not None:
+                    attrs["adapter_name"] = rule.adapter
+                if rule.timeout is not None:
+                    attrs["timeout"] = rule.timeout
+                if rule.concurrency is not None:
+                    attrs["concurrency"] = (domain, rule.concurrency)
+            self._routing_version = self._routing.version
+
+        for domain, adapter in self._adapters.items():
+            rules.setdefault(domain, {})["adapter"] = adapter
+        return rules
 
     def register_adapter(self, domain: str, adapter: DefaultAdapter) -> None:
-        """注册域名专用适配器。"""
+        """注册域名专用适配器（对子域名同样生效）。"""
+        domain = domain.lower()
         self._adapters[domain] = adapter
+        self._rules.setdefault(domain, {})["adapter"] = adapter
 
     def route(self, url: str) -> tuple[BaseEngine, DefaultAdapter]:
         """
         路由 URL 到合适的引擎和适配器。
 
-        返回: (engine, adapter) 元组
+        返回: (engine, adapter) 元组（engine 为回退链的第一个）
+        """
+        engines, adapter = self.plan(url)
+        return engines[0], adapter
+
+    def plan(
+        self,
+        url: str,
+        *,
+        default_engine: BaseEngine | None = None,
+        http_engine: BaseEngine | None = None,
+    ) -> tuple[list[BaseEngine], DefaultAdapter]:
+        """
+        路由 URL，返回完整的引擎回退链和适配器。
+
+        default_engine / http_engine: 本次抓取用的引擎，不传用构造时给的
+
+        返回: ([engine, fallback...], adapter)，链至少有一个引擎
         """
+        browser = default_engine or self._default_engine
+        http = http_engine or self._http_engine
+        if browser is None:
+            raise ValueError("Router.plan() needs a default engine")
         domain = self._extract_domain(url)
+        rules = self._match(domain)
 
         # 1. 查适配器（适配器可能指定引擎偏好）
-        adapter = self._find_adapter(domain)
+        adapter = self._find_adapter(domain, rules)
 
-        # 2. 选引擎
-        engine = self._select_engine(domain)
+        # 2. 选引擎：规则文件钉死的引擎 > 适配器偏好 > 按域名判断
+        if rules.get("pinned"):
+            # 钉到 HTTP 时保留浏览器兜底，HTTP 抓不到内容不至于直接失败
+            names = ("http", "browser") if rules["engine"] == "http" else ("browser",)
+            engines = self._resolve_engines(names, "routing rule", browser, http)
+        else:
+            engines = self._resolve_engines(adapter.engines, f"adapter {adapter.name}", browser, http)
+        if not engines:
+            engines = [self._select_engine(domain, rules, browser, http)]
 
-        return engine, adapter
+        return engines, adapter
+
+    def adapter(self, url: str) -> DefaultAdapter:
+        """只查适配器（不选引擎）。"""
+        return self._find_adapter(self._extract_domain(url))
+
+    def timeout(self, url: str) -> int | None:
+        """规则文件给该域名设的超时（秒），没有返回 None。"""
+        return self._match(self._extract_domain(url)).get("timeout")
+
+    def concurrency(self, url: str) -> tuple[str, int] | None:
+        """规则文件给该域名设的并发上限：(规则所在域名, 上限)，子域名共享同一个名额。"""
+        return self._match(self._extract_domain(url)).get("concurrency")
+
+    def _resolve_engines(
+        self,
+        names: tuple[str, ...] | list[str],
+        owner: str,
+        browser: BaseEngine | None,
+        http: BaseEngine | None,
+    ) -> list[BaseEngine]:
+        """把引擎名解析为引擎实例（没有 HTTP 引擎时跳过 "http"）。"""
+        chain: list[BaseEngine] = []
+        for name in names:
+            if name == "http":
+                engine = http
+            elif name == "browser":
+                engine = browser
+            else:
+                raise ValueError(f"{owner}: unknown engine {name!r}")
+            if engine is not None and engine not in chain:
+                chain.append(engine)
+        return chain
 
     def _extract_domain(self, url: str) -> str:
         """提取主域名（去掉 www. 前缀）。"""
-        host = urlparse(url).netloc.lower()
+        host = urlparse(url).hostname or ""
         if host.startswith("www."):
             host = host[4:]
         return host
 
-    def _find_adapter(self, domain: str) -> DefaultAdapter:
-        """按域名查找适配器，支持子域名匹配。"""
-        # 精确匹配
-        if domain in self._adapters:
-            return self._adapters[domain]
-        # 主域名匹配（sub.example.com → example.com）
-        parts = domain.split(".")
-        if len(parts) > 2:
-            parent = ".".join(parts[-2:])
-            if parent in self._adapters:
-                return self._adapters[parent]
+    def _match(self, domain: str) -> dict[str, Any]:
+        """一次遍历收集沿途所有规则，深的覆盖浅的。"""
+        if self._routing is not None:
+            self._routing.rules()  # 按间隔检查文件 mtime，必要时重新解析
+            if self._routing.version != self._routing_version:
+                self._rules = self._compile()  # 整体替换引用，进行中的匹配仍用旧树
+        merged: dict[str, Any] = {}
+        for _, attrs in self._rules.walk(domain):
+            merged.update(attrs)
+        return merged
+
+    def _find_adapter(self, domain: str, rules: dict[str, Any] | None = None) -> DefaultAdapter:
+        """按域名查找适配器，支持子域名匹配（最长后缀优先）。"""
+        if rules is None:
+            rules = self._match(domain)
+        # 显式注册的适配器
+        if "adapter" in rules:
+            return rules["adapter"]
+        # 规则文件按名字绑定的适配器
+        if "adapter_name" in rules and self._registry is not None:
+            adapter = self._registry.get(rules["adapter_name"])
+            if adapter is not None:
+                return adapter
+            logger.warning("routing rule for %s: unknown adapter %r", domain, rules["adapter_name"])
+        # 注册表的声明（命中时才导入适配器模块）
+        if "adapter_spec" in rules and self._registry is not None:
+            adapter = self._registry.load(rules["adapter_spec"])
+            if adapter is not None:
+                return adapter
         return self._default_adapter
 
-    def _select_engine(self, domain: str) -> BaseEngine:
+    def _select_engine(
+        self, domain: str, rules: dict[str, Any], browser: BaseEngine, http: BaseEngine | None,
+    ) -> BaseEngine:
         """根据域名选引擎。"""
         # 已知静态站 + 有 HTTP 引擎 → 用轻量引擎
-        if self._http_engine and self._is_static(domain):
-            return self._http_engine
-        return self._default_engine
+        if http and self._is_static(domain, rules):
+            return http
+        return browser
 
-    def _is_static(self, domain: str) -> bool:
+    def _is_static(self, domain: str, rules: dict[str, Any] | None = None) -> bool:
         """判断域名是否可以用纯 HTTP 抓取。"""
-        for safe in self.STATIC_SAFE:
-            if domain == safe or domain.endswith("." + safe):
-                return True
-        return False
+        if rules is None:
+            rules = self._match(domain)
+        return rules.get("engine") == "http"
 
     def needs_direct(self, url: str) -> bool:
         """判断 URL 是否需要直连（代理会被封）。"""
-        domain = self._extract_domain(url)
-        for no_proxy in self.NO_PROXY:
-            if domain == no_proxy or domain.endswith("." + no_proxy):
-                return True
-        return False
+        return bool(self._match(self._extract_domain(url)).get("direct"))
+
+
+_routers: dict[Path | None, Router] = {}
+_routers_lock = threading.Lock()
+
+
+def get_router(routing_file: str | Path | None = None) -> Router:
+    """
+    进程内按规则文件共享一个 Router（没有规则文件的共用一个）：索引只编译一次，
+    规则文件改了由 Router 自己重建。引擎在 plan() 时传入。
+    """
+    key = Path(routing_file).resolve() if routing_file else None
+    with _routers_lock:
+        router = _routers.get(key)
+        if router is None:
+            routing = get_routing_file(key) if key is not None else None
+            router = _routers[key] = Router(registry=get_registry(), routing=routing)
+        return router
@@ -0,0 +1,183 @@
+"""
+路由规则文件 — 域名级的引擎、代理、适配器、超时、并发上限，改文件即生效。
+
+TOML（标准库 tomllib）或 YAML（需安装 PyYAML）：
+
+    [domains."example.com"]
+    engine = "http"          # "http" | "browser"
+    direct = true            # 不走代理
+    adapter = "wikipedia"    # 绑定到注册表里的适配器（按名字）
+    timeout = 10             # 秒，覆盖 SpiderConfig.timeout
+    concurrency = 2          # 该域名（含子域名）同时在抓的 URL 上限
+
+规则对域名及其子域名生效，与 Router 内置集合合并，同一域名以文件为准。
+RoutingFile 按 mtime 轮询（最多每 check_interval 秒 stat 一次），变了就重新解析；
+Router 下次匹配时重建后缀树并整体替换引用，已经拿到路由结果的抓取不受影响。
+文件写坏时保留上一版规则，只记日志。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+import tomllib
+import weakref
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger("spider.router")
+
+ENGINES = ("http", "browser")
+
+
+@dataclass(frozen=True)
+class DomainRule:
+    """单个域名的路由规则（None 表示不设置，沿用父域名或默认值）。"""
+
+    engine: str | None = None
+    direct: bool | None = None
+    adapter: str | None = None
+    timeout: int | None = None
+    concurrency: int | None = None
+
+    @classmethod
+    def from_dict(cls, domain: str, data: dict[str, Any]) -> DomainRule:
+        unknown = set(data) - {"engine", "direct", "adapter", "timeout", "concurrency"}
+        if unknown:
+            raise ValueError(f"{domain}: unknown keys {sorted(unknown)}")
+        engine = data.get("engine")
+        if engine is not None and engine not in ENGINES:
+            raise ValueError(f"{domain}: engine must be one of {ENGINES}, got {engine!r}")
+        for key in ("timeout", "concurrency"):
+            value = data.get(key)
+            if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value <= 0):
+                raise ValueError(f"{domain}: {key} must be a positive integer, got {value!r}")
+        direct = data.get("direct")
+        if direct is not None and not isinstance(direct, bool):
+            raise ValueError(f"{domain}: direct must be true/false, got {direct!r}")
+        return cls(
+            engine=engine,
+            direct=direct,
+            adapter=data.get("adapter"),
+            timeout=data.get("timeout"),
+            concurrency=data.get("concurrency"),
+        )
+
+
+def load_routing_file(path: str | Path) -> dict[str, DomainRule]:
+    """解析规则文件（.toml / .yaml / .yml），返回 域名 → DomainRule。格式错误抛 ValueError。"""
+    path = Path(path)
+    if path.suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as e:
+            raise ImportError("YAML routing files need PyYAML: pip install pyyaml") from e
+        data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    else:
+        data = tomllib.loads(path.read_text(encoding="utf-8"))
+
+    domains = data.get("domains", {})
+    if not isinstance(domains, dict):
+        raise ValueError(f"{path}: 'domains' must be a table")
+    rules: dict[str, DomainRule] = {}
+    for domain, rule in domains.items():
+        if not isinstance(rule, dict):
+            raise ValueError(f"{path}: rule for {domain!r} must be a table")
+        rules[domain.lower().strip(".")] = DomainRule.from_dict(domain, rule)
+    return rules
+
+
+class RoutingFile:
+    """
+    规则文件的热加载视图。
+
+    rules() 返回当前生效的规则；version 每次成功重载加一，Router 据此判断要不要重建索引。
+    """
+
+    def __init__(self, path: str | Path, *, check_interval: float = 1.0):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self.version = 0
+        self._rules: dict[str, DomainRule] = {}
+        self._mtime: float | None = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self._reload()
+
+    def rules(self) -> dict[str, DomainRule]:
+        now = time.monotonic()
+        if now - self._checked >= self.check_interval:
+            with self._lock:
+                if now - self._checked >= self.check_interval:
+                    self._checked = now
+                    self._reload()
+        return self._rules
+
+    def _reload(self) -> None:
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            mtime = None
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+        if mtime is None:
+            logger.warning("routing file %s not found, using built-in rules", self.path)
+            rules: dict[str, DomainRule] = {}
+        else:
+            try:
+                rules = load_routing_file(self.path)
+            except (OSError, ValueError, ImportError) as e:
+                # tomllib.TOMLDecodeError / yaml.YAMLError 都是 ValueError 子类
+                logger.warning("routing file %s rejected, keeping previous rules: %s", self.path, e)
+                return
+        self._rules = rules
+        self.version += 1
+        logger.info("routing file %s loaded: %d domains (v%d)", self.path, len(rules), self.version)
+
+
+_files: dict[Path, RoutingFile] = {}
+_files_lock = threading.Lock()
+
+
+def get_routing_file(path: str | Path) -> RoutingFile:
+    """进程内同一路径共享一个 RoutingFile（规则不必每次重新解析）。"""
+    key = Path(path).resolve()
+    with _files_lock:
+        routing = _files.get(key)
+        if routing is None:
+            routing = _files[key] = RoutingFile(key)
+        return routing
+
+
+class DomainLimiter:
+    """
+    按规则域名限制并发：同一条规则下的所有子域名共享一个信号量。
+
+    信号量按事件循环分开存放（asyncio.Semaphore 不能跨循环使用）；上限改了就换新的信号量，
+    已在旧信号量里排队的抓取照常完成。
+    """
+
+    def __init__(self) -> None:
+        self._loops: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, tuple[int, asyncio.Semaphore]]]
+        self._loops = weakref.WeakKeyDictionary()
+
+    @asynccontextmanager
+    async def slot(self, domain: str | None, limit: int | None) -> AsyncIterator[None]:
+        if not domain or not limit:
+            yield
+            return
+        sems = self._loops.setdefault(asyncio.get_running_loop(), {})
+        entry = sems.get(domain)
+        if entry is None or entry[0] != limit:
+            entry = sems[domain] = (limit, asyncio.Semaphore(limit))
+        async with entry[1]:
+            yield
+
+
+limiter = DomainLimiter()
@@ -0,0 +1,89 @@
+"""
+SimHash 近似重复指纹 — 只差时间戳、广告位、"相关文章"块的页面指纹只差几位。
+
+- 文本切词（拉丁字母数字成词，中日韩按单字），相邻 3 个词组成 shingle，每个 shingle 取 64 位哈希
+- 每一位按 shingle 出现次数加权投票，过半为 1，得到 64 位指纹
+- 两篇文本的相似度 = 1 - 汉明距离 / 64
+
+LSH 分桶：指纹切成 BANDS 段，汉明距离 < BANDS 的两个指纹至少有一段完全相同（抽屉原理），
+按段建索引即可快速找候选，再逐个算距离（见 spider.storage.neardup）。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from collections import Counter
+
+from spider.core.result import CrawlResult
+
+BITS = 64
+BANDS = 4
+BAND_BITS = BITS // BANDS
+SHINGLE = 3
+
+_MASK = (1 << BITS) - 1
+_TOKEN = re.compile(r"[\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af]|[^\W_]+")
+
+
+def simhash(text: str) -> int:
+    """64 位 SimHash；空文本为 0。"""
+    tokens = _TOKEN.findall(text.lower())
+    if not tokens:
+        return 0
+    if len(tokens) < SHINGLE:
+        shingles = Counter([" ".join(tokens)])
+    else:
+        shingles = Counter(" ".join(tokens[i:i + SHINGLE]) for i in range(len(tokens) - SHINGLE + 1))
+
+    # 按字节统计权重，再展开成位：每个 shingle 只做 8 次累加，而不是 64 次
+    tallies = [[0] * 256 for _ in range(BITS // 8)]
+    total = 0
+    for shingle, weight in shingles.items():
+        digest = hashlib.blake2b(shingle.encode(), digest_size=BITS // 8).digest()
+        for tally, byte in zip(tallies, digest, strict=True):
+            tally[byte] += weight
+        total += weight
+
+    fp = 0
+    for pos, tally in enumerate(tallies):
+        for bit in range(8):
+            ones = sum(w for byte, w in enumerate(tally) if w and byte >> (7 - bit) & 1)
+            if ones * 2 > total:
+                fp |= 1 << (BITS - 1 - (pos * 8 + bit))
+    return fp
+
+
+def hamming(a: int, b: int) -> int:
+    return ((a ^ b) & _MASK).bit_count()
+
+
+def similarity(a: int, b: int) -> float:
+    return 1 - hamming(a, b) / BITS
+
+
+def max_distance(threshold: float) -> int:
+    """相似度阈值 → 允许的最大汉明距离。"""
+    return int((1 - threshold) * BITS + 1e-9)
+
+
+def bands(fp: int) -> list[int]:
+    """LSH 分桶键：段号和段值拼成一个整数。"""
+    mask = (1 << BAND_BITS) - 1
+    return [(i << BAND_BITS) | (fp >> (i * BAND_BITS) & mask) for i in range(BANDS)]
+
+
+def result_simhash(result: CrawlResult) -> int:
+    """结果正文的指纹：管道已算好的（metadata["simhash"]，十六进制）优先。"""
+    stored = result.metadata.get("simhash")
+    if stored:
+        return int(stored, 16)
+    return simhash(result.fit_markdown or result.markdown)
+
+
+def with_simhash(result: CrawlResult) -> CrawlResult:
+    """把正文指纹记到 metadata["simhash"]（16 位十六进制）。在适配器后处理之后调用，指纹对应最终正文。"""
+    text = result.fit_markdown or result.markdown
+    if not text or result.status == "failed":
+        return result
+    return result.model_copy(update={"metadata": {**result.metadata, "simhash": f"{simhash(text):016x}"}})
@@ -0,0 +1,263 @@
+"""
+结构化元数据提取 — JSON-LD / 微数据 / OpenGraph / <meta>。
+
+新闻、财经站点大多在 <head> 和 ld+json 脚本里直接声明标题、作者、日期、站点名，
+用正则扫这几类标签即可，不需要建 DOM。ContentExtractor 先跑这里，
+字段齐全时跳过 trafilatura 的元数据提取；有 articleBody 时连正文提取也跳过。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+from html import unescape
+from typing import Any
+
+logger = logging.getLogger("spider.extractor")
+
+# ContentExtractor 认为"齐全"所需的字段
+REQUIRED_FIELDS = ("title", "author", "date", "sitename")
+
+# 优先采用的 JSON-LD 类型（页面常同时有 WebSite / BreadcrumbList / Organization）
+_ARTICLE_TYPES = {
+    "Article", "NewsArticle", "ReportageNewsArticle", "AnalysisNewsArticle", "OpinionNewsArticle",
+    "BlogPosting", "TechArticle", "ScholarlyArticle", "LiveBlogPosting", "Report",
+}
+
+_LD_JSON = re.compile(
+    r"<script\b[^>]*\btype\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script>",
+    re.IGNORECASE | re.DOTALL,
+)
+_META = re.compile(r"<meta\b[^>]*>", re.IGNORECASE)
+_ITEMPROP_TAG = re.compile(r"<(?:meta|time|link)\b[^>]*\bitemprop\s*=[^>]*>", re.IGNORECASE)
+_ITEMPROP_TEXT = re.compile(
+    r"<(h1|h2|span|a|div|p)\b[^>]*\bitemprop\s*=\s*[\"']?(headline|author)[\"']?[^>]*>(.*?)</\1>",
+    re.IGNORECASE | re.DOTALL,
+)
+_ATTR = re.compile(r"([\w:.-]+)\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s>]+))")
+_TAG = re.compile(r"<[^>]+>")
+_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# <meta name/property=...> → 字段（同一字段靠前的优先）
+_META_FIELDS: dict[str, str] = {
+    "og:title": "title",
+    "twitter:title": "title",
+    "og:site_name": "sitename",
+    "application-name": "sitename",
+    "og:description": "description",
+    "description": "description",
+    "twitter:description": "description",
+    "og:image": "image",
+    "twitter:image": "image",
+    "author": "author",
+    "article:author": "author",
+    "parsely-author": "author",
+    "sailthru.author": "author",
+    "article:published_time": "date",
+    "parsely-pub-date": "date",
+    "pubdate": "date",
+    "publish-date": "date",
+    "date": "date",
+    "dc.date": "date",
+    "article:section": "categories",
+    "article:tag": "tags",
+    "keywords": "tags",
+    "news_keywords": "tags",
+}
+
+_ITEMPROP_FIELDS = {
+    "headline": "title",  # 不收 name：微数据里作者、发布者的名字也用 itemprop="name"
+    "author": "author",
+    "datepublished": "date",
+    "description": "description",
+    "articlesection": "categories",
+    "keywords": "tags",
+}
+
+
+def extract_structured(html: str) -> dict[str, Any]:
+    """
+    提取结构化元数据。
+
+    返回字段（有才有）：title / author / date（YYYY-MM-DD）/ sitename / description / image /
+    categories / tags / article_body，以及 sources（命中的来源列表）。
+    来源优先级：JSON-LD > 微数据 > OpenGraph/<meta>。
+    """
+    out: dict[str, Any] = {}
+    sources: list[str] = []
+    for name, found in (("json-ld", _from_json_ld(html)), ("microdata", _from_microdata(html)), ("meta", _from_meta(html))):
+        if found:
+            sources.append(name)
+            for key, value in found.items():
+                out.setdefault(key, value)
+    if sources:
+        out["sources"] = sources
+    return out
+
+
+def is_complete(meta: dict[str, Any]) -> bool:
+    """标题/作者/日期/站点名都有了，不必再跑 trafilatura 的元数据提取。"""
+    return all(meta.get(k) for k in REQUIRED_FIELDS)
+
+
+# --- JSON-LD ---
+
+
+def _from_json_ld(html: str) -> dict[str, Any]:
+    nodes: list[dict] = []
+    for block in _LD_JSON.findall(html):
+        try:
+            data = json.loads(block.strip().removeprefix("<!--").removesuffix("-->"))
+        except ValueError as e:
+            logger.debug("invalid ld+json skipped: %s", e)
+            continue
+        nodes.extend(_flatten(data))
+    if not nodes:
+        return {}
+
+    primary = next((n for n in nodes if _types(n) & _ARTICLE_TYPES), None)
+    primary = primary or next((n for n in nodes if "WebPage" in _types(n)), None)
+    if primary is None:
+        return {}
+
+    out: dict[str, Any] = {}
+    _put(out, "title", primary.get("headline") or primary.get("name"))
+    _put(out, "author", _names(primary.get("author")))
+    _put(out, "date", _date(primary.get("datePublished") or primary.get("dateCreated")))
+    _put(out, "sitename", _names(primary.get("publisher")))
+    _put(out, "description", primary.get("description"))
+    _put(out, "image", _image(primary.get("image")))
+    _put(out, "categories", _list(primary.get("articleSection")))
+    _put(out, "tags", _list(primary.get("keywords")))
+    _put(out, "article_body", _text(primary.get("articleBody")))
+    if "sitename" not in out:
+        site = next((n for n in nodes if _types(n) & {"WebSite", "Organization", "NewsMediaOrganization"}), None)
+        if site:
+            _put(out, "sitename", site.get("name"))
+    return out
+
+
+def _flatten(data: Any) -> list[dict]:
+    """顶层可能是对象、数组或带 @graph 的对象。"""
+    if isinstance(data, list):
+        return [n for item in data for n in _flatten(item)]
+    if not isinstance(data, dict):
+        return []
+    if "@graph" in data:
+        return _flatten(data["@graph"])
+    return [data]
+
+
+def _types(node: dict) -> set[str]:
+    t = node.get("@type", ())
+    return {t} if isinstance(t, str) else set(t)
+
+
+# --- 微数据 ---
+
+
+def _from_microdata(html: str) -> dict[str, Any]:
+    if "itemprop" not in html:
+        return {}
+    out: dict[str, Any] = {}
+    for tag in _ITEMPROP_TAG.findall(html):
+        attrs = _attrs(tag)
+        key = _ITEMPROP_FIELDS.get(attrs.get("itemprop", "").lower())
+        value = attrs.get("content") or attrs.get("datetime")
+        if key and value:
+            _put(out, key, _date(value) if key == "date" else value)
+    for _, prop, inner in _ITEMPROP_TEXT.findall(html):
+        text = unescape(_TAG.sub("", inner)).strip()
+        if text:
+            _put(out, _ITEMPROP_FIELDS[prop.lower()], text)
+    return out
+
+
+# --- OpenGraph / <meta> ---
+
+
+def _from_meta(html: str) -> dict[str, Any]:
+    out: dict[str, Any] = {}
+    tags: list[str] = []
+    for tag in _META.findall(html):
+        attrs = _attrs(tag)
+        name = (attrs.get("property") or attrs.get("name") or "").lower()
+        key = _META_FIELDS.get(name)
+        value = attrs.get("content", "").strip()
+        if not key or not value:
+            continue
+        if key == "tags":
+            tags.extend(_list(value))
+        elif key == "author" and value.startswith("http"):
+            continue  # article:author 常是作者主页 URL
+        elif key == "date":
+            _put(out, key, _date(value))
+        elif key == "categories":
+            _put(out, key, [value])
+        else:
+            _put(out, key, value)
+    if tags:
+        out["tags"] = list(dict.fromkeys(tags))
+    return out
+
+
+# --- 工具 ---
+
+
+def _attrs(tag: str) -> dict[str, str]:
+    return {m[0].lower(): unescape(m[1] or m[2] or m[3]) for m in _ATTR.findall(tag)}
+
+
+def _put(out: dict[str, Any], key: str, value: Any) -> None:
+    """只填还没有的字段，空值忽略。"""
+    if isinstance(value, str):
+        value = value.strip()
+    if value and key not in out:
+        out[key] = value
+
+
+def _text(value: Any) -> str:
+    """正文：字符串，或分段的字符串列表（其他形状不认）。"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list) and all(isinstance(v, str) for v in value):
+        return "\n\n".join(v.strip() for v in value if v.strip())
+    return ""
+
+
+def _names(value: Any) -> str:
+    """作者/发布者：字符串、{"name": ...} 或它们的列表。"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return value.get("name", "") if isinstance(value.get("name"), str) else ""
+    if isinstance(value, list):
+        return "; ".join(n for n in (_names(v) for v in value) if n)
+    return ""
+
+
+def _image(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return value.get("url", "")
+    if isinstance(value, list) and value:
+        return _image(value[0])
+    return ""
+
+
+def _list(value: Any) -> list[str]:
+    if isinstance(value, str):
+        return [v.strip() for v in value.split(",") if v.strip()]
+    if isinstance(value, list):
+        return [v.strip() for v in value if isinstance(v, str) and v.strip()]
+    return []
+
+
+def _date(value: Any) -> str:
+    """ISO 日期/时间 → YYYY-MM-DD（与 trafilatura 的 date 格式一致）；其他格式原样保留。"""
+    if not isinstance(value, str):
+        return ""
+    m = _DATE.match(value.strip())
+    return m.group(0) if m else value.strip()
@@ -0,0 +1,81 @@
+"""
+URL 规范化 — 缓存、存储、批量去重统一用规范形式做键。
+
+同一页面经分享后常带着 utm_* 等追踪参数、#锚点、顺序不同的查询串、www. 前缀或结尾斜杠，
+按原始字符串比较就会缓存未命中、重复入库。规范化步骤：
+
+1. scheme / 主机名小写，去掉 www. 和默认端口
+2. 去掉 #fragment（"#!" / "#/" 开头的 SPA 路由保留）
+3. 去掉追踪参数；域名配置了白名单时只保留白名单里的参数
+4. 剩余参数按 key 排序（同名参数保持原相对顺序）
+5. 路径去掉结尾斜杠，空路径记为 "/"
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from spider.core.domains import DomainTrie
+
+# 追踪参数（精确名）
+TRACKING_PARAMS: frozenset[str] = frozenset({
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid", "twclid", "ttclid", "li_fat_id",
+    "mc_cid", "mc_eid", "_ga", "_gl", "_hsenc", "_hsmi", "igshid", "mkt_tok", "oly_anon_id", "oly_enc_id",
+    "ref_src", "ref_url", "s_cid", "cmpid", "spm", "share_source", "share_medium", "vd_source", "smid",
+})
+# 追踪参数（前缀）
+TRACKING_PREFIXES: tuple[str, ...] = ("utm_", "pk_", "mtm_", "hsa_")
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class Canonicalizer:
+    """
+    带按域名参数白名单的规范化器。
+
+    allowlists: 域名 → 保留的参数名，对子域名同样生效（最具体的域名优先），
+    如 {"youtube.com": ["v", "list"]} 会把 watch?v=…&t=30&feature=share 规范为 watch?v=…。
+    """
+
+    def __init__(self, allowlists: Mapping[str, Iterable[str]] | None = None):
+        self._allow: DomainTrie[frozenset[str]] = DomainTrie()
+        for domain, params in (allowlists or {}).items():
+            self._allow.insert(domain, frozenset(params))
+
+    def __call__(self, url: str) -> str:
+        parts = urlsplit(url.strip())
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            return url  # data:、about: 等原样返回
+        try:
+            port = parts.port
+        except ValueError:
+            return url  # 端口非法，交给引擎报错
+
+        scheme = parts.scheme.lower()
+        hostname = parts.hostname.removeprefix("www.")
+        netloc = f"[{hostname}]" if ":" in hostname else hostname  # IPv6
+        if port and port != _DEFAULT_PORTS[scheme]:
+            netloc = f"{netloc}:{port}"
+
+        hit = self._allow.longest(hostname)
+        allowed = hit[1] if hit else None
+        params = [
+            (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+            if (k in allowed if allowed is not None else not _is_tracking(k))
+        ]
+        params.sort(key=lambda kv: kv[0])
+
+        path = parts.path.rstrip("/") or "/"
+        fragment = parts.fragment if parts.fragment.startswith(("!", "/")) else ""
+        return urlunsplit((scheme, netloc, path, urlencode(params), fragment))
+
+
+def canonicalize_url(url: str, allowlists: Mapping[str, Iterable[str]] | None = None) -> str:
+    """规范化单个 URL（批量使用请复用 Canonicalizer，白名单只编译一次）。"""
+    return Canonicalizer(allowlists)(url)
+
+
+def _is_tracking(key: str) -> bool:
+    key = key.lower()
+    return key in TRACKING_PARAMS or key.startswith(TRACKING_PREFIXES)
@@ -0,0 +1,128 @@
+"""
+Cookie 文件读写 — 两个引擎共用同一种 JSON 格式。
+
+格式即 Playwright 的 cookie 列表（浏览器导出插件 / context.cookies() 的输出）：
+    [{"name": ..., "value": ..., "domain": ".example.com", "path": "/",
+      "expires": 1767225600, "httpOnly": true, "secure": true, "sameSite": "Lax"}]
+也接受 storage_state 格式（{"cookies": [...], "origins": [...]}）。
+
+session(path)：进程内每个 cookie 文件一个共享的 jar，首次用到时从文件载入；
+每次 crawl() 新建的引擎都用它，Set-Cookie 在多次抓取间保持。
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from http.cookiejar import Cookie, CookieJar
+from pathlib import Path
+from typing import Any
+
+
+def load_cookie_file(path: str | Path) -> list[dict[str, Any]]:
+    """读 cookie JSON，返回 Playwright 格式的 cookie 列表。文件不存在返回空列表。"""
+    path = Path(path)
+    if not path.exists():
+        return []
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(data, dict):
+        data = data.get("cookies", [])
+    return [c for c in data if isinstance(c, dict) and "name" in c and "value" in c]
+
+
+def save_cookie_file(path: str | Path, cookies: list[dict[str, Any]]) -> None:
+    """原子写回（先写临时文件再替换，中途崩溃不会留下半个文件）。"""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(cookies, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def to_cookie(c: dict[str, Any]) -> Cookie:
+    """Playwright cookie dict → http.cookiejar.Cookie（保留过期时间、secure、HttpOnly、SameSite）。"""
+    domain = c.get("domain", "")
+    expires = c.get("expires")
+    session = expires is None or expires < 0
+    rest: dict[str, str | None] = {}
+    if c.get("httpOnly"):
+        rest["HttpOnly"] = None
+    if c.get("sameSite"):
+        rest["SameSite"] = c["sameSite"]
+    return Cookie(
+        version=0,
+        name=c["name"],
+        value=c["value"],
+        port=None,
+        port_specified=False,
+        domain=domain,
+        domain_specified=domain.startswith("."),
+        domain_initial_dot=domain.startswith("."),
+        path=c.get("path") or "/",
+        path_specified=True,
+        secure=bool(c.get("secure")),
+        expires=None if session else int(expires),
+        discard=session,
+        comment=None,
+        comment_url=None,
+        rest=rest,
+    )
+
+
+def from_cookie(cookie: Cookie) -> dict[str, Any]:
+    """http.cookiejar.Cookie → Playwright cookie dict。"""
+    rest = {k.lower(): v for k, v in cookie._rest.items()}  # Set-Cookie 属性名大小写不定
+    same_site = (rest.get("samesite") or "Lax").capitalize()
+    return {
+        "name": cookie.name,
+        "value": cookie.value or "",
+        "domain": cookie.domain,
+        "path": cookie.path,
+        "expires": cookie.expires if cookie.expires is not None else -1,
+        "httpOnly": "httponly" in rest,
+        "secure": cookie.secure,
+        "sameSite": same_site if same_site in ("Strict", "Lax", "None") else "Lax",
+    }
+
+
+def cookie_domains(cookies: list[dict[str, Any]]) -> set[str]:
+    return {c.get("domain", "").lstrip(".") for c in cookies if c.get("domain")}
+
+
+def matches_domains(cookie: Cookie, domains: set[str]) -> bool:
+    """cookie 的域名与 domains 中任一相同，或互为父子域。"""
+    d = cookie.domain.lstrip(".")
+    return any(d == x or d.endswith("." + x) or x.endswith("." + d) for x in domains)
+
+
+def jar_cookies(jar: CookieJar, domains: set[str]) -> list[dict[str, Any]]:
+    """导出 jar 里属于 domains 的 cookie（过期的不导出）。"""
+    jar.clear_expired_cookies()
+    return [from_cookie(c) for c in jar if matches_domains(c, domains)]
+
+
+@dataclass
+class CookieSession:
+    """一个 cookie 文件在进程内的会话状态。"""
+
+    jar: CookieJar
+    domains: set[str]  # 文件涉及的域名 + 用它抓取过的域名（写回时只写这些域名的 cookie）
+
+
+_sessions: dict[Path, CookieSession] = {}
+_sessions_lock = threading.Lock()
+
+
+def session(path: str | Path) -> CookieSession:
+    """进程内该 cookie 文件的共享会话（首次调用时载入文件）。"""
+    key = Path(path).resolve()
+    with _sessions_lock:
+        s = _sessions.get(key)
+        if s is None:
+            loaded = load_cookie_file(key)
+            jar = CookieJar()
+            for c in loaded:
+                jar.set_cookie(to_cookie(c))
+            s = _sessions[key] = CookieSession(jar, cookie_domains(loaded))
+        return s
@@ -2,20 +2,82 @@
 Crawl4AI 引擎 — 主力浏览器渲染引擎。
 
 基于 Crawl4AI 0.8.x 的 AsyncWebCrawler，支持反检测、JS 渲染、Cookie 注入。
+
+抓包模式（FetchConfig.extra["capture"]）：记录 URL 匹配的 XHR/fetch JSON 响应，
+放进 result.metadata["xhr"]；抓够 capture_min 个即结束页面，不再滚动/等待完整渲染。
 """
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
+import re
 import time
-from pathlib import Path
+from typing import Any
 
 from spider.core.engine import BaseEngine, FetchConfig
 from spider.core.result import CrawlResult
+from spider.engines.cookies import load_cookie_file
 
 logger = logging.getLogger("spider.crawl4ai")
 
+# 抓够后在页面里置的标记，wait_for 轮询它提前结束
+_CAPTURE_FLAG = "__spiderCaptureDone"
+_MAX_CAPTURES = 50
+
+
+class ResponseCapture:
+    """
+    页面网络响应记录器：URL 匹配任一正则、且是 JSON 的响应体存下来。
+
+    挂在 page.on("response") 上；够 min_count 个后在页面置标记，让 wait_for 提前返回。
+    """
+
+    def __init__(self, patterns: list[str], min_count: int = 1):
+        self._patterns = [re.compile(p) for p in patterns]
+        self._min_count = min_count
+        self._pending: set[asyncio.Task] = set()
+        self._page: Any = None
+        self.captured: list[dict[str, Any]] = []
+
+    @property
+    def done(self) -> bool:
+        return len(self.captured) >= self._min_count
+
+    def attach(self, page: Any) -> None:
+        self._page = page
+        page.on("response", self._on_response)
+
+    def _on_response(self, response: Any) -> None:
+        # playwright 的事件回调是同步的，读响应体要另起任务
+        if len(self.captured) >= _MAX_CAPTURES or not any(p.search(response.url) for p in self._patterns):
+            return
+        task = asyncio.ensure_future(self.record(response))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def record(self, response: Any) -> None:
+        content_type = response.headers.get("content-type", "")
+        if "json" not in content_type and response.request.resource_type not in ("xhr", "fetch"):
+            return
+        try:
+            data = await response.json()
+        except Exception as e:  # 非 JSON / 页面已关闭
+            logger.debug("capture %s skipped: %s", response.url, e)
+            return
+        was_done = self.done
+        self.captured.append({"url": response.url, "status": response.status, "data": data})
+        if self.done and not was_done and self._page is not None:
+            try:
+                await self._page.evaluate(f"window.{_CAPTURE_FLAG} = true")
+            except Exception as e:
+                logger.debug("capture flag not set: %s", e)
+
+    async def drain(self) -> None:
+        """等还在读的响应体读完（页面关闭后会失败，记录器内部吞掉）。"""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
 
 class Crawl4AIEngine(BaseEngine):
     """Crawl4AI 浏览器渲染引擎。"""
@@ -99,10 +161,20 @@ class Crawl4AIEngine(BaseEngine):
             }
             if cfg.selector:
                 run_kwargs["css_selector"] = cfg.selector
-            if cfg.wait > 0:
-                run_kwargs["delay_before_return_html"] = cfg.wait
-            if cfg.scroll:
-                run_kwargs["scan_full_page"] = True
+
+            capture: ResponseCapture | None = None
+            if cfg.extra.get("capture"):
+                # 抓包模式：等到想要的响应到达即返回，不滚动、不额外等待
+                # 没等到也不算失败：超过 capture_timeout 后照常返回渲染结果
+                capture = ResponseCapture(cfg.extra["capture"], cfg.extra.get("capture_min", 1))
+                give_up_ms = int(cfg.extra.get("capture_timeout", cfg.timeout) * 1000)
+                run_kwargs["wait_for"] = f"js:() => window.{_CAPTURE_FLAG} === true || performance.now() > {give_up_ms}"
+                run_kwargs["wait_for_timeout"] = cfg.timeout * 1000
+            else:
+                if cfg.wait > 0:
+                    run_kwargs["delay_before_return_html"] = cfg.wait
+                if cfg.scroll:
+                    run_kwargs["scan_full_page"] = True
             if cfg.js_code:
                 run_kwargs["js_code"] = cfg.js_code
             if cfg.extra.get("screenshot"):
@@ -111,24 +183,38 @@ class Crawl4AIEngine(BaseEngine):
             rc = CrawlerRunConfig(**run_kwargs)
 
             # Cookie 注入
-            if cfg.cookie_file:
-                cookie_path = Path(cfg.cookie_file)
-                if cookie_path.exists():
-                    cookies = json.loads(cookie_path.read_text())
-                    if (
-                        hasattr(self._crawler, "crawler_strategy")
-                        and self._crawler.crawler_strategy
-                    ):
-                        ctx = getattr(
-                            self._crawler.crawler_strategy, "browser_context", None
-                        )
-                        if ctx:
-                            await ctx.add_cookies(cookies)
+            cookies = load_cookie_file(cfg.cookie_file) if cfg.cookie_file else []
+            if cookies and (
+                hasattr(self._crawler, "crawler_strategy")
+                and self._crawler.crawler_strategy
+            ):
+                ctx = getattr(
+                    self._crawler.crawler_strategy, "browser_context", None
+                )
+                if ctx:
+                    await ctx.add_cookies(cookies)
 
             # 执行抓取
-            result = await self._crawler.arun(url=url, config=rc)
+            if capture is not None:
+                result = await self._arun_capturing(url, rc, capture)
+            else:
+                result = await self._crawler.arun(url=url, config=rc)
             duration_ms = int((time.monotonic() - t0) * 1000)
 
+            xhr_meta: dict = {}
+            if capture is not None:
+                xhr_meta = {"xhr": capture.captured, "capture_complete": capture.done}
+                if not result.success and capture.captured:
+                    # 页面超时/出错但已抓到响应：数据比渲染结果更有用，保留
+                    return CrawlResult(
+                        url=url,
+                        engine=self.name,
+                        status="partial",
+                        error=result.error_message or "",
+                        duration_ms=duration_ms,
+                        metadata=xhr_meta,
+                    )
+
             if not result.success:
                 return CrawlResult(
                     url=url,
@@ -173,6 +259,7 @@ class Crawl4AIEngine(BaseEngine):
                 engine=self.name,
                 status="success" if (raw_md or fit_md) else "partial",
                 duration_ms=duration_ms,
+                metadata=xhr_meta,
             )
 
         except Exception as e:
@@ -186,6 +273,29 @@ class Crawl4AIEngine(BaseEngine):
                 duration_ms=duration_ms,
             )
 
+    async def _arun_capturing(self, url: str, rc: Any, capture: ResponseCapture) -> Any:
+        """
+        挂上响应记录 hook 执行抓取，结束后恢复原来的 hook（crawler 实例在多次抓取间复用）。
+
+        原来已有 hook 时照常调用它，记录器只是串在前面。
+        """
+        assert self._crawler is not None
+        strategy = self._crawler.crawler_strategy
+        previous = getattr(strategy, "hooks", {}).get("on_page_context_created")
+
+        async def on_page_context_created(page, context, **kwargs):
+            capture.attach(page)
+            if previous is not None:
+                return await previous(page, context=context, **kwargs)
+            return page
+
+        strategy.set_hook("on_page_context_created", on_page_context_created)
+        try:
+            return await self._crawler.arun(url=url, config=rc)
+        finally:
+            strategy.set_hook("on_page_context_created", previous)
+            await capture.drain()
+
     async def close(self) -> None:
         """关闭浏览器。"""
         if self._crawler is not None:
@@ -2,6 +2,10 @@
 HTTP 轻量引擎 — 用于不需要 JS 渲染的静态页面。
 
 基于 httpx + markdownify，无需浏览器，速度快、资源省。
+FetchConfig.selector 生效：只把匹配的子树转成 markdown（整页 HTML 仍保留给元数据提取）。
+FetchConfig.cookie_file 生效：与浏览器引擎同一种 cookie JSON，client 改用该文件在进程内的
+共享 jar（cookies.session），之后的 Set-Cookie 在多次抓取、多个引擎实例间保持；
+save_cookies=True 时关闭引擎写回文件。
 """
 
 from __future__ import annotations
@@ -9,15 +13,50 @@ from __future__ import annotations
 import logging
 import re
 import time
+from functools import lru_cache
+from typing import Any
 
 import httpx
-from markdownify import markdownify
+import soupsieve
+from bs4 import BeautifulSoup
+from markdownify import MarkdownConverter, markdownify
 
+from spider.core.domains import registrable_domain
 from spider.core.engine import BaseEngine, FetchConfig
 from spider.core.result import CrawlResult
+from spider.engines import cookies
 
 logger = logging.getLogger("spider.http")
 
+# 转换前整个删掉的标签（markdownify 的 strip 只去标签、保留内容）
+_DROP_TAGS = ("script", "style", "noscript", "svg", "nav", "footer")
+
+
+@lru_cache(maxsize=256)
+def _compile_selector(selector: str) -> soupsieve.SoupSieve:
+    """选择器编译缓存（同一适配器的选择器每次抓取都一样）。"""
+    return soupsieve.compile(selector)
+
+
+def select_markdown(html: str, selector: str) -> tuple[str, int]:
+    """只转换匹配 selector 的子树，返回 (markdown, 匹配数)。无匹配返回 ("", 0)。"""
+    matched = _compile_selector(selector).select(BeautifulSoup(html, "lxml"))
+    if not matched:
+        return "", 0
+    converter = MarkdownConverter(heading_style="ATX")
+    parts = []
+    for node in matched:
+        for junk in node.find_all(_DROP_TAGS):
+            junk.decompose()
+        parts.append(converter.convert_soup(node).strip())
+    return "\n\n".join(p for p in parts if p), len(matched)
+
+
+def html_to_markdown(html: str) -> str:
+    """整页 HTML → markdown（脚本、样式、导航等去掉标签），合并连续空行。"""
+    raw_md = markdownify(html, heading_style="ATX", strip=["script", "style", "nav", "footer", "noscript", "svg"])
+    return re.sub(r"\n{3,}", "\n\n", raw_md).strip()
+
 
 class HttpEngine(BaseEngine):
     """httpx 轻量引擎，适合纯静态页面。"""
@@ -26,9 +65,36 @@ class HttpEngine(BaseEngine):
 
     def __init__(self):
         self._client: httpx.AsyncClient | None = None
+        self._save_cookie_files: set[str] = set()
 
     async def _ensure_client(self, config: FetchConfig) -> httpx.AsyncClient:
-        """惰性初始化 httpx client。"""
+        """惰性初始化 httpx client；config 指定了 cookie 文件时换用它的共享 jar。"""
+        client = self._build_client(config)
+        if config.cookie_file:
+            if config.save_cookies:
+                self._save_cookie_files.add(config.cookie_file)
+            jar = cookies.session(config.cookie_file).jar
+            if client.cookies.jar is not jar:
+                client.cookies.jar = jar
+        return client
+
+    def _track_cookie_domain(self, config: FetchConfig, url: str) -> None:
+        """抓取过的域名也算进 cookie 文件的范围（文件原本没有该域名的 cookie 时，新 Set-Cookie 也能写回）。"""
+        if config.cookie_file and config.save_cookies:
+            host = httpx.URL(url).host
+            if host:
+                cookies.session(config.cookie_file).domains.add(host)
+
+    def _default_cookies(self, client: httpx.AsyncClient, url: str, defaults: dict[str, str]) -> None:
+        """jar 里该站点还没有的 cookie 才补上（挂在可注册域名上），不覆盖文件或 Set-Cookie 给的值。"""
+        host = httpx.URL(url).host
+        domain = registrable_domain(host)
+        jar = client.cookies.jar
+        for name, value in defaults.items():
+            if not any(c.name == name and cookies.matches_domains(c, {host}) for c in jar):
+                jar.set_cookie(cookies.to_cookie({"name": name, "value": value, "domain": f".{domain}"}))
+
+    def _build_client(self, config: FetchConfig) -> httpx.AsyncClient:
         if self._client is None:
             proxy = config.proxy if config.proxy else None
             self._client = httpx.AsyncClient(
@@ -47,10 +113,49 @@ class HttpEngine(BaseEngine):
             )
         return self._client
 
+    async def get(
+        self,
+        url: str,
+        config: FetchConfig | None = None,
+        *,
+        params: dict | None = None,
+        headers: dict | None = None,
+        cookies: dict[str, str] | None = None,
+    ) -> httpx.Response:
+        """
+        共享 client 的原始 GET（适配器快速通道用）。非 2xx 抛 httpx.HTTPStatusError。
+
+        cookies: 站点需要的默认 cookie，并进 jar（jar 里已有同名的不覆盖）。
+        """
+        cfg = config or FetchConfig()
+        client = await self._ensure_client(cfg)
+        self._track_cookie_domain(cfg, url)
+        if cookies:
+            self._default_cookies(client, url, cookies)
+        resp = await client.get(url, params=params, headers=headers)
+        resp.raise_for_status()
+        return resp
+
+    async def get_json(
+        self,
+        url: str,
+        config: FetchConfig | None = None,
+        *,
+        params: dict | None = None,
+        headers: dict | None = None,
+    ) -> Any:
+        """GET 并解析 JSON。"""
+        resp = await self.get(
+            url, config, params=params,
+            headers={"Accept": "application/json", **(headers or {})},
+        )
+        return resp.json()
+
     async def fetch(self, url: str, config: FetchConfig | None = None) -> CrawlResult:
         """HTTP GET 抓取 + HTML→Markdown 转换。"""
         cfg = config or FetchConfig()
         client = await self._ensure_client(cfg)
+        self._track_cookie_domain(cfg, url)
 
         t0 = time.monotonic()
         try:
@@ -68,8 +173,25 @@ class HttpEngine(BaseEngine):
         duration_ms = int((time.monotonic() - t0) * 1000)
         html = resp.text
 
-        # HTML → Markdown
-        raw_md = markdownify(html, heading_style="ATX", strip=["script", "style", "nav", "footer", "noscript", "svg"])
+        # HTML → Markdown（有选择器时只转匹配部分；没匹配上退回整页）
+        metadata: dict[str, Any] = {}
+        raw_md = ""
+        if cfg.selector:
+            try:
+                raw_md, matched = select_markdown(html, cfg.selector)
+            except soupsieve.SelectorSyntaxError as e:
+                return CrawlResult(
+                    url=url,
+                    engine=self.name,
+                    status="failed",
+                    error=f"invalid selector {cfg.selector!r}: {e}",
+                    duration_ms=duration_ms,
+                )
+            metadata["selector_matched"] = matched if raw_md else 0
+            if not raw_md:
+                logger.debug("selector %r matched nothing on %s, converting whole page", cfg.selector, url)
+        if not raw_md:
+            raw_md = html_to_markdown(html)
         # 简单清理：合并连续空行
         raw_md = re.sub(r"\n{3,}", "\n\n", raw_md).strip()
 
@@ -86,16 +208,24 @@ class HttpEngine(BaseEngine):
             url=url,
             title=title,
             markdown=raw_md,
-            fit_markdown="",  # HTTP 引擎不做智能去噪
+            # HTTP 引擎不做智能去噪；选择器选中的内容本身就是正文
+            fit_markdown=raw_md if metadata.get("selector_matched") else "",
             html=html,
             links=list(set(links)),
             engine=self.name,
             status="success" if raw_md else "partial",
             duration_ms=duration_ms,
+            metadata=metadata,
         )
 
     async def close(self) -> None:
-        """关闭 httpx client。"""
+        """关闭 httpx client（需要时先把 cookie 写回文件）。"""
         if self._client is not None:
+            for cookie_file in self._save_cookie_files:
+                s = cookies.session(cookie_file)
+                saved = cookies.jar_cookies(s.jar, s.domains)
+                cookies.save_cookie_file(cookie_file, saved)
+                logger.debug("saved %d cookies to %s", len(saved), cookie_file)
             await self._client.aclose()
             self._client = None
+            self._save_cookie_files.clear()
@@ -7,6 +7,7 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -32,10 +33,36 @@ class SpiderConfig(BaseSettings):
     # 存储
     storage_dir: Path = Path("storage")
     db_name: str = "spider.db"
+    page_blobs: bool = True  # 正文存压缩段文件（storage/blobs/）；False 则每个版本一个 pages/*.md
+    keyframe_interval: int = 20  # 同一 URL 的版本存差分，每隔这么多个版本存一次全文（需 page_blobs）
+    # 近似重复（SimHash）：link 照常保存并标注最像的已存页面，skip 不保存，off 不检测
+    near_duplicates: Literal["off", "link", "skip"] = "link"
+    near_duplicate_threshold: float = 0.95  # 相似度阈值（1 - 汉明距离/64）
+    keep_html: bool = False  # 原始 HTML 也压缩存档（需 page_blobs），可用 spider.storage.reextract 离线重新提取
+    # 按月分区（storage/partitions/YYYY-MM/），大归档查询延迟不随总量增长，旧月份删目录即可；
+    # domain_groups 再按域名组分（域名 → 组名，子域名继承）。见 spider/storage/partitioned.py
+    partitioned: bool = False
+    domain_groups: dict[str, str] = {}
+
+    # 缓存：默认有效期（秒），域名 → 有效期（子域名继承，优先于适配器的 cache_ttl）
+    cache_ttl: int = 3600
+    cache_ttls: dict[str, int] = {}
+    # 进程内热缓存（SQLite 前面的 LRU）：条数 / 正文总字符数上限，条数为 0 关闭
+    memory_cache_entries: int = 512
+    memory_cache_chars: int = 32 * 1024 * 1024
+    # 缓存过期后先返回旧结果、后台重抓；过期超过 max_stale 秒的仍同步重抓
+    stale_while_revalidate: bool = False
+    max_stale: int = 86400
 
     # 并发
     max_concurrency: int = 5
 
+    # URL 规范化：域名 → 保留的查询参数（其余一律去掉；未配置的域名只去追踪参数）
+    canonical_params: dict[str, list[str]] = {}
+
+    # 路由规则文件（TOML/YAML，改动后自动重载；见 spider/core/routing.py）
+    routing_file: Path | None = None
+
     # 日志
     verbose: bool = False
 
@@ -46,3 +73,7 @@ class SpiderConfig(BaseSettings):
     @property
     def pages_dir(self) -> Path:
         return self.storage_dir / "pages"
+
+    @property
+    def partitions_dir(self) -> Path:
+        return self.storage_dir / "partitions"
@@ -6,50 +6,199 @@
 
 from __future__ import annotations
 
+import asyncio
+import atexit
 import logging
+import threading
 from dataclasses import replace
+from functools import partial
+from pathlib import Path
 
-from spider.core.engine import FetchConfig
+from spider.adapters.default import DefaultAdapter
+from spider.core.engine import BaseEngine, FetchConfig
 from spider.core.extractor import ContentExtractor
 from spider.core.result import CrawlResult
-from spider.core.router import Router
+from spider.core.router import get_router
+from spider.core.routing import limiter
+from spider.core.simhash import with_simhash
+from spider.core.urls import Canonicalizer
 from spider.engines.crawl4ai_engine import Crawl4AIEngine
 from spider.engines.http_engine import HttpEngine
 from spider.infra.config import SpiderConfig
+from spider.storage.cache import CachePolicy, HotCache, age_seconds
+from spider.storage.partitioned import PartitionedStorage
 from spider.storage.sqlite import SpiderStorage
+from spider.storage.writer import StorageWriter
 
 logger = logging.getLogger("spider")
 
-# 适配器注册表（模块级，不重复创建）
-_adapter_registry: list | None = None
+
+def _default_fetch_config(cfg: SpiderConfig) -> FetchConfig:
+    return FetchConfig(
+        proxy=cfg.proxy if cfg.use_proxy else None,
+        timeout=cfg.timeout,
+        stealth=cfg.stealth,
+        headless=cfg.headless,
+        verbose=cfg.verbose,
+    )
+
+
+def open_storage(cfg: SpiderConfig) -> SpiderStorage | PartitionedStorage:
+    """按配置打开存储：单库，或 cfg.partitioned 时按月（+ 域名组）分区。"""
+    options = {
+        "blobs": cfg.page_blobs,
+        "keyframe_interval": cfg.keyframe_interval,
+        "near_duplicates": cfg.near_duplicates,
+        "similarity": cfg.near_duplicate_threshold,
+        "keep_html": cfg.keep_html,
+    }
+    if cfg.partitioned:
+        return PartitionedStorage(cfg.partitions_dir, domain_groups=cfg.domain_groups, **options)
+    return SpiderStorage(cfg.db_path, cfg.pages_dir, **options)
+
+
+_writers: dict[Path, StorageWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(cfg: SpiderConfig) -> StorageWriter:
+    """
+    进程内同一数据库共享一个存储 + 后台写入线程（退出时写完队列再关闭）。
+
+    写入是异步的：crawl(save=True) 返回时结果可能还在队列里，需要立即可查时先 flush()。
+    """
+    key = cfg.db_path.resolve()
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = _writers[key] = StorageWriter(open_storage(cfg))
+            atexit.register(writer.close)
+        return writer
+
+
+_hot_cache: HotCache | None = None
+
+
+def get_hot_cache(cfg: SpiderConfig) -> HotCache:
+    """进程内共享的热缓存（容量按第一次调用时的配置）。"""
+    global _hot_cache
+    with _writers_lock:
+        if _hot_cache is None:
+            _hot_cache = HotCache(cfg.memory_cache_entries, cfg.memory_cache_chars)
+        return _hot_cache
 
 
-def _get_adapters():
-    """惰性加载所有适配器（避免每次 crawl() 重新 import + 实例化）。"""
-    global _adapter_registry
-    if _adapter_registry is not None:
-        return _adapter_registry
+def cache_stats() -> dict:
+    """热缓存的命中/未命中/过期/淘汰计数。"""
+    return _hot_cache.stats() if _hot_cache is not None else HotCache(0).stats()
 
-    from spider.adapters.finance import (
-        BloombergAdapter,
-        FTAdapter,
-        InvestingAdapter,
-        MyfxbookAdapter,
-        WSJAdapter,
-        YahooFinanceAdapter,
+
+def _from_cache(
+    storage: SpiderStorage | PartitionedStorage, key: str, max_age_seconds: int = 3600,
+) -> CrawlResult | None:
+    """按规范 URL 查缓存，命中返回 status="cached" 的结果，否则 None。"""
+    cached = storage.get_cached(key, max_age_seconds=max_age_seconds)
+    if not cached:
+        return None
+    md_content = storage.load_content(cached)
+    if not md_content:
+        return None
+    # 内容没变的重抓只推后 checked_at：新鲜度按最近一次确认算
+    checked_at = cached.get("checked_at") or cached["crawled_at"]
+    return CrawlResult(
+        url=cached["url"],
+        canonical_url=cached.get("canonical_url") or key,
+        title=cached.get("title", ""),
+        markdown=md_content,
+        fit_markdown=md_content,  # 文件里存的是 fit，两个都赋值
+        engine=cached.get("engine", ""),
+        status="cached",
+        crawled_at=checked_at,
+        metadata={"from_cache": True, "cached_at": checked_at},
     )
-    from spider.adapters.news import BBCAdapter, CNBCAdapter, Jin10Adapter, ReutersAdapter
-    from spider.adapters.social import MediumAdapter, RedditAdapter, Trends24Adapter, TwitterAdapter, YouTubeAdapter
-    from spider.adapters.tech import HackerNewsAdapter, TechCrunchAdapter, TheVergeAdapter, WikipediaAdapter
 
-    _adapter_registry = [
-        BBCAdapter(), CNBCAdapter(), ReutersAdapter(), Jin10Adapter(),
-        RedditAdapter(), Trends24Adapter(), TwitterAdapter(), MediumAdapter(), YouTubeAdapter(),
-        InvestingAdapter(), YahooFinanceAdapter(), MyfxbookAdapter(),
-        BloombergAdapter(), WSJAdapter(), FTAdapter(),
-        TechCrunchAdapter(), TheVergeAdapter(), WikipediaAdapter(), HackerNewsAdapter(),
-    ]
-    return _adapter_registry
+
+def _from_memory(hot: HotCache, key: str, max_age_seconds: int) -> CrawlResult | None:
+    result = hot.get(key, max_age_seconds)
+    if result is None:
+        return None
+    metadata = {**result.metadata, "from_cache": True, "cache": "memory"}
+    metadata.setdefault("cached_at", result.crawled_at.isoformat(timespec="seconds"))
+    return result.model_copy(update={"status": "cached", "metadata": metadata})
+
+
+async def _lookup(
+    hot: HotCache, storage: SpiderStorage | PartitionedStorage, key: str, max_age_seconds: int,
+) -> CrawlResult | None:
+    """先查内存，再查 SQLite（线程里读，命中后放进内存）。"""
+    result = _from_memory(hot, key, max_age_seconds)
+    if result is not None:
+        return result
+    result = await asyncio.to_thread(_from_cache, storage, key, max_age_seconds)
+    if result is not None:
+        hot.put(key, result)
+    return result
+
+
+_revalidations: dict[str, asyncio.Task] = {}
+
+
+def _revalidate(url: str, key: str, cfg: SpiderConfig, fetch_config: FetchConfig | None) -> None:
+    """在当前事件循环里排一次后台重抓（同一规范 URL 同时只有一个），结果照常写库并更新热缓存。"""
+    if key in _revalidations:
+        return
+    task = asyncio.create_task(crawl(url, save=True, no_cache=True, config=cfg, fetch_config=fetch_config))
+    _revalidations[key] = task
+    task.add_done_callback(partial(_revalidated, key))
+
+
+def _revalidated(key: str, task: asyncio.Task) -> None:
+    _revalidations.pop(key, None)
+    if task.cancelled():
+        return
+    if (e := task.exception()) is not None:
+        logger.warning("background refresh failed for %s: %s", key, e)
+    elif task.result().status == "failed":
+        logger.warning("background refresh failed for %s: %s", key, task.result().error)
+
+
+async def wait_revalidations() -> None:
+    """等待已排队的后台重抓完成（脚本退出前调用，否则事件循环关闭时会被取消）。"""
+    while _revalidations:
+        await asyncio.gather(*_revalidations.values(), return_exceptions=True)
+
+
+async def _fetch(
+    url: str,
+    fc: FetchConfig,
+    engines: list[BaseEngine],
+    adapter: DefaultAdapter,
+    http: HttpEngine,
+    *,
+    fast_path: bool = True,
+) -> CrawlResult:
+    """先试适配器快速通道，再按引擎回退链抓取（成功即停）。"""
+    if fast_path:
+        try:
+            fast = await adapter.fast_fetch(url, fc, http)
+        except Exception as e:
+            logger.warning("fast path failed for %s: %s", url, e)
+            fast = None
+        if fast is not None and fast.status != "failed":
+            return fast
+        if fast is not None:
+            logger.info("fast path failed for %s: %s, using engines", url, fast.error)
+
+    tried: list[str] = []
+    for engine in engines:
+        result = await engine.fetch(url, fc)
+        if result.status == "success" or engine is engines[-1]:
+            break
+        logger.info("%s via %s -> %s, falling back", url, engine.name, result.status)
+        tried.append(engine.name)
+    if tried:
+        result = result.model_copy(update={"metadata": {**result.metadata, "fallback_from": tried}})
+    return result
 
 
 async def crawl(
@@ -60,6 +209,7 @@ async def crawl(
     config: SpiderConfig | None = None,
     fetch_config: FetchConfig | None = None,
     screenshot: bool = False,
+    stale_while_revalidate: bool | None = None,
 ) -> CrawlResult:
     """
     抓取单个 URL，返回统一结果。
@@ -71,83 +221,168 @@ async def crawl(
         config: 全局配置（默认自动加载）
         fetch_config: 运行时抓取配置（覆盖默认）
         screenshot: 是否截图
+        stale_while_revalidate: 缓存过期不超过 max_stale 秒时直接返回旧结果
+            （metadata["stale"] = True），同时在后台重抓；None 取 config 的设置
 
     返回:
         CrawlResult 统一结果对象
     """
     cfg = config or SpiderConfig()
-    storage = SpiderStorage(cfg.db_path, cfg.pages_dir) if save else None
+    writer = get_writer(cfg) if save else None
+    hot = get_hot_cache(cfg)
+    canonical = Canonicalizer(cfg.canonical_params)(url)
+
+    # 路由
+    crawl4ai = Crawl4AIEngine()
+    http = HttpEngine()
+    router = get_router(cfg.routing_file)
+    engines, adapter = router.plan(url, default_engine=crawl4ai, http_engine=http)
+
+    # 检查缓存（按规范 URL，追踪参数、锚点不同也能命中；有效期按域名/适配器取）
+    if writer and not no_cache:
+        ttl = CachePolicy(cfg.cache_ttl, cfg.cache_ttls).ttl(url, adapter)
+        if stale_while_revalidate is None:
+            stale_while_revalidate = cfg.stale_while_revalidate
+        window = ttl + cfg.max_stale if stale_while_revalidate else ttl
+        cached = await _lookup(hot, writer.storage, canonical, window)
+        if cached is not None:
+            age = age_seconds(cached)
+            # 没开 SWR 时窗口就是 ttl，命中即新鲜（checked_at 截到秒，算出的 age 可能比 ttl 多出不到 1 秒）
+            if age <= ttl or not stale_while_revalidate:
+                return cached
+            # 过期但仍在 max_stale 之内：先给旧结果，后台刷新
+            _revalidate(url, canonical, cfg, fetch_config)
+            metadata = {**cached.metadata, "stale": True, "stale_seconds": int(age - ttl), "revalidating": True}
+            return cached.model_copy(update={"metadata": metadata})
 
+    # 构建 FetchConfig（不 mutate 用户传入的对象）
+    fc = fetch_config or _default_fetch_config(cfg)
+
+    # 规则文件里的域名超时（只覆盖 SpiderConfig 的默认值，不覆盖调用方传入的 fetch_config）
+    timeout = router.timeout(url)
+    if timeout and fetch_config is None:
+        fc = replace(fc, timeout=timeout)
+
+    # 直连判断
+    if router.needs_direct(url):
+        fc = replace(fc, proxy=None)
+
+    # 适配器定制配置（不 mutate 原对象，先复制再传入）
+    fc = adapter.customize_config(fc)
+
+    # 截图配置（HTTP 引擎截不了图，只留浏览器）
+    if screenshot:
+        fc = replace(fc, extra={**fc.extra, "screenshot": True})
+        engines = [e for e in engines if e is not http] or [crawl4ai]
+
+    # 抓取（规则文件里的域名并发上限在这里排队）
+    limit_domain, limit = router.concurrency(url) or (None, None)
     try:
-        # 检查缓存
-        if save and not no_cache and storage:
-            cached = storage.get_cached(url)
-            if cached and cached.get("file_path"):
-                file_path = cfg.storage_dir / cached["file_path"]
-                md_content = ""
-                if file_path.exists():
-                    md_content = file_path.read_text(encoding="utf-8")
-                return CrawlResult(
-                    url=cached["url"],
-                    title=cached.get("title", ""),
-                    markdown=md_content,
-                    fit_markdown=md_content,  # 文件里存的是 fit，两个都赋值
-                    engine=cached.get("engine", ""),
-                    status="cached",
-                    metadata={"from_cache": True, "cached_at": cached["crawled_at"]},
-                )
+        async with limiter.slot(limit_domain, limit):
+            result = await _fetch(url, fc, engines, adapter, http, fast_path=not screenshot)
+    finally:
+        await crawl4ai.close()
+        await http.close()
 
-        # 构建 FetchConfig（不 mutate 用户传入的对象）
-        fc = fetch_config or FetchConfig(
-            proxy=cfg.proxy if cfg.use_proxy else None,
-            timeout=cfg.timeout,
-            stealth=cfg.stealth,
-            headless=cfg.headless,
-            verbose=cfg.verbose,
-        )
+    # 内容提取（trafilatura 正文提取 + 质量择优）
+    extractor = ContentExtractor()
+    result = extractor.extract(result)
 
-        # 路由
-        crawl4ai = Crawl4AIEngine()
-        http = HttpEngine()
-        router = Router(default_engine=crawl4ai, http_engine=http)
+    # 适配器后处理（站点特有精调）
+    result = adapter.transform(result)
+    result = with_simhash(result.model_copy(update={"canonical_url": canonical}))
 
-        for a in _get_adapters():
-            for domain in a.domains:
-                router.register_adapter(domain, a)
+    # 存储（交给后台写入线程，不等落盘；同时放进热缓存）
+    if writer:
+        await writer.asubmit(result)
+        hot.put(canonical, result)
 
-        engine, adapter = router.route(url)
+    return result
 
-        # 直连判断
-        if router.needs_direct(url):
-            fc = replace(fc, proxy=None)
 
-        # 适配器定制配置（不 mutate 原对象，先复制再传入）
-        fc = adapter.customize_config(fc)
+async def crawl_many(
+    urls: list[str],
+    *,
+    save: bool = False,
+    no_cache: bool = False,
+    config: SpiderConfig | None = None,
+    fetch_config: FetchConfig | None = None,
+) -> list[CrawlResult]:
+    """
+    批量抓取，返回与 urls 一一对应的结果（单个 URL 失败不影响其他）。
+
+    规范 URL 相同的只抓一次，结果共用。
+    同一适配器的 URL 先一起走批量快速通道（如 Wikipedia 一次 API 请求查多个标题），
+    没有快速通道或快速通道失败的 URL 再逐个 crawl()，并发数受 config.max_concurrency 限制。
+    """
+    cfg = config or SpiderConfig()
+    writer = get_writer(cfg) if save else None
+    hot = get_hot_cache(cfg)
+    canon = Canonicalizer(cfg.canonical_params)
+    keys = [canon(url) for url in urls]
+    first: dict[str, int] = {}
+    for i, key in enumerate(keys):
+        first.setdefault(key, i)
+    unique = list(first.values())
+    results: list[CrawlResult | None] = [None] * len(urls)
 
-        # 截图配置
-        if screenshot:
-            fc = replace(fc, extra={**fc.extra, "screenshot": True})
+    router = get_router(cfg.routing_file)
+    adapters = {i: router.adapter(urls[i]) for i in unique}
 
-        # 抓取
-        try:
-            result = await engine.fetch(url, fc)
-        finally:
-            await crawl4ai.close()
-            await http.close()
+    if writer and not no_cache:
+        policy = CachePolicy(cfg.cache_ttl, cfg.cache_ttls)
+        ttls = {i: policy.ttl(urls[i], adapters[i]) for i in unique}
+        for i in unique:
+            results[i] = _from_memory(hot, keys[i], ttls[i])
+        storage = writer.storage
+        misses = [i for i in unique if results[i] is None]
+        cached = await asyncio.to_thread(lambda: [_from_cache(storage, keys[i], ttls[i]) for i in misses])
+        for i, hit in zip(misses, cached, strict=True):
+            results[i] = hit
+            if hit is not None:
+                hot.put(keys[i], hit)
 
-        # 内容提取（trafilatura 正文提取 + 质量择优）
-        extractor = ContentExtractor()
-        result = extractor.extract(result)
+    # 按（适配器, 是否直连）分组，每组共享一个 HTTP client
+    groups: dict[tuple[str, bool], tuple[DefaultAdapter, list[int]]] = {}
+    for i in unique:
+        if results[i] is None:
+            adapter = adapters[i]
+            group = (adapter.name, router.needs_direct(urls[i]))
+            groups.setdefault(group, (adapter, []))[1].append(i)
 
-        # 适配器后处理（站点特有精调）
-        result = adapter.transform(result)
+    base_fc = fetch_config or _default_fetch_config(cfg)
+    for (_, direct), (adapter, indices) in groups.items():
+        fc = adapter.customize_config(replace(base_fc, proxy=None) if direct else base_fc)
+        async with HttpEngine() as http:
+            try:
+                fast = await adapter.fast_fetch_many([urls[i] for i in indices], fc, http)
+                if len(fast) != len(indices):
+                    raise ValueError(f"returned {len(fast)} results for {len(indices)} URLs")
+            except Exception as e:
+                logger.warning("batch fast path failed for %s: %s", adapter.name, e)
+                continue
+        for i, result in zip(indices, fast, strict=True):
+            if result is None or result.status == "failed":
+                continue
+            result = with_simhash(adapter.transform(result).model_copy(update={"canonical_url": keys[i]}))
+            if writer:
+                await writer.asubmit(result)
+                hot.put(keys[i], result)
+            results[i] = result
 
-        # 存储
-        if save and storage:
-            storage.save(result)
+    # 其余逐个走完整管道（缓存已查过）
+    sem = asyncio.Semaphore(cfg.max_concurrency)
 
-        return result
+    async def one(i: int) -> None:
+        async with sem:
+            try:
+                results[i] = await crawl(
+                    urls[i], save=save, no_cache=True, config=cfg, fetch_config=fetch_config,
+                )
+            except Exception as e:
+                logger.warning("crawl failed for %s: %s", urls[i], e)
+                results[i] = CrawlResult(url=urls[i], canonical_url=keys[i], status="failed", error=str(e))
+
+    await asyncio.gather(*(one(i) for i in unique if results[i] is None))
+    return [r for r in (results[first[key]] for key in keys) if r is not None]
 
-    finally:
-        if storage:
-            storage.close()
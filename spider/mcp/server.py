@@ -9,7 +9,8 @@ juanjuan-spider MCP Server 🕷️
 Tools:
   spider_scrape      — 抓取单个 URL，返回 markdown/html/text
   spider_batch       — 批量抓取多个 URL
-  spider_query       — 查询历史爬取记录（按 URL/域名/关键词）
+  spider_query       — 查询历史爬取记录（按 URL/域名/关键词，或正文全文检索）
+  spider_changes     — 某个 URL 或域名的内容变更（只返回改动的段落）
   spider_screenshot  — 网页截图
 """
 
@@ -25,20 +26,23 @@ from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import TextContent, Tool
 
+from spider.core.result import CrawlResult
 from spider.infra.config import SpiderConfig
+from spider.storage.partitioned import PartitionedStorage
 from spider.storage.sqlite import SpiderStorage
 
 logger = logging.getLogger("spider.mcp")
 
 _config = SpiderConfig()
-_storage: SpiderStorage | None = None
 
 
-def _get_storage() -> SpiderStorage:
-    global _storage
-    if _storage is None:
-        _storage = SpiderStorage(_config.db_path, _config.pages_dir)
-    return _storage
+def _get_storage() -> SpiderStorage | PartitionedStorage:
+    """查询用的存储：和后台写入线程共用一份（同一目录不开第二套 blobs），查之前先等队列写完。"""
+    from spider.main import get_writer
+
+    writer = get_writer(_config)
+    writer.flush()
+    return writer.storage
 
 
 async def _do_scrape(
@@ -51,16 +55,18 @@ async def _do_scrape(
     save: bool = True,
     no_cache: bool = False,
     screenshot: bool = False,
+    stale_while_revalidate: bool | None = None,
 ) -> dict[str, Any]:
     """核心抓取逻辑 — 调用 main.crawl()，不重复实现管道。"""
     from spider.core.engine import FetchConfig
     from spider.main import crawl
 
+    # 没有页面级选项时交给 crawl() 按配置构建（规则文件的域名超时、代理设置只在这时生效）
     fc = FetchConfig(
         wait=wait,
         scroll=scroll,
         selector=selector,
-    )
+    ) if wait or scroll or selector else None
 
     result = await crawl(
         url,
@@ -68,8 +74,13 @@ async def _do_scrape(
         no_cache=no_cache,
         fetch_config=fc,
         screenshot=screenshot,
+        stale_while_revalidate=stale_while_revalidate,
     )
+    return _format_result(result, format, max_chars, screenshot)
+
 
+def _format_result(result: CrawlResult, format: str, max_chars: int, screenshot: bool = False) -> dict[str, Any]:
+    """CrawlResult → tool 输出 dict。"""
     # 选择输出格式
     if format == "html":
         content = result.html
@@ -93,6 +104,8 @@ async def _do_scrape(
         "char_count": len(content),
         "duration_ms": result.duration_ms,
     }
+    if result.metadata.get("stale"):
+        out["stale_seconds"] = result.metadata["stale_seconds"]  # 已过期的缓存，后台正在刷新
 
     # 截图
     if screenshot and result.screenshot:
@@ -154,6 +167,13 @@ def create_server() -> Server:
                             "default": False,
                             "description": "忽略缓存，强制重抓",
                         },
+                        "stale_while_revalidate": {
+                            "type": "boolean",
+                            "description": (
+                                "缓存过期（不超过 max_stale）时立即返回旧结果并在后台重抓，"
+                                "输出带 stale_seconds；不传则用服务端配置"
+                            ),
+                        },
                     },
                     "required": ["url"],
                 },
@@ -187,6 +207,7 @@ def create_server() -> Server:
                 name="spider_query",
                 description=(
                     "查询历史爬取记录。支持按 URL、域名、关键词搜索，"
+                    "按正文全文检索（fulltext，返回相关度排序的命中片段），"
                     "或列出最近的爬取记录。"
                 ),
                 inputSchema={
@@ -204,6 +225,13 @@ def create_server() -> Server:
                             "type": "string",
                             "description": "按标题或 URL 模糊搜索",
                         },
+                        "fulltext": {
+                            "type": "string",
+                            "description": (
+                                "正文全文检索（空格分隔多个词，全部命中），按相关度排序，"
+                                "返回命中片段而不是全文；可与 domain 组合过滤"
+                            ),
+                        },
                         "limit": {
                             "type": "integer",
                             "default": 10,
@@ -212,6 +240,35 @@ def create_server() -> Server:
                     },
                 },
             ),
+            Tool(
+                name="spider_changes",
+                description=(
+                    "查询某个 URL 或域名下页面的内容变更（按时间倒序）。"
+                    "每条只返回相对上一版改动的段落（按 markdown 标题归并的新增/删除行），不返回全文。"
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "url": {
+                            "type": "string",
+                            "description": "页面 URL",
+                        },
+                        "domain": {
+                            "type": "string",
+                            "description": "域名（如 reuters.com），与 url 二选一",
+                        },
+                        "since": {
+                            "type": "string",
+                            "description": "只看此后的变更（ISO 时间，如 2026-10-01 或 2026-10-01T08:00:00+00:00）",
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "default": 20,
+                            "description": "返回条数上限",
+                        },
+                    },
+                },
+            ),
             Tool(
                 name="spider_screenshot",
                 description="对网页截图，返回 base64 编码的 PNG 图片。",
@@ -247,20 +304,16 @@ def create_server() -> Server:
                 urls = arguments.get("urls", [])
                 fmt = arguments.get("format", "markdown")
                 max_chars = arguments.get("max_chars", 5000)
+                # 同一适配器的 URL 批量走快速通道（如 Wikipedia 多标题一次 API 请求）
+                from spider.main import crawl_many
+
+                crawled = await crawl_many(urls, save=True)
                 results = []
-                for url in urls:
-                    try:
-                        r = await _do_scrape(
-                            url=url, format=fmt, max_chars=max_chars
-                        )
-                        results.append(r)
-                    except Exception as e:
-                        logger.warning("batch scrape failed for %s: %s", url, e)
-                        results.append({
-                            "url": url,
-                            "status": "failed",
-                            "error": str(e),
-                        })
+                for r in crawled:
+                    if r.status == "failed":
+                        results.append({"url": r.url, "status": "failed", "error": r.error})
+                    else:
+                        results.append(_format_result(r, fmt, max_chars))
                 return [TextContent(
                     type="text",
                     text=json.dumps(results, ensure_ascii=False, indent=2),
@@ -268,6 +321,22 @@ def create_server() -> Server:
 
             elif name == "spider_query":
                 storage = _get_storage()
+                if query := arguments.get("fulltext"):
+                    hits = storage.search_content(
+                        query, limit=arguments.get("limit", 10), domain=arguments.get("domain"),
+                    )
+                    ranked = [{
+                        "url": r["url"],
+                        "title": r.get("title", ""),
+                        "domain": r.get("domain", ""),
+                        "snippet": r["snippet"],
+                        "score": r["score"],
+                        "crawled_at": r.get("crawled_at", ""),
+                    } for r in hits]
+                    return [TextContent(
+                        type="text",
+                        text=json.dumps(ranked, ensure_ascii=False, indent=2),
+                    )]
                 if url := arguments.get("url"):
                     rows = storage.get_by_url(url)
                 elif domain := arguments.get("domain"):
@@ -297,6 +366,21 @@ def create_server() -> Server:
                     text=json.dumps(summary, ensure_ascii=False, indent=2),
                 )]
 
+            elif name == "spider_changes":
+                target = arguments.get("url") or arguments.get("domain")
+                if not target:
+                    return [TextContent(
+                        type="text",
+                        text=json.dumps({"error": "需要 url 或 domain"}, ensure_ascii=False),
+                    )]
+                changes = _get_storage().changes(
+                    target, since=arguments.get("since"), limit=arguments.get("limit", 20),
+                )
+                return [TextContent(
+                    type="text",
+                    text=json.dumps(changes, ensure_ascii=False, indent=2),
+                )]
+
             elif name == "spider_screenshot":
                 url = arguments["url"]
                 wait = arguments.get("wait", 1)
@@ -0,0 +1,254 @@
+"""
+内容寻址的正文存储 — 按 content_hash 去重、压缩后追加写入段文件。
+
+- 同一正文（多个 URL 转载同一篇、同一 URL 重抓内容没变）只存一份
+- 压缩：装了 zstandard 用 zstd，否则退回标准库 zlib；每条记录自带编码，两种可以混存
+- zstd 按域名训练共享字典：同站页面的导航、页脚、模板文字高度重复，小文档压缩率提升明显；
+  还没攒够的样本放在内存里，总量有上限，超了先丢最久没来新页面的域名
+- 段文件 seg-NNNNNN.blob 只追加、写满 segment_size 换下一个；索引（段号/偏移/长度）在 SQLite 的 blobs 表
+- 读取走 mmap + 偏移切片，批量读取按 (段, 偏移) 排序顺序扫
+- 同一目录可以有多个 BlobStore（MCP 服务和后台写入线程、并发的命令行进程）：追加时持有目录的
+  .lock 文件锁（fcntl），偏移取段文件的实际末尾，别的实例写过、换过段也不会写错位置
+
+BlobStore 不加线程锁也不提交事务，由 SpiderStorage 在自己的锁和事务里调用。
+"""
+
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import sqlite3
+import zlib
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+try:
+    import zstandard
+except ImportError:  # 可选依赖：pip install zstandard
+    zstandard = None
+
+try:
+    import fcntl
+except ImportError:  # Windows：没有文件锁，同一目录只能有一个写入者
+    fcntl = None
+
+logger = logging.getLogger("spider.storage")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash    TEXT    PRIMARY KEY,
+    segment INTEGER NOT NULL,
+    offset  INTEGER NOT NULL,
+    length  INTEGER NOT NULL,
+    size    INTEGER NOT NULL,
+    codec   TEXT    NOT NULL,
+    dict_id INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS blob_dicts (
+    id     INTEGER PRIMARY KEY,
+    domain TEXT    NOT NULL UNIQUE,
+    data   BLOB    NOT NULL
+);
+"""
+
+SEGMENT_SIZE = 64 * 1024 * 1024
+ZSTD_LEVEL = 9
+ZLIB_LEVEL = 6
+DICT_SAMPLES = 200       # 同域名攒够这么多页面后训练字典
+DICT_SIZE = 64 * 1024
+SAMPLE_BYTES = 16 * 1024  # 每个样本只取开头（模板文字多在头尾）
+SAMPLE_BUDGET = 64 * 1024 * 1024  # 所有域名待训练样本的总字节上限
+_LOOKUP_CHUNK = 500       # IN (...) 参数个数上限以内
+
+_INSERT = "INSERT OR IGNORE INTO blobs (hash, segment, offset, length, size, codec, dict_id) VALUES (?, ?, ?, ?, ?, ?, ?)"
+_SELECT = "SELECT hash, segment, offset, length, codec, dict_id FROM blobs"
+
+
+class BlobStore:
+    """content_hash → 正文。"""
+
+    def __init__(
+        self,
+        root: str | Path,
+        conn: sqlite3.Connection,
+        *,
+        segment_size: int = SEGMENT_SIZE,
+        dict_samples: int = DICT_SAMPLES,
+        dict_size: int = DICT_SIZE,
+        sample_budget: int = SAMPLE_BUDGET,
+    ):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.segment_size = segment_size
+        self.dict_samples = dict_samples
+        self.dict_size = dict_size
+        self.sample_budget = sample_budget
+        self.codec = "zstd" if zstandard is not None else "zlib"
+
+        self._conn = conn
+        self._conn.executescript(SCHEMA)
+        self._maps: dict[int, mmap.mmap] = {}
+        self._domain_dicts: dict[str, int] = {
+            domain: dict_id for dict_id, domain in self._conn.execute("SELECT id, domain FROM blob_dicts")
+        }
+        self._samples: OrderedDict[str, list[bytes]] = OrderedDict()  # 最近来过新页面的域名在后
+        self._sample_bytes = 0
+        self._compressors: dict[int, Any] = {}
+        self._decompressors: dict[int, Any] = {}
+
+        segments = sorted(int(p.stem.removeprefix("seg-")) for p in self.root.glob("seg-*.blob"))
+        self._segment = segments[-1] if segments else 1
+        self._fh = open(self._segment_path(self._segment), "ab")  # noqa: SIM115 — 常开的追加句柄，close() 关闭
+        self._lock_fh = open(self.root / ".lock", "a")  # noqa: SIM115
+
+    # --- 写入 ---
+
+    def put(self, key: str, text: str, domain: str = "") -> bool:
+        """写入一条正文；同 key 已存在时跳过返回 False。调用方负责提交事务。"""
+        if not key or self.has(key):
+            return False
+        raw = text.encode("utf-8")
+        dict_id = self._dict_for(domain, raw)
+        data = self._compress(raw, dict_id)
+        with self._file_lock():
+            # 别的实例可能已经换到后面的段
+            while self._segment_path(self._segment + 1).exists():
+                self._rotate()
+            offset = os.fstat(self._fh.fileno()).st_size  # 实际末尾，不信任内存里的计数
+            if offset and offset + len(data) > self.segment_size:
+                self._rotate()
+                offset = 0
+            self._fh.write(data)
+            self._fh.flush()  # 进入页缓存后 mmap 读端才看得到
+        self._conn.execute(_INSERT, (key, self._segment, offset, len(data), len(raw), self.codec, dict_id))
+        return True
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """目录级排他锁（fcntl.flock；同进程的多个实例之间同样互斥）。"""
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self._lock_fh.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_fh.fileno(), fcntl.LOCK_UN)
+
+    def _rotate(self) -> None:
+        self._fh.close()
+        self._segment += 1
+        self._fh = open(self._segment_path(self._segment), "ab")  # noqa: SIM115
+
+    # --- 读取 ---
+
+    def has(self, key: str) -> bool:
+        return self._conn.execute("SELECT 1 FROM blobs WHERE hash = ?", (key,)).fetchone() is not None
+
+    def get(self, key: str) -> str | None:
+        row = self._conn.execute(f"{_SELECT} WHERE hash = ?", (key,)).fetchone()
+        return self._read(row) if row is not None else None
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, str]:
+        """批量读取，按段内偏移顺序访问。缺失的 key 不出现在结果里。"""
+        keys = list(dict.fromkeys(keys))
+        rows: list[tuple] = []
+        for i in range(0, len(keys), _LOOKUP_CHUNK):
+            chunk = keys[i:i + _LOOKUP_CHUNK]
+            placeholders = ", ".join("?" * len(chunk))
+            rows.extend(tuple(r) for r in self._conn.execute(f"{_SELECT} WHERE hash IN ({placeholders})", chunk))
+        rows.sort(key=lambda r: (r[1], r[2]))
+        return {row[0]: self._read(row) for row in rows}
+
+    def _read(self, row: Any) -> str:
+        _, segment, offset, length, codec, dict_id = row
+        mm = self._map(segment, offset + length)
+        return self._decompress(mm[offset:offset + length], codec, dict_id).decode("utf-8")
+
+    def _map(self, segment: int, needed: int) -> mmap.mmap:
+        """段文件的只读映射；正在追加的段变长后重新映射。"""
+        mm = self._maps.get(segment)
+        if mm is None or len(mm) < needed:
+            if mm is not None:
+                mm.close()
+            with open(self._segment_path(segment), "rb") as f:
+                mm = self._maps[segment] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return mm
+
+    def close(self) -> None:
+        self._fh.close()
+        self._lock_fh.close()
+        for mm in self._maps.values():
+            mm.close()
+        self._maps.clear()
+
+    # --- 压缩 ---
+
+    def _compress(self, raw: bytes, dict_id: int) -> bytes:
+        if self.codec == "zlib":
+            return zlib.compress(raw, ZLIB_LEVEL)
+        compressor = self._compressors.get(dict_id)
+        if compressor is None:
+            zdict = self._load_dict(dict_id)
+            compressor = self._compressors[dict_id] = zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=zdict)
+        return compressor.compress(raw)
+
+    def _decompress(self, data: bytes, codec: str, dict_id: int) -> bytes:
+        if codec == "zlib":
+            return zlib.decompress(data)
+        if zstandard is None:
+            raise RuntimeError("blob was stored with zstd; install zstandard to read it")
+        decompressor = self._decompressors.get(dict_id)
+        if decompressor is None:
+            zdict = self._load_dict(dict_id)
+            decompressor = self._decompressors[dict_id] = zstandard.ZstdDecompressor(dict_data=zdict)
+        return decompressor.decompress(data)
+
+    def _load_dict(self, dict_id: int) -> Any:
+        if not dict_id:
+            return None
+        row = self._conn.execute("SELECT data FROM blob_dicts WHERE id = ?", (dict_id,)).fetchone()
+        return zstandard.ZstdCompressionDict(row[0])
+
+    def _dict_for(self, domain: str, raw: bytes) -> int:
+        """该域名的字典 id（0 表示不用字典）；样本攒够时训练一个。"""
+        if self.codec != "zstd" or not domain or self.dict_samples <= 0:
+            return 0
+        if domain in self._domain_dicts:
+            return self._domain_dicts[domain]
+        samples = self._samples.setdefault(domain, [])
+        self._samples.move_to_end(domain)
+        samples.append(raw[:SAMPLE_BYTES])
+        self._sample_bytes += len(samples[-1])
+        if len(samples) < self.dict_samples:
+            self._evict_samples()
+            return 0
+        del self._samples[domain]
+        self._sample_bytes -= sum(map(len, samples))
+        try:
+            trained = zstandard.train_dictionary(self.dict_size, samples)
+        except zstandard.ZstdError as e:
+            logger.debug("zstd dictionary for %s not trained: %s", domain, e)
+            self._domain_dicts[domain] = 0  # 样本不适合训练，之后不再尝试
+            return 0
+        # 别的实例可能已给该域名训练过：保留先写入的那个，大家都用它
+        self._conn.execute("INSERT OR IGNORE INTO blob_dicts (domain, data) VALUES (?, ?)", (domain, trained.as_bytes()))
+        dict_id = self._conn.execute("SELECT id FROM blob_dicts WHERE domain = ?", (domain,)).fetchone()[0]
+        self._domain_dicts[domain] = dict_id
+        logger.info("zstd dictionary trained for %s (%d samples)", domain, self.dict_samples)
+        return dict_id
+
+    def _evict_samples(self) -> None:
+        """样本总量超过 sample_budget 时，丢掉最久没来新页面的域名（之后再来从头攒）。"""
+        while self._sample_bytes > self.sample_budget and len(self._samples) > 1:
+            domain, dropped = self._samples.popitem(last=False)
+            self._sample_bytes -= sum(map(len, dropped))
+            logger.debug("dropped %d dictionary samples for %s", len(dropped), domain)
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.root / f"seg-{segment:06d}.blob"
+
@@ -0,0 +1,133 @@
+"""
+结果缓存 — SQLite 前面的进程内 LRU + 按站点的新鲜度策略。
+
+- HotCache：规范 URL → 最近的结果，条数和字符总量双上限，超出按最久未用淘汰；
+  命中/未命中/过期/淘汰计数通过 stats() 暴露
+- CachePolicy：TTL 按 SpiderConfig.cache_ttls（域名，子域名继承）> 适配器 cache_ttl > 默认值 取
+
+新鲜度按结果的 crawled_at 算，内存和 SQLite 两层用同一个 TTL。
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit
+
+from spider.core.domains import DomainTrie
+from spider.core.result import CrawlResult
+
+if TYPE_CHECKING:
+    from spider.adapters.default import DefaultAdapter
+
+DEFAULT_TTL = 3600
+MAX_ENTRIES = 512
+MAX_CHARS = 32 * 1024 * 1024
+
+
+class CachePolicy:
+    """决定某个 URL 的缓存有效期（秒）。"""
+
+    def __init__(self, default_ttl: int = DEFAULT_TTL, domain_ttls: Mapping[str, int] | None = None):
+        self.default_ttl = default_ttl
+        self._domains: DomainTrie[int] = DomainTrie()
+        for domain, ttl in (domain_ttls or {}).items():
+            self._domains.insert(domain, ttl)
+
+    def ttl(self, url: str, adapter: DefaultAdapter | None = None) -> int:
+        host = (urlsplit(url).hostname or "").removeprefix("www.")
+        hit = self._domains.longest(host)
+        if hit is not None:
+            return hit[1]
+        if adapter is not None and adapter.cache_ttl is not None:
+            return adapter.cache_ttl
+        return self.default_ttl
+
+
+class HotCache:
+    """
+    进程内 LRU。
+
+    存的是去掉 html / screenshot 的精简结果（缓存命中只需要正文和元数据）。线程安全。
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_chars: int = MAX_CHARS):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._items: OrderedDict[str, CrawlResult] = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.expired = self.evictions = 0
+
+    def get(self, key: str, max_age_seconds: float) -> CrawlResult | None:
+        """未过期的结果（刷新为最近使用）；没有或已过期返回 None（过期的顺手删掉）。"""
+        with self._lock:
+            result = self._items.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            if age_seconds(result) > max_age_seconds:
+                self.expired += 1
+                self.misses += 1
+                self._remove(key)
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: str, result: CrawlResult) -> None:
+        if result.status == "failed" or self.max_entries <= 0:
+            return
+        slim = result.model_copy(update={"html": "", "screenshot": None})
+        size = _size(slim)
+        if size > self.max_chars:
+            return
+        with self._lock:
+            if key in self._items:
+                self._remove(key)
+            self._items[key] = slim
+            self._chars += size
+            while len(self._items) > self.max_entries or self._chars > self.max_chars:
+                self._remove(next(iter(self._items)))
+                self.evictions += 1
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            if key in self._items:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._chars = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._items),
+                "chars": self._chars,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _remove(self, key: str) -> None:
+        self._chars -= _size(self._items.pop(key))
+
+
+def age_seconds(result: CrawlResult) -> float:
+    crawled = result.crawled_at if result.crawled_at.tzinfo else result.crawled_at.replace(tzinfo=UTC)
+    return (datetime.now(UTC) - crawled).total_seconds()
+
+
+def _size(result: CrawlResult) -> int:
+    return len(result.markdown) + len(result.fit_markdown)
@@ -0,0 +1,179 @@
+"""
+批量导出 — 按域名 / 时间段 / 状态过滤，流式写 JSONL 或 Parquet，内存只占一块。
+
+- 单独开一个只读连接，游标 fetchmany() 逐块取行（WAL 下不挡写入）；正文按块批量读（段文件顺序读）
+- 分区存储按月份从旧到新逐个分区导出，时间段外的分区不打开
+- JSONL：一行一个页面，路径以 .gz 结尾时 gzip 压缩
+- Parquet：每块写一个 row group，列为 url / canonical_url / title / domain / status / engine /
+  crawled_at / content_hash / char_count / content / metadata（JSON 字符串）；需要 pyarrow
+
+命令行：
+  python -m spider.storage.export pages.parquet [--domain reuters.com] [--since 2026-10-01] [--status success]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import logging
+import sqlite3
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from spider.storage.partitioned import PartitionedStorage
+from spider.storage.sqlite import SpiderStorage, _iso
+
+logger = logging.getLogger("spider.storage")
+
+CHUNK_ROWS = 1000
+COLUMNS = (
+    "url", "canonical_url", "title", "domain", "status", "engine",
+    "crawled_at", "content_hash", "char_count", "content", "metadata",
+)
+
+
+def iter_pages(
+    storage: SpiderStorage | PartitionedStorage,
+    *,
+    domain: str | None = None,
+    since: datetime | str | None = None,
+    until: datetime | str | None = None,
+    status: str | None = None,
+    content: bool = True,
+    chunk_rows: int = CHUNK_ROWS,
+) -> Iterator[list[dict[str, Any]]]:
+    """
+    按 id 顺序分块产出页面（每块最多 chunk_rows 行，字段见 COLUMNS）。
+
+    since / until 为 datetime 或 ISO 字符串，左闭右开；content=False 时不读正文（content 为空串）。
+    """
+    if isinstance(storage, PartitionedStorage):
+        for part in storage.storages(domain=domain, since=since, until=until, newest_first=False):
+            yield from iter_pages(
+                part, domain=domain, since=since, until=until, status=status, content=content, chunk_rows=chunk_rows,
+            )
+        return
+
+    conds, params = [], []
+    if domain:
+        domain = domain.lower().removeprefix("www.")
+        conds.append("domain IN (?, ?)")
+        params += [domain, f"www.{domain}"]
+    if since:
+        conds.append("crawled_at >= ?")
+        params.append(_iso(since))
+    if until:
+        conds.append("crawled_at < ?")
+        params.append(_iso(until))
+    if status:
+        conds.append("status = ?")
+        params.append(status)
+    where = f" WHERE {' AND '.join(conds)}" if conds else ""
+
+    conn = sqlite3.connect(f"{storage.db_path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    try:
+        cur = conn.execute(f"SELECT * FROM pages{where} ORDER BY id", params)
+        while rows := cur.fetchmany(chunk_rows):
+            items = [dict(r) for r in rows]
+            bodies = storage.load_contents(items) if content else [""] * len(items)
+            yield [
+                {
+                    **{k: item[k] for k in COLUMNS if k not in ("content", "metadata")},
+                    "content": body,
+                    "metadata": json.loads(item["metadata"] or "{}"),
+                }
+                for item, body in zip(items, bodies, strict=True)
+            ]
+    finally:
+        conn.close()
+
+
+def export_jsonl(storage: SpiderStorage | PartitionedStorage, path: str | Path, **filters: Any) -> int:
+    """导出为 JSONL（.gz 结尾则 gzip 压缩），返回行数。"""
+    path = Path(path)
+    opener = gzip.open if path.suffix == ".gz" else open
+    count = 0
+    with opener(path, "wt", encoding="utf-8") as f:
+        for chunk in iter_pages(storage, **filters):
+            f.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in chunk)
+            count += len(chunk)
+    logger.info("exported %d pages to %s", count, path)
+    return count
+
+
+def export_parquet(storage: SpiderStorage | PartitionedStorage, path: str | Path, *, compression: str = "zstd", **filters: Any) -> int:
+    """导出为 Parquet（每块一个 row group），返回行数。需要 pyarrow。"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet export needs pyarrow: pip install 'juanjuan-spider[parquet]'") from e
+
+    schema = pa.schema([
+        ("url", pa.string()),
+        ("canonical_url", pa.string()),
+        ("title", pa.string()),
+        ("domain", pa.string()),
+        ("status", pa.string()),
+        ("engine", pa.string()),
+        ("crawled_at", pa.timestamp("s", tz="UTC")),
+        ("content_hash", pa.string()),
+        ("char_count", pa.int64()),
+        ("content", pa.large_string()),
+        ("metadata", pa.string()),
+    ])
+    count = 0
+    with pq.ParquetWriter(str(path), schema, compression=compression) as writer:
+        for chunk in iter_pages(storage, **filters):
+            for row in chunk:
+                row["crawled_at"] = datetime.fromisoformat(row["crawled_at"])
+                row["metadata"] = json.dumps(row["metadata"], ensure_ascii=False, default=str)
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+            count += len(chunk)
+    logger.info("exported %d pages to %s", count, path)
+    return count
+
+
+def export(storage: SpiderStorage | PartitionedStorage, path: str | Path, *, format: str | None = None, **filters: Any) -> int:
+    """按 format（"jsonl" / "parquet"，默认看扩展名）导出，返回行数。"""
+    path = Path(path)
+    format = format or ("parquet" if path.suffix == ".parquet" else "jsonl")
+    if format == "parquet":
+        return export_parquet(storage, path, **filters)
+    if format == "jsonl":
+        return export_jsonl(storage, path, **filters)
+    raise ValueError(f"unknown export format {format!r}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    from spider.infra.config import SpiderConfig
+    from spider.main import open_storage
+
+    parser = argparse.ArgumentParser(prog="python -m spider.storage.export", description="导出爬取结果（JSONL / Parquet）")
+    parser.add_argument("path", help="输出文件（.jsonl / .jsonl.gz / .parquet）")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], help="默认按扩展名")
+    parser.add_argument("--domain", help="只导出该域名")
+    parser.add_argument("--since", help="起始时间（含，ISO）")
+    parser.add_argument("--until", help="结束时间（不含，ISO）")
+    parser.add_argument("--status", help="只导出该状态（success / partial / failed）")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    storage = open_storage(SpiderConfig())
+    try:
+        count = export(
+            storage, args.path, format=args.format, domain=args.domain, since=args.since,
+            until=args.until, status=args.status, chunk_rows=args.chunk_rows,
+        )
+    finally:
+        storage.close()
+    print(f"{count} pages → {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+近似重复索引 — 页面 SimHash 指纹 + LSH 分桶，保存时找内容几乎相同的已存页面。
+
+- page_simhash：页面 id → 64 位指纹（SQLite 整数有符号，存取时换算）
+- simhash_bands：分桶键 → 页面 id；查询只取与新指纹至少一段相同的页面作候选，再算汉明距离
+- 候选不含同一规范 URL 的其他版本（和 pages 表联查）：页面小改动是新版本，不是近似重复
+- 汉明距离 < BANDS（默认 4 段，即 ≤ 3 位，相似度约 0.95）的一定能找到；阈值放得更宽时是概率召回
+
+NearDupIndex 不加锁也不提交事务，由 SpiderStorage 在自己的锁和事务里调用。
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+from spider.core.simhash import BITS, bands, hamming
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS page_simhash (
+    page_id INTEGER PRIMARY KEY,
+    simhash INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS simhash_bands (
+    band    INTEGER NOT NULL,
+    page_id INTEGER NOT NULL,
+    PRIMARY KEY (band, page_id)
+) WITHOUT ROWID;
+"""
+
+MAX_CANDIDATES = 1000  # 极常见的段值（模板页、空壳页）只看最近这么多个候选
+
+_SIGN = 1 << (BITS - 1)
+
+
+class NearDupIndex:
+    """页面 id ↔ SimHash 指纹。"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+        self._conn.executescript(SCHEMA)
+
+    def add(self, page_id: int, fp: int) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO page_simhash (page_id, simhash) VALUES (?, ?)", (page_id, _signed(fp)))
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO simhash_bands (band, page_id) VALUES (?, ?)",
+            ((band, page_id) for band in bands(fp)),
+        )
+
+    def get(self, page_id: int) -> int | None:
+        row = self._conn.execute("SELECT simhash FROM page_simhash WHERE page_id = ?", (page_id,)).fetchone()
+        return _unsigned(row[0]) if row is not None else None
+
+    def nearest(self, fp: int, max_distance: int, *, exclude_url: str = "", limit: int = 1) -> list[tuple[int, int]]:
+        """
+        汉明距离不超过 max_distance 的页面，[(页面 id, 距离)]，由近到远（同距离新的在前）。
+
+        exclude_url: 跳过该规范 URL 的各个版本（同一页面的新旧版本不算近似重复）。
+        """
+        keys = bands(fp)
+        rows = self._conn.execute(
+            "SELECT DISTINCT s.page_id, s.simhash FROM simhash_bands b JOIN page_simhash s ON s.page_id = b.page_id "
+            "JOIN pages p ON p.id = s.page_id "
+            f"WHERE b.band IN ({', '.join('?' * len(keys))}) AND p.canonical_url != ? ORDER BY s.page_id DESC LIMIT ?",
+            (*keys, exclude_url, MAX_CANDIDATES),
+        ).fetchall()
+        hits = [
+            (page_id, d) for page_id, stored in rows
+            if (d := hamming(fp, _unsigned(stored))) <= max_distance
+        ]
+        hits.sort(key=lambda h: (h[1], -h[0]))
+        return hits[:limit]
+
+
+def _signed(fp: int) -> int:
+    return fp - (1 << BITS) if fp & _SIGN else fp
+
+
+def _unsigned(value: int) -> int:
+    return value & ((1 << BITS) - 1)
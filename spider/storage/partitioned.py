@@ -0,0 +1,268 @@
+"""
+按月（可选再按域名分组）分区的存储 — 归档变大后查询延迟不随总量增长，旧数据删目录即可。
+
+目录结构（root 默认 storage/partitions/）：
+
+    2026-10/spider.db + blobs/ + pages/            # 只按月
+    2026-10/news/spider.db ...                     # 配了 domain_groups 时按 月/组
+
+每个分区就是一个完整的 SpiderStorage。PartitionedStorage 是其上的薄路由：
+
+- 写入按结果的 crawled_at（UTC 月份）和域名所属的组分桶，每个分区一个事务
+- 查询从最新的分区往旧的扇出，凑够 limit 就停（最近的数据只碰最近几个分区）；同月多个组的结果按时间合并
+- 有时间下限的查询（缓存、since）跳过更早的月份；按 URL / 域名的查询只看所属的组
+- 全文检索各分区各自排序后按分数合并取前 limit（BM25 分数按分区统计，跨分区只是近似可比）
+- drop() / drop_before() 关闭并删除整个分区目录；也可以停掉进程后直接删目录
+
+行 id 只在分区内唯一，查询返回的行多一个 partition 字段（"2026-10" 或 "2026-10/news"），
+load_content() 据此找到分区。同 URL + 同内容只在同一分区内去重，版本链也按分区各自从关键帧开始。
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import re
+import shutil
+import threading
+from collections.abc import Callable, Iterable, Mapping
+from datetime import UTC, datetime, timedelta
+from itertools import groupby
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+from spider.core.domains import DomainTrie
+from spider.core.result import CrawlResult
+from spider.storage.sqlite import SpiderStorage, _iso, _utc
+
+logger = logging.getLogger("spider.storage")
+
+DB_NAME = "spider.db"
+DEFAULT_GROUP = "other"  # 配了 domain_groups 时，不属于任何组的域名
+
+_MONTH = re.compile(r"^\d{4}-\d{2}$")
+
+
+class PartitionedStorage:
+    """
+    SpiderStorage 的分区版本，读写接口与之相同（save / save_many / get_cached / get_by_url /
+    get_by_domain / search / search_content / changes / recent / count / load_content / load_contents / close）。
+
+    domain_groups: 域名 → 组名（子域名继承），如 {"reuters.com": "news", "bbc.co.uk": "news"}；
+    为空时只按月分区。其余关键字参数原样传给每个分区的 SpiderStorage。
+    """
+
+    def __init__(self, root: str | Path, *, domain_groups: Mapping[str, str] | None = None, **storage_kwargs: Any):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._kwargs = storage_kwargs
+        self._groups: DomainTrie[str] = DomainTrie()
+        for domain, group in (domain_groups or {}).items():
+            self._groups.insert(domain, group)
+        self._open: dict[str, SpiderStorage] = {}
+        self._lock = threading.Lock()
+
+    # --- 分区 ---
+
+    def partitions(self) -> list[str]:
+        """现有分区，新的在前（同月按组名）。"""
+        keys = []
+        for month_dir in self.root.iterdir():
+            if not month_dir.is_dir() or not _MONTH.match(month_dir.name):
+                continue
+            if (month_dir / DB_NAME).exists():
+                keys.append(month_dir.name)
+            keys.extend(
+                f"{month_dir.name}/{sub.name}" for sub in month_dir.iterdir() if (sub / DB_NAME).exists()
+            )
+        keys.sort()
+        keys.sort(key=lambda k: k[:7], reverse=True)  # 月份倒序，同月组名正序（排序稳定）
+        return keys
+
+    def storages(
+        self,
+        *,
+        domain: str | None = None,
+        since: datetime | str | None = None,
+        until: datetime | str | None = None,
+        newest_first: bool = True,
+    ) -> list[SpiderStorage]:
+        """覆盖给定域名 / 时间段的分区存储（导出、重新提取逐个分区处理时用）。"""
+        keys = self._select(group=self._group(domain) if domain else None, since=since, until=until)
+        if not newest_first:
+            keys.reverse()
+        return [self._storage(k) for k in keys]
+
+    def drop(self, key: str) -> None:
+        """关闭并删除一个分区（整个目录）。"""
+        with self._lock:
+            storage = self._open.pop(key, None)
+        if storage is not None:
+            storage.close()
+        shutil.rmtree(self.root / key)
+        logger.info("partition %s dropped", key)
+
+    def drop_before(self, month: str) -> list[str]:
+        """删除早于 month（"YYYY-MM"）的全部分区，返回删掉的分区。"""
+        dropped = [k for k in self.partitions() if k[:7] < month]
+        for key in dropped:
+            self.drop(key)
+        for month_dir in {self.root / k[:7] for k in dropped}:
+            if month_dir.exists() and not any(month_dir.iterdir()):
+                month_dir.rmdir()
+        return dropped
+
+    def _group(self, domain: str) -> str:
+        if not len(self._groups):
+            return ""
+        hit = self._groups.longest(domain.lower().removeprefix("www."))
+        return hit[1] if hit else DEFAULT_GROUP
+
+    def _key(self, result: CrawlResult) -> str:
+        month = _utc(result.crawled_at).strftime("%Y-%m")
+        group = self._group(result.domain)
+        return f"{month}/{group}" if group else month
+
+    def _select(
+        self,
+        *,
+        group: str | None = None,
+        since: datetime | str | None = None,
+        until: datetime | str | None = None,
+    ) -> list[str]:
+        low = _month(since) if since else ""
+        high = _month(until) if until else "9999-99"
+        return [
+            k for k in self.partitions()
+            if low <= k[:7] <= high and (not group or k[8:] == group)
+        ]
+
+    def _storage(self, key: str) -> SpiderStorage:
+        storage = self._open.get(key)
+        if storage is not None:
+            return storage
+        with self._lock:
+            storage = self._open.get(key)
+            if storage is None:
+                path = self.root / key
+                storage = self._open[key] = SpiderStorage(path / DB_NAME, path / "pages", **self._kwargs)
+            return storage
+
+    # --- 写入 ---
+
+    def save(self, result: CrawlResult) -> int:
+        return self.save_many([result])[0]
+
+    def save_many(self, results: Iterable[CrawlResult]) -> list[int]:
+        """按分区分桶写入，返回与输入对应的分区内行 id（重复的为 0）。"""
+        results = list(results)
+        buckets: dict[str, list[int]] = {}
+        for i, result in enumerate(results):
+            buckets.setdefault(self._key(result), []).append(i)
+        ids = [0] * len(results)
+        for key, indices in buckets.items():
+            saved = self._storage(key).save_many([results[i] for i in indices])
+            for i, row_id in zip(indices, saved, strict=True):
+                ids[i] = row_id
+        return ids
+
+    # --- 查询 ---
+
+    def get_cached(self, url: str, max_age_seconds: int = 3600) -> dict[str, Any] | None:
+        since = datetime.now(UTC) - timedelta(seconds=max_age_seconds)
+        for key in self._select(group=self._url_group(url), since=since):
+            row = self._storage(key).get_cached(url, max_age_seconds=max_age_seconds)
+            if row is not None:
+                row["partition"] = key
+                return row
+        return None
+
+    def get_by_url(self, url: str, limit: int = 50) -> list[dict[str, Any]]:
+        return self._fan_out(self._select(group=self._url_group(url)), lambda s: s.get_by_url(url, limit), limit)
+
+    def get_by_domain(self, domain: str, limit: int = 50) -> list[dict[str, Any]]:
+        keys = self._select(group=self._group(domain))
+        return self._fan_out(keys, lambda s: s.get_by_domain(domain, limit), limit)
+
+    def search(self, keyword: str, limit: int = 20) -> list[dict[str, Any]]:
+        return self._fan_out(self._select(), lambda s: s.search(keyword, limit), limit)
+
+    def recent(self, limit: int = 10) -> list[dict[str, Any]]:
+        return self._fan_out(self._select(), lambda s: s.recent(limit), limit)
+
+    def search_content(self, query: str, limit: int = 10, domain: str | None = None) -> list[dict[str, Any]]:
+        keys = self._select(group=self._group(domain) if domain else None)
+        ranked = []
+        for key in keys:
+            for row in self._storage(key).search_content(query, limit=limit, domain=domain):
+                row["partition"] = key
+                ranked.append(row)
+        return heapq.nlargest(limit, ranked, key=lambda r: (r["score"], r["crawled_at"]))
+
+    def changes(self, target: str, since: datetime | str | None = None, limit: int = 100) -> list[dict[str, Any]]:
+        group = self._url_group(target) if "://" in target else self._group(target)
+        keys = self._select(group=group, since=since)
+        return self._fan_out(keys, lambda s: s.changes(target, since=since, limit=limit), limit, ids=False)
+
+    def near_duplicates_of(self, url: str, limit: int = 10) -> list[dict[str, Any]]:
+        """只在该 URL 最新版本所在的分区内找。"""
+        latest = self.get_by_url(url, limit=1)
+        if not latest:
+            return []
+        key = latest[0]["partition"]
+        rows = self._storage(key).near_duplicates_of(url, limit)
+        for row in rows:
+            row["partition"] = key
+        return rows
+
+    def count(self) -> int:
+        return sum(self._storage(k).count() for k in self.partitions())
+
+    def load_content(self, row: dict[str, Any]) -> str:
+        return self._storage(row["partition"]).load_content(row)
+
+    def load_contents(self, rows: list[dict[str, Any]]) -> list[str]:
+        out = [""] * len(rows)
+        by_partition: dict[str, list[int]] = {}
+        for i, row in enumerate(rows):
+            by_partition.setdefault(row["partition"], []).append(i)
+        for key, indices in by_partition.items():
+            for i, text in zip(indices, self._storage(key).load_contents([rows[i] for i in indices]), strict=True):
+                out[i] = text
+        return out
+
+    def close(self) -> None:
+        with self._lock:
+            storages, self._open = list(self._open.values()), {}
+        for storage in storages:
+            storage.close()
+
+    def _url_group(self, url: str) -> str:
+        return self._group(urlsplit(url).hostname or "")
+
+    def _fan_out(
+        self,
+        keys: list[str],
+        query: Callable[[SpiderStorage], list[dict[str, Any]]],
+        limit: int,
+        *,
+        ids: bool = True,
+    ) -> list[dict[str, Any]]:
+        """从新到旧逐月查询，同月各组按时间合并，凑够 limit 即停。"""
+        out: list[dict[str, Any]] = []
+        for _, month_keys in groupby(keys, key=lambda k: k[:7]):
+            rows = []
+            for key in month_keys:
+                for row in query(self._storage(key)):
+                    row["partition"] = key
+                    rows.append(row)
+            rows.sort(key=(lambda r: (r["crawled_at"], r["id"])) if ids else (lambda r: r["crawled_at"]), reverse=True)
+            out.extend(rows)
+            if len(out) >= limit:
+                break
+        return out[:limit]
+
+
+def _month(value: datetime | str) -> str:
+    return _iso(value)[:7]
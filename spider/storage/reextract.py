@@ -0,0 +1,197 @@
+"""
+离线重新提取 — 用当前的 ContentExtractor 和适配器重新处理已存的原始 HTML，不重抓。
+
+存储需开启 keep_html（SpiderConfig.keep_html）；分区存储逐个分区处理。流程：
+
+1. iter_html() 按 id 分批读出页面和 HTML（只占一批的内存）
+2. 每批切成小块交给进程池：HTML → markdown → 正文提取 → 适配器 transform → SimHash
+   （适配器和 crawl() 一样由 Router 解析：注册表 + 规则文件的适配器绑定）
+3. 主进程把结果用 rewrite() 一个事务写回；写当前批的同时进程池已在算下一批
+
+命令行：
+  python -m spider.storage.reextract [--domain reuters.com] [--since 2026-01-01] [--workers 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from spider.storage.partitioned import PartitionedStorage
+from spider.storage.sqlite import SpiderStorage
+
+logger = logging.getLogger("spider.storage")
+
+BATCH_SIZE = 200
+# 上次提取写进 metadata、这次要重新算的键
+_DERIVED = ("author", "date", "sitename", "categories", "tags", "description", "structured", "simhash")
+
+
+@dataclass
+class ReextractStats:
+    """进度 / 结果统计。"""
+
+    pages: int = 0
+    updated: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.elapsed if self.elapsed else 0.0
+
+
+def reextract(
+    storage: SpiderStorage | PartitionedStorage,
+    *,
+    domain: str | None = None,
+    since: datetime | str | None = None,
+    workers: int | None = None,
+    batch_size: int = BATCH_SIZE,
+    routing_file: str | Path | None = None,
+    progress: Callable[[ReextractStats], None] | None = None,
+) -> ReextractStats:
+    """
+    重新处理存了 HTML 的页面（可按域名 / 时间过滤），每批写完回调一次 progress。
+
+    routing_file: 路由规则文件（SpiderConfig.routing_file），规则里按名字绑定的适配器同样生效。
+    """
+    workers = workers or os.cpu_count() or 1
+    stats = ReextractStats()
+    t0 = time.monotonic()
+    if isinstance(storage, PartitionedStorage):
+        parts = storage.storages(domain=domain, since=since, newest_first=False)
+    else:
+        parts = [storage]
+    process = partial(_process_chunk, routing_file=str(routing_file) if routing_file else None)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in parts:
+            pending: list[Future] | None = None
+            for rows in part.iter_html(domain=domain, since=since, batch_size=batch_size):
+                payloads = [_payload(r) for r in rows if r["html"]]
+                size = max(1, -(-len(payloads) // workers))
+                submitted = [pool.submit(process, payloads[i:i + size]) for i in range(0, len(payloads), size)]
+                if pending is not None:
+                    _write(part, pending, stats, t0, progress)
+                pending = submitted
+            if pending is not None:
+                _write(part, pending, stats, t0, progress)
+    stats.elapsed = time.monotonic() - t0
+    return stats
+
+
+def _write(
+    storage: SpiderStorage,
+    futures: list[Future],
+    stats: ReextractStats,
+    t0: float,
+    progress: Callable[[ReextractStats], None] | None,
+) -> None:
+    updates: list[dict[str, Any]] = []
+    for future in futures:
+        for item in future.result():
+            stats.pages += 1
+            if "error" in item:
+                stats.failed += 1
+                logger.warning("re-extraction failed for %s: %s", item["url"], item["error"])
+            else:
+                updates.append(item)
+    stats.updated += storage.rewrite(updates)
+    stats.elapsed = time.monotonic() - t0
+    logger.info(
+        "re-extracted %d pages (%d updated, %d failed), %.1f pages/s",
+        stats.pages, stats.updated, stats.failed, stats.pages_per_second,
+    )
+    if progress is not None:
+        progress(stats)
+
+
+def _payload(row: dict[str, Any]) -> dict[str, Any]:
+    metadata = {k: v for k, v in row["metadata"].items() if k not in _DERIVED}
+    return {
+        "id": row["id"],
+        "url": row["url"],
+        "title": row["title"],
+        "html": row["html"],
+        "engine": row["engine"],
+        "status": row["status"],
+        "metadata": metadata,
+    }
+
+
+def _process_chunk(payloads: list[dict[str, Any]], routing_file: str | None = None) -> list[dict[str, Any]]:
+    """进程池里跑：一块页面逐个重新提取。"""
+    from spider.core.extractor import ContentExtractor
+    from spider.core.result import CrawlResult
+    from spider.core.router import get_router
+    from spider.core.simhash import with_simhash
+    from spider.engines.http_engine import html_to_markdown
+
+    extractor = ContentExtractor()
+    router = get_router(routing_file)
+    out = []
+    for p in payloads:
+        try:
+            result = CrawlResult(
+                url=p["url"],
+                title=p["title"],
+                markdown=html_to_markdown(p["html"]),
+                html=p["html"],
+                engine=p["engine"],
+                status=p["status"],
+                metadata=p["metadata"],
+            )
+            result = extractor.extract(result)
+            adapter = router.adapter(p["url"])
+            result = with_simhash(adapter.transform(result))
+            out.append({
+                "id": p["id"],
+                "url": p["url"],
+                "title": result.title,
+                "content": result.fit_markdown or result.markdown,
+                "content_hash": result.content_hash,
+                "metadata": result.metadata,
+            })
+        except Exception as e:
+            out.append({"id": p["id"], "url": p["url"], "error": str(e)})
+    return out
+
+
+def main(argv: list[str] | None = None) -> None:
+    from spider.infra.config import SpiderConfig
+    from spider.main import open_storage
+
+    parser = argparse.ArgumentParser(prog="python -m spider.storage.reextract", description="用当前提取器重新处理已存的 HTML")
+    parser.add_argument("--domain", help="只处理该域名")
+    parser.add_argument("--since", help="只处理此后抓取的页面（ISO 时间）")
+    parser.add_argument("--workers", type=int, help="进程数（默认 CPU 核数）")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    cfg = SpiderConfig()
+    storage = open_storage(cfg)
+    try:
+        stats = reextract(
+            storage, domain=args.domain, since=args.since, workers=args.workers, batch_size=args.batch_size,
+            routing_file=cfg.routing_file,
+        )
+    finally:
+        storage.close()
+    print(
+        f"{stats.pages} pages, {stats.updated} updated, {stats.failed} failed "
+        f"in {stats.elapsed:.1f}s ({stats.pages_per_second:.1f} pages/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,558 @@
+"""
+SQLite 元数据 + pages/ 文件双写存储。
+
+- SQLite（pages 表）存 url / 规范 url / 域名 / 标题 / 引擎 / 状态 / 指纹 / 时间等元数据
+- 正文（fit_markdown，没有则 markdown）默认进 blobs/ 段文件（按 content_hash 去重 + 压缩，见 blobs.py）；
+  blobs=False 时按旧方式写 pages/YYYY-MM/*.md，人类和 Agent 可直接读。两种行可以混存
+- 同规范 URL + 同 content_hash 不重复存（内容没变就跳过；追踪参数、www.、结尾斜杠不同也算同一页），
+  只把已有行的 checked_at（最近一次确认内容的时间）往后推；缓存新鲜度按 checked_at 算
+
+面向高并发写入：WAL 日志（读写互不阻塞）、synchronous=NORMAL、按 url / canonical_url /
+domain / crawled_at 建索引；SQL 都是固定文本，由 sqlite3 的语句缓存复用编译结果；
+save_many() 一个事务写一整批。
+
+正文同时写入 FTS5 全文索引（pages_fts，rowid 即 pages.id），search_content() 按 BM25 排序、
+返回高亮片段。分词用 trigram（SQLite ≥ 3.34，中英文都能做子串匹配），旧版本退回 unicode61。
+
+blobs 模式下同一规范 URL 的相继版本存成差分 + 定期关键帧（见 versions.py），changes() 查改动的段落。
+
+keep_html=True 时原始 HTML 也压缩进 blobs（page_html 表记页面 → blob 键），正文提取或适配器改进后
+可以用 spider.storage.reextract 离线重新处理，不必重抓。
+
+保存时按 SimHash 找近似重复的已存页面（见 neardup.py）：near_duplicates="link" 照常保存并在
+metadata["near_duplicate_of"] 记下最像的那一页，"skip" 不保存（和完全重复一样返回 0），"off" 不检测。
+同一规范 URL 的旧版本不参与比较（小改动照常存成新版本）。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from spider.core.result import CrawlResult
+from spider.core.simhash import max_distance, result_simhash
+from spider.core.urls import canonicalize_url
+from spider.storage.blobs import BlobStore
+from spider.storage.neardup import NearDupIndex
+from spider.storage.versions import KEYFRAME_INTERVAL, VersionStore
+
+logger = logging.getLogger("spider.storage")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    url           TEXT    NOT NULL,
+    canonical_url TEXT    NOT NULL DEFAULT '',
+    domain        TEXT    NOT NULL DEFAULT '',
+    title         TEXT    NOT NULL DEFAULT '',
+    engine        TEXT    NOT NULL DEFAULT '',
+    status        TEXT    NOT NULL DEFAULT 'success',
+    error         TEXT    NOT NULL DEFAULT '',
+    content_hash  TEXT    NOT NULL DEFAULT '',
+    char_count    INTEGER NOT NULL DEFAULT 0,
+    file_path     TEXT    NOT NULL DEFAULT '',
+    crawled_at    TEXT    NOT NULL,
+    checked_at    TEXT    NOT NULL DEFAULT '',
+    duration_ms   INTEGER NOT NULL DEFAULT 0,
+    metadata      TEXT    NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_pages_url ON pages(url);
+CREATE INDEX IF NOT EXISTS idx_pages_canonical ON pages(canonical_url, crawled_at);
+CREATE INDEX IF NOT EXISTS idx_pages_domain ON pages(domain, crawled_at);
+CREATE INDEX IF NOT EXISTS idx_pages_crawled_at ON pages(crawled_at);
+CREATE TABLE IF NOT EXISTS page_html (
+    page_id  INTEGER PRIMARY KEY,
+    html_key TEXT    NOT NULL
+);
+"""
+
+_COLUMNS = (
+    "url", "canonical_url", "domain", "title", "engine", "status", "error",
+    "content_hash", "char_count", "file_path", "crawled_at", "checked_at", "duration_ms", "metadata",
+)
+_INSERT = f"INSERT OR IGNORE INTO pages ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+_EXISTS = "SELECT 1 FROM pages WHERE canonical_url = ? AND content_hash = ?"
+_CHECKED = "UPDATE pages SET checked_at = max(checked_at, ?) WHERE canonical_url = ? AND content_hash = ?"
+_CACHED = (
+    "SELECT * FROM pages WHERE (url = ? OR canonical_url = ?) AND status != 'failed' AND checked_at >= ? "
+    "ORDER BY checked_at DESC, id DESC LIMIT 1"
+)
+
+_UNSAFE = re.compile(r"[^\w.-]+")
+
+# trigram 分词以 3 个字符为单位，更短的词匹配不到，退回 LIKE 扫描
+TRIGRAM = sqlite3.sqlite_version_info >= (3, 34, 0)
+FTS_TOKENIZER = "trigram" if TRIGRAM else "unicode61 remove_diacritics 2"
+_FTS_INSERT = "INSERT INTO pages_fts (rowid, title, body) VALUES (?, ?, ?)"
+SNIPPET_TOKENS = 32
+SNIPPET_CHARS = 120  # LIKE 回退时片段的长度
+
+NEAR_DUPLICATE_MODES = ("off", "link", "skip")
+
+
+class SpiderStorage:
+    """
+    爬取结果存储。
+
+    查询方法返回 dict 列表（metadata 已解析为 dict），按 crawled_at 倒序。
+    连接可跨线程使用（内部加锁），用完调用 close()。
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        pages_dir: str | Path,
+        *,
+        blobs: bool = True,
+        keyframe_interval: int = KEYFRAME_INTERVAL,
+        near_duplicates: str = "link",
+        similarity: float = 0.95,
+        keep_html: bool = False,
+    ):
+        if near_duplicates not in NEAR_DUPLICATE_MODES:
+            raise ValueError(f"near_duplicates must be one of {NEAR_DUPLICATE_MODES}, got {near_duplicates!r}")
+        self.near_duplicates = near_duplicates
+        self.keep_html = keep_html and blobs  # HTML 只存进 blobs
+        self.max_distance = max_distance(similarity)
+        self.db_path = Path(db_path)
+        self.pages_dir = Path(pages_dir)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(SCHEMA)
+        self._migrate_checked_at()
+        # 正文存储：段文件放在 pages/ 旁边（storage/blobs/）
+        self.blobs = BlobStore(self.pages_dir.parent / "blobs", self._conn) if blobs else None
+        self.versions = (
+            VersionStore(self._conn, self.blobs, keyframe_interval=keyframe_interval) if self.blobs is not None else None
+        )
+        self.neardup = NearDupIndex(self._conn)
+        self._migrate_dedupe_key()
+        self._init_fulltext()
+
+    def _migrate_checked_at(self) -> None:
+        """老库没有 checked_at 列：加上，取值为 crawled_at。"""
+        columns = {r["name"] for r in self._conn.execute("PRAGMA table_info(pages)")}
+        if "checked_at" in columns:
+            return
+        with self._conn:
+            self._conn.execute("ALTER TABLE pages ADD COLUMN checked_at TEXT NOT NULL DEFAULT ''")
+            self._conn.execute("UPDATE pages SET checked_at = crawled_at")
+
+    def _migrate_dedupe_key(self) -> None:
+        """
+        去重键 (canonical_url, content_hash) 的唯一索引。
+
+        老库的唯一索引是 (url, content_hash)：先把没规范化过的 canonical_url 补成规范形式，
+        同规范 URL + 同内容的重复行只留最早的一行（连同它们的全文索引、指纹、HTML 记录），再换索引。
+        """
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_pages_canonical_hash'"
+        ).fetchone()
+        if exists:
+            return
+        with self._conn:
+            self._conn.execute("DROP INDEX IF EXISTS idx_pages_url_hash")
+            rows = self._conn.execute("SELECT id, url FROM pages WHERE canonical_url IN ('', url)").fetchall()
+            self._conn.executemany(
+                "UPDATE pages SET canonical_url = ? WHERE id = ?", ((canonicalize_url(r["url"]), r["id"]) for r in rows),
+            )
+            dupes = [r[0] for r in self._conn.execute(
+                "SELECT id FROM pages WHERE id NOT IN (SELECT MIN(id) FROM pages GROUP BY canonical_url, content_hash)"
+            )]
+            if dupes:
+                logger.info("merging %d stored pages that share a canonical URL and content", len(dupes))
+                has_fts = self._conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'pages_fts'"
+                ).fetchone()
+                tables = [("pages", "id"), ("page_html", "page_id"), ("page_simhash", "page_id"), ("simhash_bands", "page_id")]
+                if has_fts:
+                    tables.append(("pages_fts", "rowid"))
+                for table, column in tables:
+                    self._conn.executemany(f"DELETE FROM {table} WHERE {column} = ?", ((i,) for i in dupes))
+            self._conn.execute("CREATE UNIQUE INDEX idx_pages_canonical_hash ON pages(canonical_url, content_hash)")
+
+    def _init_fulltext(self) -> None:
+        """建 FTS5 索引；老库第一次建索引时从 pages/ 文件回填。"""
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'pages_fts'"
+        ).fetchone()
+        if exists:
+            return
+        self._conn.execute(f"CREATE VIRTUAL TABLE pages_fts USING fts5(title, body, tokenize='{FTS_TOKENIZER}')")
+        rows = self._conn.execute(
+            "SELECT id, title, file_path, content_hash FROM pages WHERE file_path != '' OR content_hash != ''"
+        ).fetchall()
+        if rows:
+            logger.info("building full-text index for %d stored pages", len(rows))
+            with self._conn:
+                self._conn.executemany(
+                    _FTS_INSERT, ((r["id"], r["title"], self.load_content(dict(r))) for r in rows),
+                )
+
+    # --- 写入 ---
+
+    def save(self, result: CrawlResult) -> int:
+        """保存一条结果，返回行 id；同规范 URL + 同内容已存在时只更新 checked_at（改回旧内容时另记一个版本）并返回 0。"""
+        return self.save_many([result])[0]
+
+    def save_many(self, results: Iterable[CrawlResult]) -> list[int]:
+        """一个事务写入一批结果，返回与输入一一对应的行 id（重复的为 0）。"""
+        ids: list[int] = []
+        with self._lock, self._conn:
+            for result in results:
+                if not result.canonical_url:
+                    result = result.model_copy(update={"canonical_url": canonicalize_url(result.url)})
+                content_hash = result.content_hash
+                content = result.fit_markdown or result.markdown
+                if self._conn.execute(_EXISTS, (result.canonical_url, content_hash)).fetchone():
+                    self._conn.execute(_CHECKED, (_iso(result.crawled_at), result.canonical_url, content_hash))
+                    if self.versions is not None and content:
+                        # 改回更早的内容（A→B→A）也是一次改动：最新版本不是它时照样记版本
+                        self.versions.add(result, content, _iso(result.crawled_at))
+                    ids.append(0)
+                    continue
+                fp = result_simhash(result) if content and self.near_duplicates != "off" else 0
+                near = self.neardup.nearest(fp, self.max_distance, exclude_url=result.canonical_url) if fp else []
+                if near:
+                    if self.near_duplicates == "skip":
+                        ids.append(0)
+                        continue
+                    result = self._link(result, *near[0])
+                file_path = ""
+                if self.versions is not None and content:
+                    self.versions.add(result, content, _iso(result.crawled_at))
+                elif self.blobs is not None:
+                    self.blobs.put(content_hash, content, result.domain)
+                else:
+                    file_path = self._write_page(result)
+                cur = self._conn.execute(_INSERT, self._row(result, file_path))
+                row_id = cur.lastrowid if cur.rowcount and cur.lastrowid else 0
+                if row_id and content:
+                    self._conn.execute(_FTS_INSERT, (row_id, result.title, content))
+                if row_id and fp:
+                    self.neardup.add(row_id, fp)
+                if row_id and self.keep_html and result.html:
+                    self._keep_html(row_id, result)
+                ids.append(row_id)
+        logger.debug("saved %d of %d results", sum(1 for i in ids if i), len(ids))
+        return ids
+
+    def _keep_html(self, page_id: int, result: CrawlResult) -> None:
+        key = "html:" + hashlib.sha256(result.html.encode()).hexdigest()[:16]
+        # HTML 和 markdown 的模板文字不同，zstd 字典分开训练
+        self.blobs.put(key, result.html, f"{result.domain}#html")
+        self._conn.execute("INSERT OR REPLACE INTO page_html (page_id, html_key) VALUES (?, ?)", (page_id, key))
+
+    def rewrite(self, updates: Iterable[dict[str, Any]]) -> int:
+        """
+        重新提取后改写页面的派生字段，一个事务。返回实际改动的行数。
+
+        每项：id / title / content / content_hash / metadata。正文存进 blobs，全文索引和近似重复指纹同步更新；
+        同规范 URL 已有另一行是这个内容时跳过（保持 canonical_url + content_hash 唯一）。
+        """
+        changed = 0
+        with self._lock, self._conn:
+            for item in updates:
+                row = self._conn.execute(
+                    "SELECT domain, title, content_hash, metadata FROM pages WHERE id = ?", (item["id"],)
+                ).fetchone()
+                if row is None:
+                    continue
+                metadata = json.dumps(item["metadata"], ensure_ascii=False, default=str)
+                if (item["content_hash"], item["title"], metadata) == (row["content_hash"], row["title"], row["metadata"]):
+                    continue
+                if item["content"] and self.blobs is not None:
+                    self.blobs.put(item["content_hash"], item["content"], row["domain"])
+                cur = self._conn.execute(
+                    "UPDATE OR IGNORE pages SET title = ?, content_hash = ?, char_count = ?, file_path = '', "
+                    "metadata = ? WHERE id = ?",
+                    (item["title"], item["content_hash"], len(item["content"]), metadata, item["id"]),
+                )
+                if not cur.rowcount:
+                    continue
+                self._conn.execute("DELETE FROM pages_fts WHERE rowid = ?", (item["id"],))
+                if item["content"]:
+                    self._conn.execute(_FTS_INSERT, (item["id"], item["title"], item["content"]))
+                if fp := item["metadata"].get("simhash"):
+                    self.neardup.add(item["id"], int(fp, 16))  # 旧的分桶键留着无妨：候选都会按新指纹重算距离
+                changed += 1
+        return changed
+
+    def _link(self, result: CrawlResult, page_id: int, distance: int) -> CrawlResult:
+        url = self._conn.execute("SELECT url FROM pages WHERE id = ?", (page_id,)).fetchone()[0]
+        link = {"id": page_id, "url": url, "distance": distance}
+        return result.model_copy(update={"metadata": {**result.metadata, "near_duplicate_of": link}})
+
+    def _row(self, result: CrawlResult, file_path: str) -> tuple:
+        return (
+            result.url,
+            result.canonical_url or canonicalize_url(result.url),
+            result.domain,
+            result.title,
+            result.engine,
+            result.status,
+            result.error,
+            result.content_hash,
+            result.char_count,
+            file_path,
+            _iso(result.crawled_at),
+            _iso(result.crawled_at),
+            result.duration_ms,
+            json.dumps(result.metadata, ensure_ascii=False, default=str),
+        )
+
+    def _write_page(self, result: CrawlResult) -> str:
+        """正文写入 pages/YYYY-MM/，返回相对 pages_dir 上一级（storage 目录）的路径；没有正文返回空串。"""
+        content = result.fit_markdown or result.markdown
+        if not content:
+            return ""
+        month_dir = self.pages_dir / _utc(result.crawled_at).strftime("%Y-%m")
+        month_dir.mkdir(parents=True, exist_ok=True)
+        url_hash = hashlib.sha256(result.url.encode()).hexdigest()[:8]
+        name = f"{_UNSAFE.sub('_', result.domain)[:60]}_{url_hash}_{result.content_hash}.md"
+        path = month_dir / name
+        path.write_text(content, encoding="utf-8")
+        return path.relative_to(self.pages_dir.parent).as_posix()
+
+    # --- 查询 ---
+
+    def get_cached(self, url: str, max_age_seconds: int = 3600) -> dict[str, Any] | None:
+        """
+        最近一次成功抓取（url 或规范 url 匹配），最近确认时间（checked_at）早于 max_age_seconds 的不算。
+
+        失败的记录不作为缓存。未命中返回 None。
+        """
+        since = _iso(datetime.now(UTC) - timedelta(seconds=max_age_seconds))
+        rows = self._query(_CACHED, (url, url, since))
+        return rows[0] if rows else None
+
+    def get_by_url(self, url: str, limit: int = 50) -> list[dict[str, Any]]:
+        """同一 URL（原始或规范形式）的全部历史版本。"""
+        return self._query(
+            "SELECT * FROM pages WHERE url = ? OR canonical_url = ? ORDER BY crawled_at DESC, id DESC LIMIT ?",
+            (url, url, limit),
+        )
+
+    def get_by_domain(self, domain: str, limit: int = 50) -> list[dict[str, Any]]:
+        """按域名查询（zhihu.com 同时匹配 www.zhihu.com）。"""
+        domain = domain.lower().removeprefix("www.")
+        return self._query(
+            "SELECT * FROM pages WHERE domain IN (?, ?) ORDER BY crawled_at DESC, id DESC LIMIT ?",
+            (domain, f"www.{domain}", limit),
+        )
+
+    def search(self, keyword: str, limit: int = 20) -> list[dict[str, Any]]:
+        """标题或 URL 模糊匹配。"""
+        pattern = f"%{_escape_like(keyword)}%"
+        return self._query(
+            "SELECT * FROM pages WHERE title LIKE ? ESCAPE '\\' OR url LIKE ? ESCAPE '\\' "
+            "ORDER BY crawled_at DESC, id DESC LIMIT ?",
+            (pattern, pattern, limit),
+        )
+
+    def search_content(self, query: str, limit: int = 10, domain: str | None = None) -> list[dict[str, Any]]:
+        """
+        正文全文检索，按 BM25 相关度排序（标题命中权重更高）。
+
+        query 按空白切词，全部命中才算（AND）。返回的行多两个字段：
+        snippet（命中处前后的片段，命中词用 ** 包起来）和 score（越大越相关）。
+        """
+        terms = [t for t in query.split() if t]
+        if not terms:
+            return []
+        where, params = "", []
+        if domain:
+            domain = domain.lower().removeprefix("www.")
+            where, params = " AND p.domain IN (?, ?)", [domain, f"www.{domain}"]
+
+        if TRIGRAM and any(len(t) < 3 for t in terms):
+            return self._search_like(terms, where, params, limit)
+
+        match = " ".join('"' + t.replace('"', '""') + '"' for t in terms)
+        rows = self._query(
+            f"SELECT p.*, snippet(pages_fts, 1, '**', '**', '…', {SNIPPET_TOKENS}) AS snippet, "
+            "bm25(pages_fts, 5.0, 1.0) AS score "
+            f"FROM pages_fts JOIN pages p ON p.id = pages_fts.rowid WHERE pages_fts MATCH ?{where} "
+            "ORDER BY score LIMIT ?",
+            (match, *params, limit),
+        )
+        for row in rows:
+            row["score"] = round(-row["score"], 4)  # bm25() 越小越相关，翻成越大越好
+        return rows
+
+    def _search_like(self, terms: list[str], where: str, params: list[str], limit: int) -> list[dict[str, Any]]:
+        """短词回退：在索引表上逐词 LIKE（无相关度，按时间倒序），片段在 Python 里截。"""
+        conds = " AND ".join("(f.title LIKE ? ESCAPE '\\' OR f.body LIKE ? ESCAPE '\\')" for _ in terms)
+        like = [p for t in terms for p in (f"%{_escape_like(t)}%",) * 2]
+        rows = self._query(
+            f"SELECT p.*, f.body AS body FROM pages_fts f JOIN pages p ON p.id = f.rowid WHERE {conds}{where} "
+            "ORDER BY p.crawled_at DESC, p.id DESC LIMIT ?",
+            (*like, *params, limit),
+        )
+        for row in rows:
+            row["snippet"] = _snippet(row.pop("body"), terms[0])
+            row["score"] = 0.0
+        return rows
+
+    def changes(self, target: str, since: datetime | str | None = None, limit: int = 100) -> list[dict[str, Any]]:
+        """
+        URL（原始或规范形式）或域名的内容变更，按时间倒序，只含改动的段落。
+
+        每条：url / title / crawled_at / previous_crawled_at / content_hash / previous_hash，
+        sections 为 [{"section": 所在标题, "added": [行], "removed": [行]}]。
+        since 为 datetime 或 ISO 字符串，只返回此后抓到的版本。只有 blobs 模式记录版本。
+        """
+        if self.versions is None:
+            return []
+        if "://" in target:
+            where, params = "v.canonical_url = ? OR v.url = ?", (target, target)
+        else:
+            domain = target.lower().removeprefix("www.")
+            where, params = "v.domain IN (?, ?)", (domain, f"www.{domain}")
+        with self._lock:
+            return self.versions.changes(where, params, _iso(since) if since else "", limit)
+
+    def near_duplicates_of(self, url: str, limit: int = 10) -> list[dict[str, Any]]:
+        """与该 URL 最新版本内容近似的其他已存页面（不含它自己的历史版本），由近到远，多一个 distance 字段（汉明距离）。"""
+        latest = self.get_by_url(url, limit=1)
+        if not latest:
+            return []
+        with self._lock:
+            fp = self.neardup.get(latest[0]["id"])
+            hits = (
+                self.neardup.nearest(fp, self.max_distance, exclude_url=latest[0]["canonical_url"], limit=limit)
+                if fp else []
+            )
+        if not hits:
+            return []
+        distances = dict(hits)
+        rows = self._query(f"SELECT * FROM pages WHERE id IN ({', '.join('?' * len(hits))})", tuple(distances))
+        for row in rows:
+            row["distance"] = distances[row["id"]]
+        return sorted(rows, key=lambda r: (r["distance"], -r["id"]))
+
+    def recent(self, limit: int = 10) -> list[dict[str, Any]]:
+        return self._query("SELECT * FROM pages ORDER BY crawled_at DESC, id DESC LIMIT ?", (limit,))
+
+    def load_html(self, row: dict[str, Any]) -> str:
+        """读取页面保存的原始 HTML（没存返回空串）。"""
+        with self._lock:
+            hit = self._conn.execute("SELECT html_key FROM page_html WHERE page_id = ?", (row["id"],)).fetchone()
+            if hit is None or self.blobs is None:
+                return ""
+            return self.blobs.get(hit[0]) or ""
+
+    def iter_html(
+        self,
+        *,
+        domain: str | None = None,
+        since: datetime | str | None = None,
+        batch_size: int = 200,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """按 id 顺序分批读出存了原始 HTML 的页面（每行多一个 html 字段），内存里只有一批。"""
+        where, params = "", []
+        if domain:
+            domain = domain.lower().removeprefix("www.")
+            where, params = " AND p.domain IN (?, ?)", [domain, f"www.{domain}"]
+        if since:
+            where += " AND p.crawled_at >= ?"
+            params.append(_iso(since))
+        last = 0
+        while True:
+            rows = self._query(
+                "SELECT p.*, h.html_key FROM page_html h JOIN pages p ON p.id = h.page_id "
+                f"WHERE h.page_id > ?{where} ORDER BY h.page_id LIMIT ?",
+                (last, *params, batch_size),
+            )
+            if not rows:
+                return
+            with self._lock:
+                html = self.blobs.get_many(r["html_key"] for r in rows) if self.blobs is not None else {}
+            for row in rows:
+                row["html"] = html.get(row.pop("html_key"), "")
+            yield rows
+            last = rows[-1]["id"]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def load_content(self, row: dict[str, Any]) -> str:
+        """读取查询结果对应的 markdown 正文（找不到返回空串）。"""
+        if row.get("file_path"):
+            path = self.pages_dir.parent / row["file_path"]
+            return path.read_text(encoding="utf-8") if path.exists() else ""
+        if self.versions is not None and row.get("content_hash"):
+            with self._lock:
+                return self.versions.text(row["content_hash"]) or ""
+        return ""
+
+    def load_contents(self, rows: list[dict[str, Any]]) -> list[str]:
+        """批量读取正文（段文件按偏移顺序读），与 rows 一一对应。"""
+        keys = [r["content_hash"] for r in rows if not r.get("file_path") and r.get("content_hash")]
+        blobs = self.blobs.get_many(keys) if self.blobs is not None and keys else {}
+        if self.versions is not None:
+            with self._lock:
+                for key in keys:
+                    if key not in blobs:  # 存成差分的版本
+                        blobs[key] = self.versions.text(key) or ""
+        return [
+            blobs.get(r.get("content_hash", ""), "") if not r.get("file_path") else self.load_content(r)
+            for r in rows
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            if self.blobs is not None:
+                self.blobs.close()
+            self._conn.close()
+
+    def _query(self, sql: str, params: tuple) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        out = []
+        for row in rows:
+            item = dict(row)
+            item["metadata"] = json.loads(item["metadata"] or "{}")
+            out.append(item)
+        return out
+
+
+def _utc(dt: datetime) -> datetime:
+    """无时区的时间按 UTC 处理。"""
+    return dt.replace(tzinfo=UTC) if dt.tzinfo is None else dt.astimezone(UTC)
+
+
+def _iso(dt: datetime | str) -> str:
+    """统一存成 UTC ISO 字符串（秒精度），字符串比较即时间比较。字符串先按 ISO 时间解析（带偏移的换算到 UTC）。"""
+    if isinstance(dt, str):
+        dt = datetime.fromisoformat(dt)
+    return _utc(dt).isoformat(timespec="seconds")
+
+
+def _snippet(body: str, term: str) -> str:
+    pos = body.lower().find(term.lower())
+    if pos < 0:
+        return body[:SNIPPET_CHARS]
+    start = max(0, pos - SNIPPET_CHARS // 2)
+    end = pos + len(term)
+    text = f"{body[start:pos]}**{body[pos:end]}**{body[end:end + SNIPPET_CHARS // 2]}"
+    return ("…" if start else "") + text + ("…" if end + SNIPPET_CHARS // 2 < len(body) else "")
+
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
@@ -0,0 +1,247 @@
+"""
+页面版本链 — 同一规范 URL 的相继版本存成对上一版的行级差分，定期存完整关键帧。
+
+- 第一个版本、每隔 keyframe_interval 个版本、差分不比全文小多少、或全文已在 blobs 里（别的 URL
+  存过同样内容）时存关键帧：全文按 content_hash 进 BlobStore，和不分版本时一样
+- 其余版本只存差分（JSON 操作序列，键为 "上一版 hash>本版 hash"，同样压缩进 BlobStore），
+  读取时从最近的关键帧顺着链往后应用，最多 keyframe_interval - 1 步
+- 保存时顺手按 markdown 标题分段记下改动（哪一节加了/删了哪些行），changes() 直接查这张表，
+  不用还原正文
+
+VersionStore 不加锁也不提交事务，由 SpiderStorage 在自己的锁和事务里调用。
+"""
+
+from __future__ import annotations
+
+import difflib
+import json
+import re
+import sqlite3
+from collections import OrderedDict
+from typing import Any
+
+from spider.core.result import CrawlResult
+from spider.storage.blobs import BlobStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS page_versions (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    canonical_url TEXT    NOT NULL,
+    url           TEXT    NOT NULL,
+    domain        TEXT    NOT NULL DEFAULT '',
+    title         TEXT    NOT NULL DEFAULT '',
+    content_hash  TEXT    NOT NULL,
+    prev_id       INTEGER NOT NULL DEFAULT 0,
+    prev_hash     TEXT    NOT NULL DEFAULT '',
+    keyframe      INTEGER NOT NULL DEFAULT 1,
+    depth         INTEGER NOT NULL DEFAULT 0,
+    sections      TEXT    NOT NULL DEFAULT '[]',
+    crawled_at    TEXT    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_versions_canonical ON page_versions(canonical_url, id);
+CREATE INDEX IF NOT EXISTS idx_versions_url ON page_versions(url, id);
+CREATE INDEX IF NOT EXISTS idx_versions_domain ON page_versions(domain, crawled_at);
+CREATE INDEX IF NOT EXISTS idx_versions_hash ON page_versions(content_hash);
+"""
+
+KEYFRAME_INTERVAL = 20
+MAX_DELTA_RATIO = 0.5  # 差分（JSON）超过全文这个比例就直接存关键帧
+RECENT_TEXTS = 256      # 缓存每个 URL 最新版本的全文，定时监控时不必每次还原
+
+_INSERT = (
+    "INSERT INTO page_versions (canonical_url, url, domain, title, content_hash, prev_id, prev_hash, "
+    "keyframe, depth, sections, crawled_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_LATEST = "SELECT * FROM page_versions WHERE canonical_url = ? ORDER BY id DESC LIMIT 1"
+_HEADING = re.compile(r"^#{1,6}\s")
+
+
+class VersionStore:
+    """规范 URL → 版本链。"""
+
+    def __init__(self, conn: sqlite3.Connection, blobs: BlobStore, *, keyframe_interval: int = KEYFRAME_INTERVAL):
+        self._conn = conn
+        self._conn.executescript(SCHEMA)
+        self.blobs = blobs
+        self.keyframe_interval = keyframe_interval
+        self._recent: OrderedDict[str, tuple[str, str]] = OrderedDict()  # canonical → (hash, 全文)
+
+    def add(self, result: CrawlResult, content: str, crawled_at: str) -> None:
+        """记一个新版本：写关键帧或差分，并记下相对上一版改动的段落。调用方负责提交事务。"""
+        key = result.canonical_url or result.url
+        content_hash = result.content_hash
+        prev = self._conn.execute(_LATEST, (key,)).fetchone()
+        if prev is not None and prev["content_hash"] == content_hash:
+            return
+
+        old = self._latest_text(key, prev) if prev is not None else ""
+        ops = _diff(old, content) if prev is not None else []
+        sections = _changed_sections(old, content, ops) if prev is not None else []
+        delta = json.dumps(_encode(content, ops), ensure_ascii=False) if prev is not None else ""
+
+        keyframe = (
+            prev is None
+            or prev["depth"] + 1 >= self.keyframe_interval
+            or len(delta) > len(content) * MAX_DELTA_RATIO
+            or self.blobs.has(content_hash)
+        )
+        if keyframe:
+            self.blobs.put(content_hash, content, result.domain)
+            depth = 0
+        else:
+            self.blobs.put(_delta_key(prev["content_hash"], content_hash), delta, result.domain)
+            depth = prev["depth"] + 1
+
+        self._conn.execute(_INSERT, (
+            key,
+            result.url,
+            result.domain,
+            result.title,
+            content_hash,
+            prev["id"] if prev is not None else 0,
+            prev["content_hash"] if prev is not None else "",
+            int(keyframe),
+            depth,
+            json.dumps(sections, ensure_ascii=False),
+            crawled_at,
+        ))
+        self._remember(key, content_hash, content)
+
+    # --- 读取 ---
+
+    def text(self, content_hash: str) -> str | None:
+        """按 content_hash 还原正文（任一存过该内容的版本链都行）；没有返回 None。"""
+        full = self.blobs.get(content_hash)
+        if full is not None:
+            return full
+        row = self._conn.execute(
+            "SELECT * FROM page_versions WHERE content_hash = ? ORDER BY keyframe DESC, depth LIMIT 1",
+            (content_hash,),
+        ).fetchone()
+        return self._rebuild(row) if row is not None else None
+
+    def _latest_text(self, key: str, row: sqlite3.Row) -> str:
+        cached = self._recent.get(key)
+        if cached is not None and cached[0] == row["content_hash"]:
+            self._recent.move_to_end(key)
+            return cached[1]
+        return self._rebuild(row) or ""
+
+    def _rebuild(self, row: sqlite3.Row) -> str | None:
+        """从最近的关键帧顺着版本链应用差分。"""
+        chain = [row]
+        while not chain[-1]["keyframe"]:
+            prev = self._conn.execute("SELECT * FROM page_versions WHERE id = ?", (chain[-1]["prev_id"],)).fetchone()
+            if prev is None:
+                return None
+            chain.append(prev)
+        chain.reverse()
+        keys = [chain[0]["content_hash"]] + [_delta_key(r["prev_hash"], r["content_hash"]) for r in chain[1:]]
+        stored = self.blobs.get_many(keys)
+        if any(k not in stored for k in keys):
+            return None
+        text = stored[keys[0]]
+        for k in keys[1:]:
+            text = _apply(text, json.loads(stored[k]))
+        return text
+
+    def _remember(self, key: str, content_hash: str, content: str) -> None:
+        self._recent[key] = (content_hash, content)
+        self._recent.move_to_end(key)
+        while len(self._recent) > RECENT_TEXTS:
+            self._recent.popitem(last=False)
+
+    # --- 改动查询 ---
+
+    def changes(self, where: str, params: tuple, since: str, limit: int) -> list[dict[str, Any]]:
+        """有上一版的版本（按时间倒序），sections 为改动的段落。where 由 SpiderStorage 拼好。"""
+        rows = self._conn.execute(
+            "SELECT v.*, p.crawled_at AS prev_crawled_at FROM page_versions v "
+            "LEFT JOIN page_versions p ON p.id = v.prev_id "
+            f"WHERE v.prev_id != 0 AND ({where}) AND v.crawled_at >= ? "
+            "ORDER BY v.crawled_at DESC, v.id DESC LIMIT ?",
+            (*params, since, limit),
+        ).fetchall()
+        return [{
+            "url": r["url"],
+            "canonical_url": r["canonical_url"],
+            "domain": r["domain"],
+            "title": r["title"],
+            "crawled_at": r["crawled_at"],
+            "content_hash": r["content_hash"],
+            "previous_hash": r["prev_hash"],
+            "previous_crawled_at": r["prev_crawled_at"] or "",
+            "sections": json.loads(r["sections"]),
+        } for r in rows]
+
+
+def _delta_key(prev_hash: str, content_hash: str) -> str:
+    return f"{prev_hash}>{content_hash}"
+
+
+def _diff(old: str, new: str) -> list[tuple[str, int, int, int, int]]:
+    a, b = old.splitlines(keepends=True), new.splitlines(keepends=True)
+    return difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes()
+
+
+def _encode(new: str, ops: list[tuple[str, int, int, int, int]]) -> list[Any]:
+    """
+    差分编码：整数 n 表示沿用旧版 n 行，负数 -n 表示跳过旧版 n 行，字符串表示插入的新行。
+
+    全文按行切分（保留换行符），应用后逐字节还原。
+    """
+    b = new.splitlines(keepends=True)
+    out: list[Any] = []
+    for tag, i1, i2, j1, j2 in ops:
+        if tag == "equal":
+            out.append(i2 - i1)
+            continue
+        if i2 > i1:
+            out.append(i1 - i2)
+        out.extend(b[j1:j2])
+    return out
+
+
+def _apply(old: str, delta: list[Any]) -> str:
+    a = old.splitlines(keepends=True)
+    pos = 0
+    out: list[str] = []
+    for op in delta:
+        if isinstance(op, str):
+            out.append(op)
+        elif op >= 0:
+            out.extend(a[pos:pos + op])
+            pos += op
+        else:
+            pos -= op
+    return "".join(out)
+
+
+def _changed_sections(old: str, new: str, ops: list[tuple[str, int, int, int, int]]) -> list[dict[str, Any]]:
+    """
+    按 markdown 标题归并改动：[{"section": 所在标题, "added": [...], "removed": [...]}]。
+
+    新增/替换的行归到新版里所在的标题下，纯删除归到旧版里所在的标题下；空行不计。
+    """
+    a, b = old.splitlines(), new.splitlines()
+    heading_a, heading_b = _headings(a), _headings(b)
+    sections: dict[str, dict[str, Any]] = {}
+    for tag, i1, i2, j1, j2 in ops:
+        if tag == "equal":
+            continue
+        title = heading_b[j1] if j2 > j1 else heading_a[i1]
+        section = sections.setdefault(title, {"section": title, "added": [], "removed": []})
+        section["removed"].extend(line for line in a[i1:i2] if line.strip())
+        section["added"].extend(line for line in b[j1:j2] if line.strip())
+    return [s for s in sections.values() if s["added"] or s["removed"]]
+
+
+def _headings(lines: list[str]) -> list[str]:
+    """每一行所在段落的标题（标题行本身算自己那一段；第一个标题之前为空串）。"""
+    current = ""
+    out = []
+    for line in lines:
+        if _HEADING.match(line):
+            current = line.strip()
+        out.append(current)
+    return out
@@ -0,0 +1,117 @@
+"""
+后台写入线程 — 抓取协程只把结果放进队列，SQLite 事务和正文写盘都在专用线程里做。
+
+- 有界队列：写不过来时 submit() 阻塞 / asubmit() 在线程池里等，给抓取端施加背压
+- 攒批：线程拿到第一条后，把队列里已有的（最多 batch_size 条）一起 save_many()，一个事务提交；
+  整批失败时逐条重试，一条坏结果不连累同批的其他结果
+- flush() 等队列清空；close() 写完剩余结果后关闭存储
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+
+from spider.core.result import CrawlResult
+from spider.storage.partitioned import PartitionedStorage
+from spider.storage.sqlite import SpiderStorage
+
+logger = logging.getLogger("spider.storage")
+
+MAX_QUEUE = 1000
+BATCH_SIZE = 100
+
+_STOP = object()
+
+
+class StorageWriter:
+    """
+    SpiderStorage（或分区存储）的异步写入端。
+
+    读操作仍直接调用 storage（内部有锁）；写入走 submit()/asubmit()，
+    返回的 Future 在所属批次提交后给出行 id（重复内容为 0）。
+    """
+
+    def __init__(self, storage: SpiderStorage | PartitionedStorage, *, max_queue: int = MAX_QUEUE, batch_size: int = BATCH_SIZE):
+        self.storage = storage
+        self.batch_size = batch_size
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="spider-storage-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, result: CrawlResult) -> Future[int]:
+        """放入队列（满了就阻塞等待），返回写入结果的 Future。"""
+        if self._closed:
+            raise RuntimeError("storage writer is closed")
+        future: Future[int] = Future()
+        self._queue.put((result, future))
+        return future
+
+    async def asubmit(self, result: CrawlResult) -> Future[int]:
+        """协程版 submit：队列未满时立即返回；满了在线程池里等，不阻塞事件循环。"""
+        if self._closed:
+            raise RuntimeError("storage writer is closed")
+        future: Future[int] = Future()
+        try:
+            self._queue.put_nowait((result, future))
+        except queue.Full:
+            await asyncio.to_thread(self._queue.put, (result, future))
+        return future
+
+    def flush(self) -> None:
+        """等到已提交的结果全部落盘。"""
+        self._queue.join()
+
+    def close(self) -> None:
+        """写完队列里剩余的结果，停止线程并关闭存储。可重复调用。"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        self.storage.close()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch = []
+            stop = item is _STOP
+            if not stop:
+                batch.append(item)
+            while not stop and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+            if batch:
+                self._write(batch)
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: list[tuple[CrawlResult, Future[int]]]) -> None:
+        try:
+            ids = self.storage.save_many([result for result, _ in batch])
+        except Exception as e:
+            # 整批回滚了：逐条重试，只让仍然失败的那几条报错
+            logger.warning("storage batch of %d failed, retrying one by one: %s", len(batch), e)
+            for result, future in batch:
+                try:
+                    [row_id] = self.storage.save_many([result])
+                except Exception as e:
+                    logger.error("storage write failed for %s: %s", result.url, e)
+                    future.set_exception(e)
+                else:
+                    future.set_result(row_id)
+            return
+        for (_, future), row_id in zip(batch, ids, strict=True):
+            future.set_result(row_id)
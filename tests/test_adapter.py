@@ -1,6 +1,11 @@
 """适配器测试。"""
 
+from spider.adapters import registry as registry_mod
 from spider.adapters.default import DefaultAdapter
+from spider.adapters.news import BBCAdapter
+from spider.adapters.registry import BUILTIN_ADAPTERS, AdapterRegistry, AdapterSpec
+from spider.adapters.rules import CleanupRules
+from spider.adapters.tech import HackerNewsAdapter
 from spider.core.engine import FetchConfig
 from spider.core.result import CrawlResult
 
@@ -55,3 +60,137 @@ def test_custom_adapter():
     transformed = adapter.transform(result)
     assert "登录查看更多" not in transformed.markdown
     assert "正文内容" in transformed.markdown
+
+
+# --- CleanupRules ---
+
+def test_rules_strip_phrases():
+    """短语出现处删到行尾，并折叠空行。"""
+    rules = CleanupRules(strip_phrases=("Sign In", "Subscribe"))
+    md = "正文一\nSign In to read more\n\n\n\n正文二 Subscribe now\n结尾"
+    assert rules.apply(md) == "正文一\n\n正文二 结尾"
+
+
+def test_rules_drop_line_prefixes_and_links():
+    rules = CleanupRules(
+        drop_line_prefixes=("Advertisement",),
+        drop_link_texts=("hide",),
+    )
+    md = "标题\n  Advertisement: buy now\n内容 [hide](https://x.com/hide) 保留 [keep](https://x.com)"
+    assert rules.apply(md) == "标题\n内容  保留 [keep](https://x.com)"
+
+
+def test_rules_pattern_with_replacement():
+    """(正则, 替换串) 形式的规则按替换串替换，其他分支照常删除。"""
+    rules = CleanupRules(patterns=((r"\s*-{3,}\s*", " | "), r"\[\d+\]"))
+    assert rules.apply("a[1] --- b[23]") == "a | b"
+
+
+def test_rules_alternation_pattern_not_prefiltered():
+    """带顶层 | 的正则不能按前缀预筛。"""
+    rules = CleanupRules(patterns=(r"foo|bar",))
+    assert rules.apply("x bar y") == "x  y"
+
+
+def test_rules_compiled_once():
+    rules = CleanupRules(strip_phrases=("X",))
+    assert rules.compile() is CleanupRules(strip_phrases=("X",)).compile()
+
+
+def test_bbc_rules_match_legacy_chain():
+    """BBC 规则与迁移前的逐条 re.sub 结果一致。"""
+    import re
+
+    md = "Advertisement\n[Home](https://bbc.com)\n正文段落\n\n\n\n[Sport](https://bbc.com/sport)\n更多内容"
+    legacy = re.sub(r"Advertisement\s*\n", "", md)
+    legacy = re.sub(
+        r"(?:^|\n)\s*\[(?:Home|News|Sport|Business|Technology|Health|Culture|Arts|Travel|Earth|Audio|Video|Live|Weather|Newsletters)\]\([^\)]+\)\s*\n?",
+        "\n", legacy,
+    )
+    legacy = re.sub(r"\n{3,}", "\n\n", legacy).strip()
+    result = BBCAdapter().transform(CrawlResult(url="https://bbc.com/news/1", markdown=md))
+    assert result.markdown == legacy
+
+
+def test_hn_transform_adds_hint_when_short():
+    result = HackerNewsAdapter().transform(
+        CrawlResult(url="https://news.ycombinator.com/", markdown="| 1. | [hide](hide?id=1) |\n---\n短")
+    )
+    assert "|" not in result.markdown
+    assert "hint" in result.metadata
+
+
+# --- AdapterRegistry ---
+
+def test_builtin_specs_match_adapter_classes():
+    """内置声明的名字/域名与适配器类一致。"""
+    for spec in BUILTIN_ADAPTERS:
+        adapter = spec.load()
+        assert adapter.name == spec.name
+        assert tuple(adapter.domains) == spec.domains
+
+
+def test_registry_loads_adapter_on_lookup_only():
+    reg = AdapterRegistry(BUILTIN_ADAPTERS)
+    assert reg.loaded == []
+    assert reg.lookup("unknown-site.com") is None
+    assert reg.loaded == []
+
+    adapter = reg.lookup("en.wikipedia.org")
+    assert adapter is not None and adapter.name == "wikipedia"
+    assert reg.loaded == ["wikipedia"]
+    assert reg.lookup("zh.wikipedia.org") is adapter  # 只实例化一次
+
+
+def test_registry_accepts_instances():
+    reg = AdapterRegistry([DefaultAdapter(name="zhihu", domains=["zhihu.com"])])
+    adapter = reg.lookup("zhuanlan.zhihu.com")
+    assert adapter is not None and adapter.name == "zhihu"
+
+
+def test_registry_skips_bad_specs():
+    """公共后缀域名不登记、模块导入失败按未命中处理，都不影响其他适配器。"""
+    reg = AdapterRegistry([
+        AdapterSpec("suffix", ("co.uk", "good.co.uk"), "spider.adapters.default:DefaultAdapter"),
+        AdapterSpec("broken", ("broken.com",), "no_such_module:Adapter"),
+        *BUILTIN_ADAPTERS,
+    ])
+    assert "co.uk" not in reg.domains
+    assert reg.lookup("www.good.co.uk") is not None
+    assert reg.lookup("broken.com") is None
+    assert reg.lookup("broken.com") is None  # 不重复导入
+    assert reg.lookup("en.wikipedia.org").name == "wikipedia"
+
+
+def test_discover_entry_points(monkeypatch):
+    """entry point 可以给 spec 列表或适配器类，坏插件被跳过。"""
+
+    class _EP:
+        def __init__(self, name, obj):
+            self.name = name
+            self._obj = obj
+
+        def load(self):
+            if isinstance(self._obj, Exception):
+                raise self._obj
+            return self._obj
+
+    specs = [AdapterSpec("zhihu", ("zhihu.com",), "spider.adapters.default:DefaultAdapter")]
+    eps = [_EP("pack", specs), _EP("cls", BBCAdapter), _EP("broken", ImportError("boom"))]
+    monkeypatch.setattr(registry_mod, "entry_points", lambda group: eps)
+
+    found = registry_mod.discover_entry_points()
+    assert found[0] == specs[0]
+    assert isinstance(found[1], BBCAdapter)
+    assert len(found) == 2
+
+
+def test_adapter_capture_config():
+    """声明了抓包规则的适配器把规则写进 FetchConfig.extra（不覆盖已有的 extra）。"""
+    from spider.adapters.news import Jin10Adapter
+
+    fc = Jin10Adapter().customize_config(FetchConfig(extra={"screenshot": True}))
+    assert fc.extra["screenshot"] is True
+    assert fc.extra["capture"] == [r"flash-api\.jin10\.com/get_flash_list"]
+    assert fc.extra["capture_min"] == 1
+    assert "capture" not in DefaultAdapter().customize_config(FetchConfig()).extra
@@ -0,0 +1,116 @@
+"""正文段文件存储测试。"""
+
+import sqlite3
+
+import pytest
+
+from spider.storage import blobs as blobs_mod
+from spider.storage.blobs import BlobStore
+
+
+@pytest.fixture
+def conn():
+    c = sqlite3.connect(":memory:")
+    yield c
+    c.close()
+
+
+def test_roundtrip_and_dedupe(tmp_path, conn):
+    store = BlobStore(tmp_path, conn)
+    assert store.put("h1", "正文 content " * 50)
+    assert not store.put("h1", "正文 content " * 50)  # 同 hash 只存一份
+    assert store.get("h1") == "正文 content " * 50
+    assert store.get("missing") is None
+    # 压缩后明显小于原文
+    assert (tmp_path / "seg-000001.blob").stat().st_size < len(("正文 content " * 50).encode()) / 4
+    store.close()
+
+
+def test_segments_rotate_and_reopen(tmp_path, conn):
+    store = BlobStore(tmp_path, conn, segment_size=200)
+    texts = {f"h{i}": f"page {i} " + "x" * i * 40 for i in range(20)}
+    for key, text in texts.items():
+        store.put(key, text)
+    assert len(list(tmp_path.glob("seg-*.blob"))) > 1
+    store.close()
+
+    store = BlobStore(tmp_path, conn, segment_size=200)
+    assert store.get_many([*texts, "missing"]) == texts
+    store.put("new", "appended after reopen")
+    assert store.get("new") == "appended after reopen"
+    assert store.get("h0") == texts["h0"]
+    store.close()
+
+
+def test_zlib_fallback_reads_mixed(tmp_path, conn, monkeypatch):
+    """没装 zstandard 时用 zlib 写；按记录里的编码读。"""
+    monkeypatch.setattr(blobs_mod, "zstandard", None)
+    store = BlobStore(tmp_path, conn)
+    assert store.codec == "zlib"
+    store.put("z", "zlib body")
+    assert store.get("z") == "zlib body"
+    store.close()
+
+
+@pytest.mark.skipif(blobs_mod.zstandard is None, reason="zstandard not installed")
+def test_zstd_domain_dictionary(tmp_path, conn):
+    store = BlobStore(tmp_path, conn, dict_samples=50, dict_size=4096)
+    template = "Home | News | Sport | Weather | Contact us | Privacy policy | Cookies\n"
+    for i in range(80):
+        store.put(f"h{i}", f"{template}Story number {i} about topic {i * 7}\n{template}", "bbc.com")
+    assert conn.execute("SELECT COUNT(*) FROM blob_dicts").fetchone()[0] == 1
+    assert store.get("h79").startswith(template)
+    assert store.get("h1").endswith(template)
+    store.close()
+
+
+def test_dictionary_samples_bounded(tmp_path, conn):
+    """待训练样本总量超过上限时，先丢最久没来新页面的域名。"""
+    store = BlobStore(tmp_path, conn, dict_samples=1000, sample_budget=12 * 1024)
+    store.codec = "zstd"  # 只测攒样本，不会攒够去训练
+    page = b"x" * 1024
+    for i in range(30):
+        if i % 5 == 0:
+            store._dict_for("busy.com", page)
+        store._dict_for(f"site{i}.com", page)
+    assert store._sample_bytes <= 12 * 1024
+    assert store._sample_bytes == sum(len(s) for samples in store._samples.values() for s in samples)
+    assert len(store._samples["busy.com"]) == 6
+    assert "site0.com" not in store._samples
+    assert "site29.com" in store._samples
+    store.close()
+
+
+def test_two_instances_same_dir(tmp_path):
+    """同一目录两个实例交替写（MCP 服务 + 后台写入线程）：偏移取文件实际末尾，换段也跟得上。"""
+    db = tmp_path / "x.db"
+    c1, c2 = sqlite3.connect(db), sqlite3.connect(db)
+    a = BlobStore(tmp_path / "blobs", c1, segment_size=300)
+    b = BlobStore(tmp_path / "blobs", c2, segment_size=300)
+    texts = {f"h{i}": f"page {i} " + "body text " * (i * 5) for i in range(12)}
+    for i, (key, text) in enumerate(texts.items()):
+        (a if i % 2 else b).put(key, text)
+        (c1 if i % 2 else c2).commit()
+    assert len(list((tmp_path / "blobs").glob("seg-*.blob"))) > 1
+    assert a.get_many(texts) == texts
+    assert b.get_many(texts) == texts
+    for store, c in ((a, c1), (b, c2)):
+        store.close()
+        c.close()
+
+
+@pytest.mark.skipif(blobs_mod.zstandard is None, reason="zstandard not installed")
+def test_two_instances_train_same_domain(tmp_path):
+    db = tmp_path / "x.db"
+    c1, c2 = sqlite3.connect(db), sqlite3.connect(db)
+    stores = [BlobStore(tmp_path / "blobs", c, dict_samples=30, dict_size=4096) for c in (c1, c2)]
+    template = "Home | News | Sport | Weather | Contact us | Privacy policy | Cookies\n"
+    for store, c in zip(stores, (c1, c2), strict=True):
+        for i in range(40):
+            store.put(f"{id(store)}-{i}", f"{template}Story {i} about topic {i * 7}\n{template}", "bbc.com")
+        c.commit()
+    assert c1.execute("SELECT COUNT(*) FROM blob_dicts").fetchone()[0] == 1
+    assert stores[0]._domain_dicts["bbc.com"] == stores[1]._domain_dicts["bbc.com"]
+    for store, c in zip(stores, (c1, c2), strict=True):
+        store.close()
+        c.close()
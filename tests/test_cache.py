@@ -0,0 +1,196 @@
+"""热缓存与缓存策略测试。"""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from spider.adapters.default import DefaultAdapter
+from spider.adapters.tech import WikipediaAdapter
+from spider.core.result import CrawlResult
+from spider.main import _lookup
+from spider.storage.cache import CachePolicy, HotCache
+from spider.storage.sqlite import SpiderStorage
+
+
+def _result(url="https://example.com/a", markdown="# Test", age=0, **kwargs):
+    crawled_at = datetime.now(UTC) - timedelta(seconds=age)
+    return CrawlResult(url=url, markdown=markdown, fit_markdown=markdown, crawled_at=crawled_at, **kwargs)
+
+
+class TestHotCache:
+    def test_hit_and_miss(self):
+        hot = HotCache()
+        hot.put("a", _result(html="<p>big</p>"))
+        hit = hot.get("a", 60)
+        assert hit is not None
+        assert hit.markdown == "# Test"
+        assert hit.html == ""  # 只存精简结果
+        assert hot.get("b", 60) is None
+        assert hot.stats()["hits"] == 1
+        assert hot.stats()["misses"] == 1
+
+    def test_expired(self):
+        hot = HotCache()
+        hot.put("a", _result(age=120))
+        assert hot.get("a", 60) is None
+        assert hot.stats()["expired"] == 1
+        assert len(hot) == 0
+
+    def test_lru_eviction_by_entries(self):
+        hot = HotCache(max_entries=2)
+        hot.put("a", _result())
+        hot.put("b", _result())
+        hot.get("a", 60)  # a 变成最近使用
+        hot.put("c", _result())
+        assert hot.get("b", 60) is None
+        assert hot.get("a", 60) is not None
+        assert hot.stats()["evictions"] == 1
+
+    def test_eviction_by_chars(self):
+        hot = HotCache(max_chars=25)
+        hot.put("a", _result(markdown="x" * 10))
+        hot.put("b", _result(markdown="y" * 10))
+        assert len(hot) == 1
+        assert hot.stats()["chars"] == 20
+        hot.put("huge", _result(markdown="z" * 100))  # 单条超限不缓存
+        assert hot.get("huge", 60) is None
+
+    def test_failed_not_cached(self):
+        hot = HotCache()
+        hot.put("a", _result(status="failed", error="boom"))
+        assert len(hot) == 0
+
+    def test_invalidate(self):
+        hot = HotCache()
+        hot.put("a", _result())
+        hot.invalidate("a")
+        assert hot.get("a", 60) is None
+        assert hot.stats()["chars"] == 0
+
+
+class TestPolicy:
+    def test_default(self):
+        assert CachePolicy(900).ttl("https://example.com/a") == 900
+
+    def test_adapter_ttl(self):
+        policy = CachePolicy(900)
+        assert policy.ttl("https://en.wikipedia.org/wiki/X", WikipediaAdapter()) == 86400
+        assert policy.ttl("https://example.com/", DefaultAdapter()) == 900
+
+    def test_domain_overrides_adapter(self):
+        policy = CachePolicy(900, {"wikipedia.org": 600, "de.wikipedia.org": 60})
+        assert policy.ttl("https://en.wikipedia.org/wiki/X", WikipediaAdapter()) == 600
+        assert policy.ttl("https://de.wikipedia.org/wiki/X", WikipediaAdapter()) == 60
+        assert policy.ttl("https://www.wikipedia.org/", WikipediaAdapter()) == 600
+
+
+@pytest.mark.asyncio
+async def test_lookup_fills_memory(tmp_path):
+    storage = SpiderStorage(tmp_path / "test.db", tmp_path / "pages")
+    storage.save(_result(url="https://example.com/a", canonical_url="https://example.com/a"))
+    hot = HotCache()
+
+    first = await _lookup(hot, storage, "https://example.com/a", 60)
+    assert first is not None
+    assert first.status == "cached"
+    assert "cache" not in first.metadata
+
+    second = await _lookup(hot, storage, "https://example.com/a", 60)
+    assert second is not None
+    assert second.metadata["cache"] == "memory"
+    assert second.markdown == "# Test"
+    storage.close()
+
+
+class TestStaleWhileRevalidate:
+    @pytest.fixture
+    def env(self, tmp_path, monkeypatch):
+        from spider import main
+        from spider.infra.config import SpiderConfig
+
+        fetched: list[str] = []
+
+        async def fake_fetch(url, fc, engines, adapter, http, *, fast_path=True):
+            fetched.append(url)
+            return CrawlResult(url=url, markdown="# Fresh", fit_markdown="# Fresh", engine="http")
+
+        monkeypatch.setattr(main, "_fetch", fake_fetch)
+        cfg = SpiderConfig(storage_dir=tmp_path, use_proxy=False, cache_ttl=3600, max_stale=3600)
+        writer = main.get_writer(cfg)
+        return main, cfg, writer, fetched
+
+    @pytest.mark.asyncio
+    async def test_stale_returned_then_refreshed(self, env):
+        main, cfg, writer, fetched = env
+        url = "https://swr.example.com/page"
+        writer.storage.save(_result(url=url, canonical_url=url, markdown="# Old", age=5400))
+
+        result = await main.crawl(url, save=True, config=cfg, stale_while_revalidate=True)
+        assert result.markdown == "# Old"
+        assert result.metadata["stale"] is True
+        assert result.metadata["stale_seconds"] >= 1800
+
+        await main.wait_revalidations()
+        assert fetched == [url]
+        writer.flush()
+        fresh = await main.crawl(url, save=True, config=cfg, stale_while_revalidate=True)
+        assert fresh.status == "cached"
+        assert "stale" not in fresh.metadata
+        assert "Fresh" in fresh.markdown
+
+    @pytest.mark.asyncio
+    async def test_unchanged_refresh_extends_freshness(self, env, monkeypatch):
+        """后台重抓内容没变：库里的 checked_at 往后推，重启（热缓存清空）后不再算过期。"""
+        main, cfg, writer, fetched = env
+        url = "https://swr.example.com/unchanged"
+        writer.storage.save(_result(url=url, canonical_url=url, markdown="# Same", age=5400))
+
+        async def same_fetch(url, fc, engines, adapter, http, *, fast_path=True):
+            fetched.append(url)
+            return CrawlResult(url=url, markdown="# Same", fit_markdown="# Same", engine="http")
+
+        monkeypatch.setattr(main, "_fetch", same_fetch)
+        assert (await main.crawl(url, save=True, config=cfg, stale_while_revalidate=True)).metadata["stale"]
+        await main.wait_revalidations()
+        writer.flush()
+        assert len(writer.storage.get_by_url(url)) == 1  # 没有新行
+
+        monkeypatch.setattr(main, "_hot_cache", None)
+        again = await main.crawl(url, save=True, config=cfg, stale_while_revalidate=True)
+        assert again.status == "cached"
+        assert "stale" not in again.metadata
+        assert fetched == [url]
+
+    @pytest.mark.asyncio
+    async def test_beyond_max_stale_fetches(self, env):
+        main, cfg, writer, fetched = env
+        url = "https://swr.example.com/too-old"
+        writer.storage.save(_result(url=url, canonical_url=url, markdown="# Old", age=3 * 3600))
+
+        result = await main.crawl(url, save=True, config=cfg, stale_while_revalidate=True)
+        assert "Fresh" in result.markdown
+        assert fetched == [url]
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self, env):
+        main, cfg, writer, fetched = env
+        url = "https://swr.example.com/default"
+        writer.storage.save(_result(url=url, canonical_url=url, markdown="# Old", age=5400))
+
+        result = await main.crawl(url, save=True, config=cfg)
+        assert "Fresh" in result.markdown
+        assert fetched == [url]
+
+    @pytest.mark.asyncio
+    async def test_disabled_hit_at_boundary_is_fresh(self, env, monkeypatch):
+        """没开 SWR：checked_at 截到秒导致 age 略超 ttl 的命中照常算新鲜，不排后台重抓。"""
+        main, cfg, writer, fetched = env
+        url = "https://swr.example.com/boundary"
+        writer.storage.save(_result(url=url, canonical_url=url, markdown="# Old", age=3599))
+        monkeypatch.setattr(main, "age_seconds", lambda result: 3600.5)
+
+        result = await main.crawl(url, save=True, config=cfg)
+        assert result.status == "cached"
+        assert "stale" not in result.metadata
+        assert not main._revalidations
+        assert fetched == []
@@ -0,0 +1,60 @@
+"""域名后缀树 / 公共后缀测试。"""
+
+import pytest
+
+from spider.core.domains import DomainTrie, is_public_suffix, registrable_domain
+
+
+def test_registrable_domain():
+    assert registrable_domain("news.bbc.co.uk") == "bbc.co.uk"
+    assert registrable_domain("a.b.example.com") == "example.com"
+    assert registrable_domain("en.wikipedia.org") == "wikipedia.org"
+    assert registrable_domain("user.github.io") == "user.github.io"
+    assert registrable_domain("WWW.Example.COM.") == "example.com"
+    # 本身就是公共后缀 / 单标签主机：原样返回
+    assert registrable_domain("co.uk") == "co.uk"
+    assert registrable_domain("localhost") == "localhost"
+
+
+def test_is_public_suffix():
+    assert is_public_suffix("com")
+    assert is_public_suffix("co.uk")
+    assert is_public_suffix("github.io")
+    assert not is_public_suffix("bbc.co.uk")
+    assert not is_public_suffix("example.com")
+
+
+def test_trie_walk_shallow_to_deep():
+    trie: DomainTrie[int] = DomainTrie()
+    trie.insert("wikipedia.org", 1)
+    trie.insert("en.wikipedia.org", 2)
+
+    assert list(trie.walk("m.en.wikipedia.org")) == [("wikipedia.org", 1), ("en.wikipedia.org", 2)]
+    assert trie.longest("m.en.wikipedia.org") == ("en.wikipedia.org", 2)
+    assert trie.longest("zh.wikipedia.org") == ("wikipedia.org", 1)
+    assert trie.longest("wikipedia.com") is None
+    # 只是后缀相同不算子域名
+    assert trie.longest("notwikipedia.org") is None
+
+
+def test_trie_exact_and_iteration():
+    trie: DomainTrie[str] = DomainTrie()
+    trie.insert("bbc.co.uk", "a")
+    trie.insert("bbc.co.uk", "b")  # 覆盖
+    assert trie.setdefault("bbc.com", "c") == "c"
+    assert trie.setdefault("bbc.com", "d") == "c"
+
+    assert len(trie) == 2
+    assert sorted(trie) == ["bbc.co.uk", "bbc.com"]
+    assert trie.get("bbc.co.uk") == "b"
+    assert trie.get("news.bbc.co.uk") is None
+    assert "bbc.com" in trie
+    assert "co.uk" not in trie
+
+
+def test_trie_rejects_public_suffix():
+    trie: DomainTrie[int] = DomainTrie()
+    with pytest.raises(ValueError):
+        trie.insert("co.uk", 1)
+    with pytest.raises(ValueError):
+        trie.insert("com", 1)
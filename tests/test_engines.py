@@ -0,0 +1,262 @@
+"""引擎测试（不启动浏览器、不联网）。"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from spider.core.engine import FetchConfig
+from spider.engines import http_engine
+from spider.engines.cookies import load_cookie_file
+from spider.engines.crawl4ai_engine import Crawl4AIEngine, ResponseCapture
+from spider.engines.http_engine import HttpEngine, select_markdown
+
+
+class FakeRequest:
+    def __init__(self, resource_type: str):
+        self.resource_type = resource_type
+
+
+class FakeResponse:
+    def __init__(self, url: str, body=None, content_type: str = "application/json", resource_type: str = "xhr"):
+        self.url = url
+        self.status = 200
+        self.headers = {"content-type": content_type}
+        self.request = FakeRequest(resource_type)
+        self._body = body
+
+    async def json(self):
+        if isinstance(self._body, Exception):
+            raise self._body
+        return self._body
+
+
+class FakePage:
+    def __init__(self):
+        self.handlers: dict = {}
+        self.evaluated: list[str] = []
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    async def evaluate(self, script):
+        self.evaluated.append(script)
+
+    def emit(self, response):
+        self.handlers["response"](response)
+
+
+@pytest.mark.asyncio
+async def test_capture_records_matching_json():
+    page = FakePage()
+    capture = ResponseCapture([r"/api/flash"], min_count=2)
+    capture.attach(page)
+
+    page.emit(FakeResponse("https://x.com/api/flash?page=1", {"items": [1]}))
+    page.emit(FakeResponse("https://x.com/static/app.js", content_type="text/javascript", resource_type="script"))
+    page.emit(FakeResponse("https://x.com/api/flash/broken", ValueError("not json")))
+    await capture.drain()
+
+    assert [c["url"] for c in capture.captured] == ["https://x.com/api/flash?page=1"]
+    assert not capture.done
+    assert page.evaluated == []
+
+    page.emit(FakeResponse("https://x.com/api/flash?page=2", {"items": [2]}))
+    await capture.drain()
+    assert capture.done
+    assert capture.captured[1]["data"] == {"items": [2]}
+    assert len(page.evaluated) == 1  # 抓够后置一次页面标记
+
+
+@pytest.mark.asyncio
+async def test_capture_skips_non_json_documents():
+    page = FakePage()
+    capture = ResponseCapture([r"example\.com"])
+    capture.attach(page)
+    page.emit(FakeResponse("https://example.com/", "<html>", content_type="text/html", resource_type="document"))
+    await asyncio.sleep(0)
+    await capture.drain()
+    assert capture.captured == []
+
+
+@pytest.mark.asyncio
+async def test_capture_restores_previous_hook():
+    seen = []
+
+    async def user_hook(page, context, **kwargs):
+        seen.append(page)
+        return page
+
+    class FakeStrategy:
+        def __init__(self):
+            self.hooks = {"on_page_context_created": user_hook}
+
+        def set_hook(self, name, hook):
+            self.hooks[name] = hook
+
+    class FakeCrawler:
+        crawler_strategy = FakeStrategy()
+
+        async def arun(self, url, config):
+            page = FakePage()
+            await self.crawler_strategy.hooks["on_page_context_created"](page, context=None)
+            return page
+
+    engine = Crawl4AIEngine()
+    engine._crawler = FakeCrawler()
+    page = await engine._arun_capturing("https://x.com/", None, ResponseCapture([r"/api/"]))
+    assert seen == [page]  # 原 hook 照常执行
+    assert "response" in page.handlers  # 记录器也挂上了
+    assert engine._crawler.crawler_strategy.hooks["on_page_context_created"] is user_hook
+
+
+# --- HttpEngine ---
+
+PAGE = """<html><head><title>Doc</title></head><body>
+<nav><a href="https://example.com/">Home</a></nav>
+<main><article><h1>Guide</h1><p>Static <b>content</b>.</p><script>track()</script></article>
+<aside>Sidebar</aside></main>
+<footer>Footer</footer></body></html>"""
+
+
+def _engine_for(html: str) -> HttpEngine:
+    engine = HttpEngine()
+    engine._client = httpx.AsyncClient(transport=httpx.MockTransport(lambda req: httpx.Response(200, html=html)))
+    return engine
+
+
+def test_select_markdown_only_matched_subtrees():
+    md, matched = select_markdown(PAGE, "article, aside")
+    assert matched == 2
+    assert md == "# Guide\n\nStatic **content**.\n\nSidebar"
+    assert select_markdown(PAGE, ".missing") == ("", 0)
+
+
+def test_selector_compile_cached():
+    http_engine._compile_selector.cache_clear()
+    select_markdown(PAGE, "article")
+    select_markdown(PAGE, "article")
+    assert http_engine._compile_selector.cache_info().hits == 1
+
+
+@pytest.mark.asyncio
+async def test_http_fetch_with_selector():
+    async with _engine_for(PAGE) as engine:
+        result = await engine.fetch("https://example.com/doc", FetchConfig(selector="article"))
+    assert result.markdown == "# Guide\n\nStatic **content**."
+    assert result.fit_markdown == result.markdown
+    assert result.metadata["selector_matched"] == 1
+    assert result.title == "Doc"
+    assert "<footer>" in result.html  # 整页 HTML 保留给元数据提取
+
+
+@pytest.mark.asyncio
+async def test_http_fetch_selector_no_match_falls_back():
+    async with _engine_for(PAGE) as engine:
+        result = await engine.fetch("https://example.com/doc", FetchConfig(selector="#content"))
+    assert result.metadata["selector_matched"] == 0
+    assert "Sidebar" in result.markdown
+    assert result.fit_markdown == ""
+
+
+@pytest.mark.asyncio
+async def test_http_fetch_invalid_selector():
+    async with _engine_for(PAGE) as engine:
+        result = await engine.fetch("https://example.com/doc", FetchConfig(selector="div["))
+    assert result.status == "failed"
+    assert "invalid selector" in result.error
+
+
+# --- HttpEngine cookie jar ---
+
+COOKIES = [
+    {"name": "sid", "value": "abc", "domain": ".example.com", "path": "/", "expires": 4102444800,
+     "httpOnly": True, "secure": True, "sameSite": "Lax"},
+    {"name": "other", "value": "x", "domain": "other.org", "path": "/", "expires": -1},
+]
+
+
+def _session_engine(seen: list):
+    """记录请求 Cookie 头；/login 下发新 cookie。"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("cookie", ""))
+        if request.url.path == "/login":
+            return httpx.Response(200, html="<p>ok</p>", headers={"set-cookie": "token=t1; Path=/; HttpOnly"})
+        return httpx.Response(200, html="<p>page</p>")
+
+    engine = HttpEngine()
+    engine._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return engine
+
+
+def test_load_cookie_file_formats(tmp_path):
+    plain = tmp_path / "plain.json"
+    plain.write_text(json.dumps(COOKIES))
+    state = tmp_path / "state.json"
+    state.write_text(json.dumps({"cookies": COOKIES, "origins": []}))
+    assert load_cookie_file(plain) == COOKIES
+    assert load_cookie_file(state) == COOKIES
+    assert load_cookie_file(tmp_path / "missing.json") == []
+
+
+@pytest.mark.asyncio
+async def test_http_cookie_file_and_set_cookie(tmp_path):
+    path = tmp_path / "cookies.json"
+    path.write_text(json.dumps(COOKIES))
+    cfg = FetchConfig(cookie_file=str(path))
+    seen: list[str] = []
+    async with _session_engine(seen) as engine:
+        await engine.fetch("https://www.example.com/login", cfg)
+        await engine.fetch("https://www.example.com/account", cfg)
+        await engine.fetch("https://www.example.com/account", cfg)  # 文件只载入一次，不重复
+    assert seen[0] == "sid=abc"
+    assert set(seen[1].split("; ")) == {"sid=abc", "token=t1"}
+    assert seen[2] == seen[1]
+    assert json.loads(path.read_text()) == COOKIES  # 没开 save_cookies 不写回
+
+
+@pytest.mark.asyncio
+async def test_http_save_cookies(tmp_path):
+    path = tmp_path / "cookies.json"
+    path.write_text(json.dumps(COOKIES))
+    cfg = FetchConfig(cookie_file=str(path), save_cookies=True)
+    async with _session_engine([]) as engine:
+        await engine.fetch("https://www.example.com/login", cfg)
+
+    saved = {c["name"]: c for c in json.loads(path.read_text())}
+    assert set(saved) == {"sid", "token", "other"}
+    assert saved["sid"]["expires"] == 4102444800
+    assert saved["sid"]["httpOnly"] is True and saved["sid"]["secure"] is True
+    assert saved["token"]["domain"] == "www.example.com"
+    assert saved["token"]["httpOnly"] is True
+    assert saved["token"]["expires"] == -1
+    assert saved["other"]["domain"] == "other.org"
+
+
+@pytest.mark.asyncio
+async def test_http_cookie_session_shared_across_engines(tmp_path):
+    path = tmp_path / "cookies.json"
+    path.write_text(json.dumps(COOKIES))
+    cfg = FetchConfig(cookie_file=str(path))
+    seen: list[str] = []
+    async with _session_engine(seen) as engine:  # crawl() 每次新建引擎
+        await engine.fetch("https://www.example.com/login", cfg)
+    async with _session_engine(seen) as engine:
+        await engine.fetch("https://www.example.com/account", cfg)
+    assert set(seen[1].split("; ")) == {"sid=abc", "token=t1"}
+
+
+@pytest.mark.asyncio
+async def test_http_default_cookies_merge_into_jar(tmp_path):
+    path = tmp_path / "cookies.json"
+    path.write_text(json.dumps([{"name": "CONSENT", "value": "PENDING", "domain": ".example.com", "path": "/"}]))
+    seen: list[str] = []
+    async with _session_engine(seen) as engine:
+        await engine.get("https://www.example.com/login", FetchConfig(cookie_file=str(path)), cookies={"CONSENT": "YES+1"})
+        await engine.get("https://www.other.org/", cookies={"CONSENT": "YES+1"})
+        await engine.get("https://www.other.org/", cookies={"CONSENT": "YES+1"})
+    assert seen[0] == "CONSENT=PENDING"  # 文件里的值不被覆盖
+    assert seen[1] == "CONSENT=YES+1"
+    assert seen[2] == "CONSENT=YES+1"  # 不重复添加
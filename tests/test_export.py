@@ -0,0 +1,72 @@
+"""批量导出测试。"""
+
+import gzip
+import json
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from spider.core.result import CrawlResult
+from spider.storage.export import export, export_jsonl, iter_pages
+from spider.storage.sqlite import SpiderStorage
+
+T0 = datetime(2026, 10, 1, tzinfo=UTC)
+
+
+@pytest.fixture
+def storage(tmp_path):
+    s = SpiderStorage(tmp_path / "test.db", tmp_path / "pages")
+    for i in range(25):
+        s.save(CrawlResult(
+            url=f"https://{'a.com' if i % 2 else 'www.b.com'}/{i}",
+            title=f"Page {i}",
+            markdown=f"# Page {i}\n\nbody {i}",
+            status="failed" if i == 7 else "success",
+            crawled_at=T0 + timedelta(hours=i),
+            metadata={"n": i},
+        ))
+    yield s
+    s.close()
+
+
+def test_chunks_and_fields(storage):
+    chunks = list(iter_pages(storage, chunk_rows=10))
+    assert [len(c) for c in chunks] == [10, 10, 5]
+    row = chunks[0][3]
+    assert row["url"] == "https://a.com/3"
+    assert row["content"] == "# Page 3\n\nbody 3"
+    assert row["metadata"] == {"n": 3}
+    assert row["domain"] == "a.com"
+
+
+def test_filters(storage):
+    def urls(**filters):
+        return [r["url"] for chunk in iter_pages(storage, content=False, **filters) for r in chunk]
+
+    assert len(urls(domain="b.com")) == 13
+    assert urls(status="failed") == ["https://a.com/7"]
+    assert urls(since=T0 + timedelta(hours=20), until="2026-10-01T22:00:00+00:00") == [
+        "https://www.b.com/20", "https://a.com/21",
+    ]
+
+
+def test_jsonl_and_gzip(storage, tmp_path):
+    assert export_jsonl(storage, tmp_path / "out.jsonl", domain="a.com") == 12
+    lines = (tmp_path / "out.jsonl").read_text(encoding="utf-8").splitlines()
+    assert json.loads(lines[0])["url"] == "https://a.com/1"
+
+    assert export(storage, tmp_path / "out.jsonl.gz") == 25
+    with gzip.open(tmp_path / "out.jsonl.gz", "rt", encoding="utf-8") as f:
+        assert sum(1 for _ in f) == 25
+
+    with pytest.raises(ValueError):
+        export(storage, tmp_path / "out.csv", format="csv")
+
+
+def test_parquet(storage, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    assert export(storage, tmp_path / "out.parquet", chunk_rows=10) == 25
+    table = pq.read_table(tmp_path / "out.parquet")
+    assert table.num_rows == 25
+    assert pq.ParquetFile(tmp_path / "out.parquet").num_row_groups == 3
+    assert table.column("content")[0].as_py() == "# Page 0\n\nbody 0"
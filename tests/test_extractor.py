@@ -128,3 +128,46 @@ def test_extract_does_not_overwrite_existing_title(extractor):
     result = CrawlResult(url="https://example.com", html=html, title="Original Title")
     out = extractor.extract(result)
     assert out.title == "Original Title"
+
+
+def test_extract_uses_structured_data(extractor, monkeypatch):
+    """JSON-LD 字段齐全 + articleBody 够长：不跑 trafilatura 正文和元数据提取。"""
+    import json
+
+    import trafilatura
+
+    def boom(*args, **kwargs):
+        raise AssertionError("trafilatura should be skipped")
+
+    monkeypatch.setattr(trafilatura, "extract", boom)
+    monkeypatch.setattr(trafilatura, "bare_extraction", boom)
+
+    body = "\n".join(["Structured article paragraph with plenty of words in it. " * 4] * 4)
+    ld = {"@type": "NewsArticle", "headline": "LD headline", "author": {"name": "Ann"},
+          "datePublished": "2026-01-02", "publisher": {"name": "Example"}, "articleBody": body}
+    html = f'<html><head><script type="application/ld+json">{json.dumps(ld)}</script></head><body></body></html>'
+    out = extractor.extract(CrawlResult(url="https://example.com/a", html=html, markdown="nav junk"))
+
+    assert out.title == "LD headline"
+    assert out.metadata["author"] == "Ann"
+    assert out.metadata["sitename"] == "Example"
+    assert out.metadata["structured"] == ["json-ld"]
+    assert out.fit_markdown.count("\n\n") == 3
+
+
+def test_extract_keeps_selector_content(extractor, monkeypatch):
+    """引擎已按选择器取了正文：不跑 trafilatura 正文提取，fit_markdown 保持引擎结果。"""
+    import trafilatura
+
+    def boom(*args, **kwargs):
+        raise AssertionError("trafilatura.extract should be skipped")
+
+    monkeypatch.setattr(trafilatura, "extract", boom)
+    html = "<html><head><title>T</title></head><body><article><p>Body</p></article></body></html>"
+    result = CrawlResult(
+        url="https://example.com", html=html, markdown="Body", fit_markdown="Body",
+        metadata={"selector_matched": 1},
+    )
+    out = extractor.extract(result)
+    assert out.fit_markdown == "Body"
+    assert out.metadata["selector_matched"] == 1
@@ -0,0 +1,479 @@
+"""适配器结构化快速通道测试（不联网，用假 HTTP 引擎喂固定数据）。"""
+
+import json
+
+import httpx
+import pytest
+
+from spider.adapters.api import hackernews, reddit, wikipedia, youtube
+from spider.adapters.default import DefaultAdapter
+from spider.adapters.social import RedditAdapter, YouTubeAdapter
+from spider.adapters.tech import HackerNewsAdapter, WikipediaAdapter
+from spider.core.engine import FetchConfig
+
+
+class FakeHttp:
+    """按 URL 前缀返回固定 JSON 的假 HttpEngine。"""
+
+    name = "http"
+
+    def __init__(self, routes: dict):
+        self.routes = routes
+        self.calls: list[str] = []
+        self.params: list[dict] = []
+
+    async def get_json(self, url, config=None, *, params=None, headers=None):
+        self.calls.append(url)
+        self.params.append(params or {})
+        for prefix, payload in self.routes.items():
+            if url.startswith(prefix):
+                if isinstance(payload, Exception):
+                    raise payload
+                return payload
+        raise httpx.HTTPStatusError("404", request=httpx.Request("GET", url), response=httpx.Response(404))
+
+
+# --- Reddit ---
+
+REDDIT_THREAD = [
+    {"kind": "Listing", "data": {"children": [{"kind": "t3", "data": {
+        "id": "abc123", "title": "Python 3.14 released", "subreddit": "python", "author": "guido",
+        "score": 1234, "num_comments": 3, "created_utc": 1760000000, "is_self": True,
+        "selftext": "Release notes inside.", "permalink": "/r/python/comments/abc123/python_314/",
+    }}]}},
+    {"kind": "Listing", "data": {"children": [
+        {"kind": "t1", "data": {"author": "alice", "score": 50, "body": "Great!\nLove it.", "replies": {
+            "kind": "Listing", "data": {"children": [
+                {"kind": "t1", "data": {"author": "bob", "score": 7, "body": "Agreed", "replies": ""}},
+            ]},
+        }}},
+        {"kind": "more", "data": {"count": 10}},
+    ]}},
+]
+
+REDDIT_LISTING = {"kind": "Listing", "data": {"after": "t3_x", "children": [
+    {"kind": "t3", "data": {"title": "Post A", "subreddit": "python", "author": "a", "score": 10,
+                            "num_comments": 2, "permalink": "/r/python/comments/a/post_a/"}},
+    {"kind": "t3", "data": {"title": "Post B", "subreddit": "python", "author": "b", "score": 5,
+                            "num_comments": 0, "permalink": "/r/python/comments/b/post_b/"}},
+]}}
+
+
+@pytest.mark.parametrize(("url", "expected"), [
+    ("https://www.reddit.com/r/python/comments/abc123/python_314/",
+     "https://www.reddit.com/r/python/comments/abc123/python_314.json?raw_json=1"),
+    ("https://reddit.com/r/python/top/?t=week", "https://www.reddit.com/r/python/top.json?t=week&raw_json=1"),
+    ("https://old.reddit.com/r/python", "https://old.reddit.com/r/python.json?raw_json=1"),
+    ("https://www.reddit.com/", "https://www.reddit.com/.json?raw_json=1"),
+    ("https://www.reddit.com/user/spez/submitted/", "https://www.reddit.com/user/spez/submitted.json?raw_json=1"),
+    ("https://www.reddit.com/settings/", None),
+    ("https://www.reddit.com/r/python/wiki/index", None),
+])
+def test_reddit_json_url(url, expected):
+    assert reddit.json_url(url) == expected
+
+
+def test_reddit_render_thread():
+    page = reddit.render(REDDIT_THREAD)
+    assert page.title == "Python 3.14 released"
+    assert page.markdown.startswith("# Python 3.14 released")
+    assert "Release notes inside." in page.markdown
+    assert "- **u/alice** (50 points): Great!\n  Love it." in page.markdown
+    assert "  - **u/bob** (7 points): Agreed" in page.markdown
+    assert page.metadata["score"] == 1234
+    assert page.metadata["comments_rendered"] == 2
+
+
+def test_reddit_render_thread_limits():
+    page = reddit.render(REDDIT_THREAD, max_comments=5, max_depth=1)
+    assert "u/bob" not in page.markdown
+
+
+def test_reddit_render_listing():
+    page = reddit.render(REDDIT_LISTING)
+    assert page.title == "r/python"
+    assert "1. [Post A](https://www.reddit.com/r/python/comments/a/post_a/)" in page.markdown
+    assert len(page.links) == 2
+
+
+@pytest.mark.asyncio
+async def test_reddit_fast_fetch():
+    http = FakeHttp({"https://www.reddit.com/r/python/comments/abc123": REDDIT_THREAD})
+    result = await RedditAdapter().fast_fetch(
+        "https://www.reddit.com/r/python/comments/abc123/python_314/", FetchConfig(), http,
+    )
+    assert result is not None
+    assert result.status == "success"
+    assert result.engine == "http"
+    assert result.metadata["fast_path"] == "reddit_json"
+    assert result.fit_markdown == result.markdown
+    # 快速通道结果不再套用浏览器清洗规则
+    assert RedditAdapter().transform(result).markdown == result.markdown
+
+
+@pytest.mark.asyncio
+async def test_reddit_fast_fetch_not_applicable():
+    http = FakeHttp({})
+    adapter = RedditAdapter()
+    assert await adapter.fast_fetch("https://www.reddit.com/settings/", FetchConfig(), http) is None
+    assert await RedditAdapter(json_fast_path=False).fast_fetch(
+        "https://www.reddit.com/r/python/", FetchConfig(), http,
+    ) is None
+    assert http.calls == []
+
+
+@pytest.mark.asyncio
+async def test_fast_fetch_failure_returns_failed():
+    """HTTP 错误返回 failed（crawl() 据此回退浏览器）。"""
+    result = await RedditAdapter().fast_fetch("https://www.reddit.com/r/python/", FetchConfig(), FakeHttp({}))
+    assert result is not None
+    assert result.status == "failed"
+    assert "reddit_json" in result.error
+
+
+@pytest.mark.asyncio
+async def test_default_adapter_has_no_fast_path():
+    assert await DefaultAdapter().fast_fetch("https://example.com", FetchConfig(), FakeHttp({})) is None
+
+
+# --- Wikipedia ---
+
+@pytest.mark.parametrize(("url", "expected"), [
+    ("https://en.wikipedia.org/wiki/Python_(programming_language)", ("en.wikipedia.org", "Python (programming language)")),
+    ("https://zh.m.wikipedia.org/wiki/%E7%88%AC%E8%99%AB", ("zh.wikipedia.org", "爬虫")),
+    ("https://en.wikipedia.org/w/index.php?title=Web_crawler", ("en.wikipedia.org", "Web crawler")),
+    ("https://en.wikipedia.org/w/index.php?title=Web_crawler&action=history", None),
+    ("https://en.wikipedia.org/wiki/Special:Random", None),
+    ("https://www.wikipedia.org/", None),
+])
+def test_wikipedia_parse_url(url, expected):
+    assert wikipedia.parse_url(url) == expected
+
+
+WIKI_PARSE = {"parse": {
+    "title": "Web crawler", "pageid": 46318,
+    "text": (
+        '<div class="mw-parser-output"><p>A <b>Web crawler</b> is a bot.<sup class="reference">[1]</sup></p>'
+        '<h2 id="Overview">Overview<span class="mw-editsection">[edit]</span></h2>'
+        '<p>It visits <a href="/wiki/URL">URLs</a>.</p>'
+        '<div class="navbox">Navigation junk</div></div>'
+    ),
+    "sections": [{"index": "1", "line": "Overview"}],
+}}
+
+
+def test_wikipedia_html_to_markdown():
+    md = wikipedia.html_to_markdown(WIKI_PARSE["parse"]["text"])
+    assert "A **Web crawler** is a bot." in md
+    assert "## Overview" in md
+    assert "[1]" not in md and "[edit]" not in md and "Navigation junk" not in md
+
+
+@pytest.mark.asyncio
+async def test_wikipedia_fast_fetch_parse():
+    http = FakeHttp({"https://en.wikipedia.org/w/api.php": WIKI_PARSE})
+    result = await WikipediaAdapter().fast_fetch("https://en.wikipedia.org/wiki/Web_crawler", FetchConfig(), http)
+    assert result.status == "success"
+    assert result.title == "Web crawler"
+    assert result.markdown.startswith("# Web crawler")
+    assert result.metadata["fast_path"] == "wikipedia_parse"
+    assert result.metadata["sections"] == ["Overview"]
+    assert http.params[0]["page"] == "Web crawler"
+    assert "section" not in http.params[0]
+
+
+@pytest.mark.asyncio
+async def test_wikipedia_fast_fetch_section_by_name():
+    http = FakeHttp({"https://en.wikipedia.org/w/api.php": WIKI_PARSE})
+    cfg = FetchConfig(extra={"section": "overview"})
+    result = await WikipediaAdapter().fast_fetch("https://en.wikipedia.org/wiki/Web_crawler", cfg, http)
+    assert result.status == "success"
+    assert http.params[-1]["section"] == 1
+    assert not result.markdown.startswith("# ")  # 单章节不加条目标题
+
+
+@pytest.mark.asyncio
+async def test_wikipedia_fast_fetch_off():
+    adapter = WikipediaAdapter(api_mode="off")
+    assert await adapter.fast_fetch("https://en.wikipedia.org/wiki/Web_crawler", FetchConfig(), FakeHttp({})) is None
+
+
+@pytest.mark.asyncio
+async def test_wikipedia_batch_summary_single_request():
+    """summary 模式批量：一次 API 请求查多个标题，规范化/重定向映射回原 URL。"""
+    payload = {"query": {
+        "normalized": [{"from": "web crawler", "to": "Web crawler"}],
+        "redirects": [{"from": "Spider (bot)", "to": "Web crawler"}],
+        "pages": [
+            {"pageid": 46318, "title": "Web crawler", "extract": "A Web crawler is a bot.", "description": "Bot"},
+            {"title": "Nope", "missing": True},
+        ],
+    }}
+    http = FakeHttp({"https://en.wikipedia.org/w/api.php": payload})
+    urls = [
+        "https://en.wikipedia.org/wiki/web_crawler",
+        "https://en.wikipedia.org/wiki/Spider_(bot)",
+        "https://en.wikipedia.org/wiki/Nope",
+        "https://example.com/not-wiki",
+    ]
+    results = await WikipediaAdapter(api_mode="summary").fast_fetch_many(urls, FetchConfig(), http)
+    assert len(http.calls) == 1
+    assert http.params[0]["titles"] == "web crawler|Spider (bot)|Nope"
+    assert [r.title for r in results[:2]] == ["Web crawler", "Web crawler"]
+    assert results[0].metadata["fast_path"] == "wikipedia_summary"
+    assert "*Bot*" in results[0].markdown
+    assert results[2].status == "failed"
+    assert results[3] is None
+
+
+@pytest.mark.asyncio
+async def test_wikipedia_batch_parse():
+    http = FakeHttp({"https://en.wikipedia.org/w/api.php": WIKI_PARSE})
+    urls = ["https://en.wikipedia.org/wiki/A", "https://en.wikipedia.org/wiki/B"]
+    results = await WikipediaAdapter().fast_fetch_many(urls, FetchConfig(), http)
+    assert [r.status for r in results] == ["success", "success"]
+    assert sorted(p["page"] for p in http.params) == ["A", "B"]
+
+
+@pytest.mark.asyncio
+async def test_default_fast_fetch_many():
+    assert await DefaultAdapter().fast_fetch_many(["https://a.com", "https://b.com"], FetchConfig(), FakeHttp({})) == [None, None]
+
+
+@pytest.mark.asyncio
+async def test_crawl_many_falls_back_on_wrong_batch_length(tmp_path, monkeypatch):
+    """批量快速通道返回的条数不对时整组改走逐个 crawl()，不让整批失败。"""
+    from spider import main
+    from spider.core.result import CrawlResult
+    from spider.infra.config import SpiderConfig
+
+    async def short(self, urls, config, http):
+        return [None]
+
+    async def fake_crawl(url, **kwargs):
+        return CrawlResult(url=url, markdown="ok")
+
+    monkeypatch.setattr(WikipediaAdapter, "fast_fetch_many", short)
+    monkeypatch.setattr(main, "crawl", fake_crawl)
+    urls = ["https://en.wikipedia.org/wiki/A", "https://en.wikipedia.org/wiki/B"]
+    results = await main.crawl_many(urls, config=SpiderConfig(storage_dir=tmp_path))
+    assert [r.url for r in results] == urls
+
+
+# --- Hacker News ---
+
+HN = "https://hacker-news.firebaseio.com/v0"
+
+
+class ExactHttp(FakeHttp):
+    """按完整 URL 精确匹配（HN 的 item/1 与 item/10 前缀会重叠）。"""
+
+    async def get_json(self, url, config=None, *, params=None, headers=None):
+        self.calls.append(url)
+        if url not in self.routes:
+            raise httpx.HTTPStatusError("404", request=httpx.Request("GET", url), response=httpx.Response(404))
+        return self.routes[url]
+
+
+def _hn_routes() -> dict:
+    items = {
+        1: {"id": 1, "type": "story", "by": "pg", "time": 1160418111, "title": "Y Combinator",
+            "url": "http://ycombinator.com", "score": 57, "descendants": 3, "kids": [2, 3]},
+        2: {"id": 2, "type": "comment", "by": "alice", "time": 1160418200, "text": "First<p>Second para",
+            "kids": [4]},
+        3: {"id": 3, "type": "comment", "deleted": True},
+        4: {"id": 4, "type": "comment", "by": "bob", "time": 1160418300, "text": "Reply"},
+        5: {"id": 5, "type": "story", "by": "dang", "time": 1160418400, "title": "Ask HN: Test",
+            "score": 3, "descendants": 0, "text": "Question?"},
+    }
+    routes = {f"{HN}/item/{i}.json": item for i, item in items.items()}
+    routes[f"{HN}/topstories.json"] = [1, 5, 99]  # 99 请求失败，跳过
+    routes[f"{HN}/user/pg.json"] = {"id": "pg", "karma": 155111, "created": 1160418092,
+                                    "about": "Bug fixer.", "submitted": [5, 1]}
+    return routes
+
+
+@pytest.mark.parametrize(("url", "expected"), [
+    ("https://news.ycombinator.com/", ("list", "topstories", 1)),
+    ("https://news.ycombinator.com/news?p=2", ("list", "topstories", 2)),
+    ("https://news.ycombinator.com/ask", ("list", "askstories", 1)),
+    ("https://news.ycombinator.com/item?id=8863", ("item", "8863", 1)),
+    ("https://news.ycombinator.com/user?id=pg", ("user", "pg", 1)),
+    ("https://news.ycombinator.com/login", None),
+    ("https://news.ycombinator.com/item?id=abc", None),
+])
+def test_hn_resolve(url, expected):
+    assert hackernews.resolve(url) == expected
+
+
+@pytest.mark.asyncio
+async def test_hn_front_page():
+    http = ExactHttp(_hn_routes())
+    result = await HackerNewsAdapter().fast_fetch("https://news.ycombinator.com/", FetchConfig(), http)
+    assert result.status == "success"
+    assert result.metadata["fast_path"] == "hn_api"
+    assert "1. [Y Combinator](http://ycombinator.com) — 57 points · by pg" in result.markdown
+    assert "2. [Ask HN: Test](https://news.ycombinator.com/item?id=5)" in result.markdown
+    assert result.metadata["items"] == 2
+
+
+@pytest.mark.asyncio
+async def test_hn_item_comment_tree():
+    http = ExactHttp(_hn_routes())
+    result = await HackerNewsAdapter().fast_fetch("https://news.ycombinator.com/item?id=1", FetchConfig(), http)
+    md = result.markdown
+    assert md.startswith("# Y Combinator")
+    assert "- **alice** (2006-10-09 18:23 UTC): First\n\n  Second para" in md
+    assert "  - **bob**" in md
+    assert result.metadata["comments_rendered"] == 2
+    assert f"{HN}/item/3.json" in http.calls  # 已删除的评论拉了但不渲染
+
+
+@pytest.mark.asyncio
+async def test_hn_comment_limits():
+    http = ExactHttp(_hn_routes())
+    adapter = HackerNewsAdapter(max_comment_depth=1)
+    result = await adapter.fast_fetch("https://news.ycombinator.com/item?id=1", FetchConfig(), http)
+    assert "bob" not in result.markdown
+    assert f"{HN}/item/4.json" not in http.calls
+
+
+@pytest.mark.asyncio
+async def test_hn_user():
+    http = ExactHttp(_hn_routes())
+    result = await HackerNewsAdapter().fast_fetch("https://news.ycombinator.com/user?id=pg", FetchConfig(), http)
+    assert result.title == "User pg"
+    assert "karma 155111" in result.markdown
+    assert "Bug fixer." in result.markdown
+    assert result.markdown.index("Ask HN: Test") < result.markdown.index("Y Combinator")
+
+
+@pytest.mark.asyncio
+async def test_hn_fast_path_not_applicable():
+    http = ExactHttp({})
+    assert await HackerNewsAdapter().fast_fetch("https://news.ycombinator.com/login", FetchConfig(), http) is None
+    assert await HackerNewsAdapter(api_fast_path=False).fast_fetch(
+        "https://news.ycombinator.com/", FetchConfig(), http,
+    ) is None
+    missing = await HackerNewsAdapter().fast_fetch("https://news.ycombinator.com/item?id=7", FetchConfig(), http)
+    assert missing.status == "failed"
+
+
+# --- YouTube ---
+
+YT_PLAYER = {
+    "playabilityStatus": {"status": "OK"},
+    "videoDetails": {
+        "videoId": "dQw4w9WgXcQ", "title": "Never Gonna Give You Up", "author": "Rick Astley",
+        "channelId": "UCuAXFkgsw1L7xaCfnd5JJOw", "lengthSeconds": "213", "viewCount": "1600000000",
+        "keywords": ["rick", "80s"], "isLiveContent": False,
+        "shortDescription": "Official video.\n0:00 Intro\n0:43 Verse\n1:25 Chorus; {not json}",
+    },
+    "microformat": {"playerMicroformatRenderer": {"publishDate": "2009-10-24T23:57:33-07:00", "category": "Music"}},
+}
+YT_DATA = {"playerOverlays": {"markersMap": [{"value": {"chapters": [
+    {"chapterRenderer": {"title": {"simpleText": "Intro"}, "timeRangeStartMillis": 0}},
+    {"chapterRenderer": {"title": {"runs": [{"text": "Chorus"}]}, "timeRangeStartMillis": 85000}},
+]}}]}}
+
+
+def _watch_html(player: dict, data: dict | None = None) -> str:
+    html = f"<html><script>var ytInitialPlayerResponse = {json.dumps(player)};var meta = {{}};</script>"
+    if data is not None:
+        html += f'<script>window["ytInitialData"] = {json.dumps(data)};</script>'
+    return html + "</html>"
+
+
+class PageHttp(FakeHttp):
+    """get() 返回固定 HTML 的假 HttpEngine。"""
+
+    async def get(self, url, config=None, *, params=None, headers=None, cookies=None):
+        self.calls.append(url)
+        self.params.append(params or {})
+        self.cookies = cookies
+        for prefix, body in self.routes.items():
+            if url.startswith(prefix):
+                return httpx.Response(200, text=body)
+        raise httpx.HTTPStatusError("404", request=httpx.Request("GET", url), response=httpx.Response(404))
+
+
+@pytest.mark.parametrize(("url", "expected"), [
+    ("https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=10", ("video", "dQw4w9WgXcQ")),
+    ("https://youtu.be/dQw4w9WgXcQ", ("video", "dQw4w9WgXcQ")),
+    ("https://m.youtube.com/shorts/dQw4w9WgXcQ", ("video", "dQw4w9WgXcQ")),
+    ("https://www.youtube.com/@RickAstleyYT", ("channel", "@RickAstleyYT")),
+    ("https://www.youtube.com/channel/UCuAXFkgsw1L7xaCfnd5JJOw/videos", ("channel", "channel/UCuAXFkgsw1L7xaCfnd5JJOw")),
+    ("https://www.youtube.com/results?search_query=x", None),
+    ("https://www.youtube.com/watch?v=short", None),
+])
+def test_youtube_resolve(url, expected):
+    assert youtube.resolve(url) == expected
+
+
+def test_youtube_embedded_json():
+    html = _watch_html(YT_PLAYER, YT_DATA)
+    assert youtube.embedded_json(html, "ytInitialPlayerResponse") == YT_PLAYER
+    assert youtube.embedded_json(html, "ytInitialData") == YT_DATA
+    assert youtube.embedded_json(html, "ytMissing") is None
+
+
+def test_youtube_render_video_chapters():
+    page = youtube.render_video(YT_PLAYER, YT_DATA)
+    assert page.markdown.startswith("# Never Gonna Give You Up\n\nRick Astley · 3:33 · 1,600,000,000 views · 2009-10-24")
+    assert "- [1:25](https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=85s) Chorus" in page.markdown
+    assert page.metadata["chapters"] == [{"start": 0, "title": "Intro"}, {"start": 85, "title": "Chorus"}]
+    assert page.metadata["duration_seconds"] == 213
+    assert page.metadata["view_count"] == 1_600_000_000
+
+
+def test_youtube_description_chapters_fallback():
+    page = youtube.render_video(YT_PLAYER, None)
+    assert [c["title"] for c in page.metadata["chapters"]] == ["Intro", "Verse", "Chorus; {not json}"]
+
+
+def test_youtube_unplayable():
+    with pytest.raises(LookupError, match="LOGIN_REQUIRED"):
+        youtube.render_video({"playabilityStatus": {"status": "LOGIN_REQUIRED"}}, None)
+
+
+@pytest.mark.asyncio
+async def test_youtube_fast_fetch_video():
+    http = PageHttp({"https://www.youtube.com/watch": _watch_html(YT_PLAYER, YT_DATA)})
+    result = await YouTubeAdapter().fast_fetch("https://youtu.be/dQw4w9WgXcQ", FetchConfig(), http)
+    assert result.status == "success"
+    assert result.metadata["fast_path"] == "youtube_page"
+    assert http.params[0]["v"] == "dQw4w9WgXcQ"
+    assert http.cookies == {"CONSENT": "YES+1"}
+    assert YouTubeAdapter().transform(result).status == "success"
+
+
+@pytest.mark.asyncio
+async def test_youtube_fast_fetch_channel():
+    data = {
+        "metadata": {"channelMetadataRenderer": {"title": "Rick Astley", "description": "Official channel",
+                                                 "externalId": "UCuAXFkgsw1L7xaCfnd5JJOw"}},
+        "header": {"c4TabbedHeaderRenderer": {"subscriberCountText": {"simpleText": "4.2M subscribers"}}},
+        "contents": {"tabs": [{"richGridRenderer": {"contents": [
+            {"richItemRenderer": {"content": {"videoRenderer": {
+                "videoId": "dQw4w9WgXcQ", "title": {"runs": [{"text": "Never Gonna Give You Up"}]},
+                "lengthText": {"simpleText": "3:33"}, "viewCountText": {"simpleText": "1.6B views"}}}}},
+            {"richItemRenderer": {"content": {"videoRenderer": {
+                "videoId": "yPYZpwSpKmA", "title": {"runs": [{"text": "Together Forever"}]}}}}},
+        ]}}]},
+    }
+    html = f"<script>var ytInitialData = {json.dumps(data)};</script>"
+    http = PageHttp({"https://www.youtube.com/@RickAstleyYT/videos": html})
+    result = await YouTubeAdapter().fast_fetch("https://www.youtube.com/@RickAstleyYT", FetchConfig(), http)
+    assert result.title == "Rick Astley"
+    assert "4.2M subscribers" in result.markdown
+    assert "- [Never Gonna Give You Up](https://www.youtube.com/watch?v=dQw4w9WgXcQ) — 3:33 · 1.6B views" in result.markdown
+    assert result.markdown.index("Never Gonna") < result.markdown.index("Together Forever")
+    assert result.metadata["videos"] == 2
+
+
+@pytest.mark.asyncio
+async def test_youtube_consent_page_falls_back():
+    """拿不到内嵌 JSON（同意页/改版）→ failed，crawl() 回退浏览器。"""
+    http = PageHttp({"https://www.youtube.com/watch": "<html>Before you continue</html>"})
+    result = await YouTubeAdapter().fast_fetch("https://www.youtube.com/watch?v=dQw4w9WgXcQ", FetchConfig(), http)
+    assert result.status == "failed"
@@ -40,3 +40,37 @@ async def test_do_scrape_bad_url():
     # 应该返回 dict 而不是抛异常
     assert isinstance(result, dict)
     assert "status" in result
+
+
+@pytest.mark.asyncio
+async def test_do_scrape_defaults_leave_fetch_config_to_crawl(monkeypatch):
+    """没有 wait/scroll/selector 时不传 FetchConfig，规则文件的域名超时才能生效。"""
+    from spider import main
+    from spider.core.result import CrawlResult
+
+    seen = []
+
+    async def fake_crawl(url, **kwargs):
+        seen.append(kwargs["fetch_config"])
+        return CrawlResult(url=url, markdown="ok")
+
+    monkeypatch.setattr(main, "crawl", fake_crawl)
+    await _do_scrape(url="https://example.com/", save=False)
+    await _do_scrape(url="https://example.com/", save=False, wait=2)
+    assert seen[0] is None
+    assert seen[1].wait == 2
+
+
+def test_storage_shared_with_writer(tmp_path, monkeypatch):
+    """查询和后台写入共用一份存储，刚提交还在队列里的结果也查得到。"""
+    from spider.core.result import CrawlResult
+    from spider.infra.config import SpiderConfig
+    from spider.main import get_writer
+    from spider.mcp import server
+
+    monkeypatch.setattr(server, "_config", SpiderConfig(storage_dir=tmp_path))
+    writer = get_writer(server._config)
+    writer.submit(CrawlResult(url="https://mcp-shared.example.com/", markdown="# queued"))
+    storage = _get_storage()
+    assert storage is writer.storage
+    assert storage.get_by_url("https://mcp-shared.example.com/")
@@ -0,0 +1,103 @@
+"""分区存储测试。"""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from spider.core.result import CrawlResult
+from spider.storage.export import iter_pages
+from spider.storage.partitioned import PartitionedStorage
+
+
+def _result(url, month, day=1, markdown=None, **kwargs):
+    crawled_at = datetime(2026, month, day, 12, tzinfo=UTC)
+    return CrawlResult(url=url, markdown=markdown or f"# {url} {month}-{day}", crawled_at=crawled_at, **kwargs)
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = PartitionedStorage(tmp_path / "parts")
+    s.save_many([
+        _result("https://a.com/1", 8),
+        _result("https://a.com/1", 9, markdown="# a.com/1 updated"),
+        _result("https://b.com/1", 9, day=2),
+        _result("https://a.com/2", 10),
+    ])
+    yield s
+    s.close()
+
+
+def test_monthly_layout(store):
+    assert store.partitions() == ["2026-10", "2026-09", "2026-08"]
+    assert (store.root / "2026-09" / "spider.db").exists()
+    assert store.count() == 4
+
+
+def test_fan_out_queries(store):
+    assert [r["partition"] for r in store.get_by_url("https://a.com/1")] == ["2026-09", "2026-08"]
+    assert [r["url"] for r in store.recent(limit=2)] == ["https://a.com/2", "https://b.com/1"]
+    assert [r["url"] for r in store.get_by_domain("a.com")] == ["https://a.com/2", "https://a.com/1", "https://a.com/1"]
+    assert [r["url"] for r in store.search("b.com")] == ["https://b.com/1"]
+
+    rows = store.get_by_url("https://a.com/1")
+    assert store.load_contents(rows) == ["# a.com/1 updated", "# https://a.com/1 8-1"]
+    assert store.load_content(rows[0]) == "# a.com/1 updated"
+
+    hits = store.search_content("updated")
+    assert [(h["url"], h["partition"]) for h in hits] == [("https://a.com/1", "2026-09")]
+
+
+def test_get_cached_skips_old_months(tmp_path):
+    s = PartitionedStorage(tmp_path / "parts")
+    now = datetime.now(UTC)
+    s.save(CrawlResult(url="https://a.com/x", markdown="fresh", crawled_at=now - timedelta(minutes=5)))
+    cached = s.get_cached("https://a.com/x", max_age_seconds=3600)
+    assert cached is not None
+    assert s.load_content(cached) == "fresh"
+    assert s.get_cached("https://a.com/other") is None
+    s.close()
+
+
+def test_domain_groups(tmp_path):
+    s = PartitionedStorage(tmp_path / "parts", domain_groups={"reuters.com": "news", "bbc.co.uk": "news"})
+    s.save_many([
+        _result("https://www.reuters.com/a", 9),
+        _result("https://bbc.co.uk/b", 9),
+        _result("https://example.com/c", 9),
+    ])
+    assert s.partitions() == ["2026-09/news", "2026-09/other"]
+    assert [r["partition"] for r in s.get_by_domain("reuters.com")] == ["2026-09/news"]
+    assert [r["url"] for r in s.get_by_url("https://example.com/c")] == ["https://example.com/c"]
+    assert len(s.recent(limit=10)) == 3
+    s.close()
+
+
+def test_drop_before(store):
+    assert store.drop_before("2026-09") == ["2026-08"]
+    assert not (store.root / "2026-08").exists()
+    assert store.partitions() == ["2026-10", "2026-09"]
+    assert [r["partition"] for r in store.get_by_url("https://a.com/1")] == ["2026-09"]
+
+
+def test_export_across_partitions(store):
+    rows = [r for chunk in iter_pages(store, content=False) for r in chunk]
+    assert [r["crawled_at"][:7] for r in rows] == ["2026-08", "2026-09", "2026-09", "2026-10"]
+    rows = [r for chunk in iter_pages(store, since="2026-09-02", until="2026-10-01") for r in chunk]
+    assert [r["url"] for r in rows] == ["https://b.com/1"]
+
+
+def test_offset_times_normalized_to_utc(store):
+    """带时区偏移的 since/until 先换算成 UTC 再选月份分区、比较时间。"""
+    assert [p.db_path.parent.name for p in store.storages(since="2026-10-01T05:00+10:00")] == ["2026-10", "2026-09"]
+    rows = [r for chunk in iter_pages(store, since="2026-09-02T20:00+10:00", until="2026-10-01T14:00+05:00") for r in chunk]
+    assert [r["url"] for r in rows] == ["https://b.com/1"]
+
+
+def test_open_storage_from_config(tmp_path):
+    from spider.infra.config import SpiderConfig
+    from spider.main import open_storage
+
+    s = open_storage(SpiderConfig(storage_dir=tmp_path, partitioned=True, domain_groups={"a.com": "a"}))
+    assert isinstance(s, PartitionedStorage)
+    assert s.root == tmp_path / "partitions"
+    s.close()
@@ -2,8 +2,11 @@
 
 from unittest.mock import AsyncMock
 
+import pytest
+
 from spider.adapters.default import DefaultAdapter
-from spider.core.router import Router
+from spider.adapters.registry import BUILTIN_ADAPTERS, AdapterRegistry, AdapterSpec
+from spider.core.router import Router, get_router
 
 
 def _make_engine(name: str):
@@ -132,3 +135,116 @@ def test_no_http_engine_fallback():
 
     engine, _ = router.route("https://news.ycombinator.com/")
     assert engine.name == "crawl4ai"
+
+
+def test_registry_adapter_match():
+    """注册表里的适配器按域名索引匹配，显式注册的优先。"""
+    crawl4ai = _make_engine("crawl4ai")
+    router = Router(default_engine=crawl4ai, registry=AdapterRegistry(BUILTIN_ADAPTERS))
+
+    _, adapter = router.route("https://www.bbc.co.uk/news/world")
+    assert adapter.name == "bbc"
+
+    router.register_adapter("bbc.co.uk", DefaultAdapter(name="custom"))
+    _, adapter = router.route("https://bbc.co.uk/news")
+    assert adapter.name == "custom"
+
+
+
+def test_registry_specs_compiled_into_trie():
+    """注册表的声明编进路由树，与其他规则一次遍历；最深的适配器声明优先，命中时才加载。"""
+    registry = AdapterRegistry([
+        AdapterSpec("bbc", ("bbc.co.uk",), "spider.adapters.news:BBCAdapter"),
+        DefaultAdapter(name="bbc_sport", domains=["sport.bbc.co.uk"]),
+    ])
+    router = Router(default_engine=_make_engine("crawl4ai"), registry=registry)
+    registry.lookup = None  # 路由不再走注册表自己的查找
+
+    assert router.route("https://live.sport.bbc.co.uk/x")[1].name == "bbc_sport"
+    assert "bbc" not in registry.loaded
+    assert router.route("https://news.bbc.co.uk/x")[1].name == "bbc"
+    assert router.route("https://itv.co.uk/x")[1].name == "default"
+
+def test_adapter_engine_preference():
+    """适配器声明的引擎偏好优先于域名判断。"""
+    crawl4ai = _make_engine("crawl4ai")
+    http = _make_engine("http")
+    router = Router(default_engine=crawl4ai, http_engine=http)
+
+    router.register_adapter("trends24.in", DefaultAdapter(name="t24", engines=("http", "browser")))
+    engines, adapter = router.plan("https://trends24.in/united-states/")
+    assert [e.name for e in engines] == ["http", "crawl4ai"]
+    assert adapter.name == "t24"
+
+    # 声明只走浏览器：即使在 STATIC_SAFE 里也不走 HTTP
+    router.register_adapter("arxiv.org", DefaultAdapter(name="arxiv", engines=("browser",)))
+    engine, _ = router.route("https://arxiv.org/abs/2301.07041")
+    assert engine.name == "crawl4ai"
+
+
+def test_engine_preference_without_http_engine():
+    """没有 HTTP 引擎时，回退链里的 http 被跳过。"""
+    crawl4ai = _make_engine("crawl4ai")
+    router = Router(default_engine=crawl4ai)
+    router.register_adapter("trends24.in", DefaultAdapter(name="t24", engines=("http", "browser")))
+
+    engines, _ = router.plan("https://trends24.in/")
+    assert [e.name for e in engines] == ["crawl4ai"]
+
+
+def test_unknown_engine_preference():
+    crawl4ai = _make_engine("crawl4ai")
+    router = Router(default_engine=crawl4ai)
+    router.register_adapter("a.com", DefaultAdapter(name="a", engines=("curl",)))
+
+    with pytest.raises(ValueError):
+        router.plan("https://a.com/")
+
+
+def test_multilevel_suffix_adapter_match():
+    """多级公共后缀：news.bbc.co.uk 匹配 bbc.co.uk，而不是猜成 co.uk。"""
+    crawl4ai = _make_engine("crawl4ai")
+    router = Router(default_engine=crawl4ai)
+    router.register_adapter("bbc.co.uk", DefaultAdapter(name="bbc"))
+
+    _, adapter = router.route("https://news.bbc.co.uk/sport")
+    assert adapter.name == "bbc"
+    _, adapter = router.route("https://www.itv.co.uk/news")
+    assert adapter.name == "default"
+
+
+def test_deepest_rule_wins():
+    """同一属性多处命中时，更具体的域名优先。"""
+    crawl4ai = _make_engine("crawl4ai")
+    http = _make_engine("http")
+    router = Router(default_engine=crawl4ai, http_engine=http)
+    router.register_adapter("example.com", DefaultAdapter(name="parent"))
+    router.register_adapter("blog.example.com", DefaultAdapter(name="blog"))
+
+    assert router.route("https://a.blog.example.com/")[1].name == "blog"
+    assert router.route("https://shop.example.com/")[1].name == "parent"
+    assert router.needs_direct("https://zh.m.wikipedia.org/wiki/Python")
+    assert not router.needs_direct("https://arxiv.org/")
+
+
+def test_shared_router_takes_engines_per_call():
+    """get_router() 进程内复用同一个 Router（索引不重编），引擎按次传给 plan()。"""
+    router = get_router()
+    assert get_router() is router
+    rules = router._rules
+
+    crawl4ai, http = _make_engine("crawl4ai"), _make_engine("http")
+    engines, _ = router.plan("https://arxiv.org/abs/1", default_engine=crawl4ai, http_engine=http)
+    assert [e.name for e in engines] == ["http"]
+    other = _make_engine("crawl4ai")
+    engines, _ = router.plan("https://zhihu.com/q/1", default_engine=other, http_engine=http)
+    assert engines == [other]
+    assert router.adapter("https://en.wikipedia.org/wiki/Python").name == "wikipedia"
+    assert router._rules is rules
+
+
+def test_adapter_load_failure_falls_back_to_default():
+    """适配器模块导入失败时用默认适配器，不让抓取报错。"""
+    registry = AdapterRegistry([AdapterSpec("broken", ("broken.com",), "no_such_module:Adapter")])
+    router = Router(default_engine=_make_engine("crawl4ai"), registry=registry)
+    assert router.route("https://www.broken.com/")[1].name == "default"
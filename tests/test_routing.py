@@ -0,0 +1,115 @@
+"""路由规则文件 / 热加载 / 域名并发上限测试。"""
+
+import asyncio
+import os
+from unittest.mock import AsyncMock
+
+import pytest
+
+from spider.adapters.registry import BUILTIN_ADAPTERS, AdapterRegistry
+from spider.core.router import Router
+from spider.core.routing import DomainLimiter, RoutingFile, load_routing_file
+
+
+def _make_engine(name: str):
+    engine = AsyncMock()
+    engine.name = name
+    return engine
+
+
+def _write(path, text: str, mtime: float) -> None:
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, (mtime, mtime))  # 同一秒内连续写，手动推进 mtime
+
+
+def test_load_toml(tmp_path):
+    path = tmp_path / "routing.toml"
+    path.write_text(
+        '[domains."Example.com"]\nengine = "http"\ndirect = true\ntimeout = 10\nconcurrency = 2\n',
+        encoding="utf-8",
+    )
+    rule = load_routing_file(path)["example.com"]
+    assert (rule.engine, rule.direct, rule.timeout, rule.concurrency) == ("http", True, 10, 2)
+    assert rule.adapter is None
+
+
+@pytest.mark.parametrize("body", [
+    'engine = "curl"',
+    "timeout = 0",
+    "concurrency = true",
+    'direct = "yes"',
+    "retries = 3",
+])
+def test_load_rejects_bad_rule(tmp_path, body):
+    path = tmp_path / "routing.toml"
+    path.write_text(f'[domains."example.com"]\n{body}\n', encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_routing_file(path)
+
+
+def test_hot_reload(tmp_path):
+    """改文件后 Router 下次匹配即生效；写坏的文件不影响已生效的规则。"""
+    path = tmp_path / "routing.toml"
+    _write(path, '[domains."example.com"]\nengine = "http"\n', 1000)
+    routing = RoutingFile(path, check_interval=0)
+    router = Router(default_engine=_make_engine("crawl4ai"), http_engine=_make_engine("http"), routing=routing)
+
+    engines, _ = router.plan("https://blog.example.com/post")
+    assert [e.name for e in engines] == ["http", "crawl4ai"]
+
+    _write(path, '[domains."example.com"]\nengine = "browser"\ndirect = true\n', 2000)
+    engines, _ = router.plan("https://blog.example.com/post")
+    assert [e.name for e in engines] == ["crawl4ai"]
+    assert router.needs_direct("https://example.com/")
+
+    _write(path, "[domains\n", 3000)
+    assert router.needs_direct("https://example.com/")
+    assert routing.version == 2
+
+
+def test_rule_overrides_builtin_and_adapter(tmp_path):
+    """文件规则覆盖内置集合，钉死的引擎优先于适配器偏好；按名字绑定注册表里的适配器。"""
+    path = tmp_path / "routing.toml"
+    path.write_text(
+        '[domains."wikipedia.org"]\ndirect = false\nengine = "browser"\n'
+        '[domains."mirror.example.org"]\nadapter = "wikipedia"\ntimeout = 5\nconcurrency = 3\n',
+        encoding="utf-8",
+    )
+    router = Router(
+        default_engine=_make_engine("crawl4ai"),
+        http_engine=_make_engine("http"),
+        registry=AdapterRegistry(BUILTIN_ADAPTERS),
+        routing=RoutingFile(path),
+    )
+
+    assert not router.needs_direct("https://de.wikipedia.org/wiki/Python")
+    engines, adapter = router.plan("https://de.wikipedia.org/wiki/Python")
+    assert adapter.name == "wikipedia"
+    assert [e.name for e in engines] == ["crawl4ai"]
+
+    _, adapter = router.route("https://a.mirror.example.org/wiki/Python")
+    assert adapter.name == "wikipedia"
+    assert router.timeout("https://a.mirror.example.org/") == 5
+    assert router.concurrency("https://a.mirror.example.org/") == ("mirror.example.org", 3)
+    assert router.timeout("https://example.org/") is None
+
+
+@pytest.mark.asyncio
+async def test_domain_limiter():
+    limiter = DomainLimiter()
+    running = peak = 0
+
+    async def job(domain):
+        nonlocal running, peak
+        async with limiter.slot(domain, 2):
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(job("example.com") for _ in range(6)))
+    assert peak == 2
+
+    # 没有上限时不排队
+    async with limiter.slot(None, None):
+        pass
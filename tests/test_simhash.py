@@ -0,0 +1,46 @@
+"""SimHash 指纹测试。"""
+
+from spider.core.result import CrawlResult
+from spider.core.simhash import BANDS, bands, hamming, max_distance, result_simhash, simhash, similarity, with_simhash
+
+ARTICLE = " ".join(
+    f"Paragraph {i} of the wire story reports that central banks kept interest rates unchanged this week."
+    for i in range(40)
+)
+
+
+def test_identical_and_empty():
+    assert simhash(ARTICLE) == simhash(ARTICLE)
+    assert simhash("") == 0
+    assert similarity(simhash(ARTICLE), simhash(ARTICLE)) == 1.0
+
+
+def test_near_duplicate_is_close():
+    variant = ARTICLE.replace("Paragraph 17", "Paragraph seventeen") + " Updated 10:42 UTC. Related: markets wrap."
+    assert hamming(simhash(ARTICLE), simhash(variant)) <= 3
+
+
+def test_unrelated_is_far():
+    other = " ".join(f"Recipe step {i}: whisk the eggs with sugar and fold in the flour gently." for i in range(40))
+    assert hamming(simhash(ARTICLE), simhash(other)) > 10
+
+
+def test_cjk_tokens():
+    text = "央行本周维持利率不变，市场预期年内降息一次。" * 10
+    assert hamming(simhash(text), simhash(text + "更新于十点")) <= 3
+
+
+def test_bands_pigeonhole():
+    fp = simhash(ARTICLE)
+    flipped = fp ^ (1 << 3) ^ (1 << 20) ^ (1 << 40)  # 3 位不同，至少一段完全相同
+    assert len(bands(fp)) == BANDS
+    assert set(bands(fp)) & set(bands(flipped))
+
+
+def test_threshold_and_result_helpers():
+    assert max_distance(0.95) == 3
+    assert max_distance(1.0) == 0
+    result = with_simhash(CrawlResult(url="https://a.com", markdown=ARTICLE))
+    assert result.metadata["simhash"] == f"{simhash(ARTICLE):016x}"
+    assert result_simhash(result) == simhash(ARTICLE)
+    assert "simhash" not in with_simhash(CrawlResult(url="https://a.com")).metadata
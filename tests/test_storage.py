@@ -1,7 +1,8 @@
 """SQLite 存储层测试。"""
 
 import tempfile
-from datetime import datetime, timedelta, timezone
+from concurrent.futures import Future
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
 import pytest
@@ -30,13 +31,24 @@ class TestSave:
         row_id = storage.save(result)
         assert row_id > 0
 
-    def test_save_creates_file(self, storage, tmp_path):
+    def test_save_creates_file(self, tmp_path):
+        """blobs=False：每个版本一个 pages/YYYY-MM/*.md。"""
+        storage = SpiderStorage(tmp_path / "test.db", tmp_path / "pages", blobs=False)
         result = _make_result(markdown="# Hello World")
         storage.save(result)
         # 检查 pages 目录有文件
         pages = list((tmp_path / "pages").rglob("*.md"))
         assert len(pages) == 1
         assert "Hello World" in pages[0].read_text()
+        assert storage.load_content(storage.recent(1)[0]) == "# Hello World"
+        storage.close()
+
+    def test_save_creates_blob(self, storage, tmp_path):
+        """默认：正文进 blobs/ 段文件，不再一页一个文件。"""
+        storage.save(_make_result(markdown="# Hello World"))
+        assert not list(tmp_path.rglob("*.md"))
+        assert list((tmp_path / "blobs").glob("seg-*.blob"))
+        assert storage.load_content(storage.recent(1)[0]) == "# Hello World"
 
     def test_duplicate_skipped(self, storage):
         """相同 URL + 相同 content_hash 不重复插入。"""
@@ -117,7 +129,7 @@ class TestCache:
         """过期缓存返回 None。"""
         result = _make_result(markdown="old")
         # 手动设一个过去的时间
-        result.crawled_at = datetime.now(timezone.utc) - timedelta(hours=2)
+        result.crawled_at = datetime.now(UTC) - timedelta(hours=2)
         storage.save(result)
         cached = storage.get_cached("https://example.com", max_age_seconds=3600)
         assert cached is None
@@ -137,3 +149,328 @@ class TestCount:
         storage.save(_make_result(url="https://a.com", markdown="a"))
         storage.save(_make_result(url="https://b.com", markdown="b"))
         assert storage.count() == 2
+
+
+class TestBatch:
+    def test_save_many_one_transaction(self, storage):
+        results = [
+            _make_result(url="https://a.com", markdown="a"),
+            _make_result(url="https://b.com", markdown="b"),
+            _make_result(url="https://a.com", markdown="a"),  # 同批重复
+        ]
+        ids = storage.save_many(results)
+        assert ids[0] > 0 and ids[1] > 0
+        assert ids[2] == 0
+        assert storage.count() == 2
+
+    def test_wal_mode(self, storage):
+        assert storage._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+class TestCanonical:
+    def test_cache_hit_by_canonical_url(self, storage):
+        storage.save(_make_result(
+            url="https://www.example.com/a/?utm_source=x",
+            canonical_url="https://example.com/a",
+            markdown="shared",
+        ))
+        cached = storage.get_cached("https://example.com/a")
+        assert cached is not None
+        assert cached["url"] == "https://www.example.com/a/?utm_source=x"
+        assert storage.load_content(cached) == "shared"
+
+    def test_canonical_defaults_to_url(self, storage):
+        storage.save(_make_result(url="https://a.com/x", markdown="x"))
+        assert storage.get_by_url("https://a.com/x")[0]["canonical_url"] == "https://a.com/x"
+
+
+    def test_dedupe_by_canonical_url(self, storage):
+        """追踪参数、www.、结尾斜杠不同但内容相同：只存一行。"""
+        ids = storage.save_many([
+            _make_result(url="https://ex.com/a?utm_source=x", markdown="same"),
+            _make_result(url="https://ex.com/a?utm_source=y", markdown="same"),
+            _make_result(url="https://www.ex.com/a/", markdown="same"),
+        ])
+        assert ids[0] > 0 and ids[1:] == [0, 0]
+        assert storage.get_by_url("https://ex.com/a")[0]["canonical_url"] == "https://ex.com/a"
+
+    def test_migrates_url_unique_index(self, tmp_path):
+        """老库的 (url, content_hash) 唯一索引换成规范 URL，重复行合并。"""
+        s = SpiderStorage(tmp_path / "x.db", tmp_path / "pages")
+        s._conn.execute("DROP INDEX idx_pages_canonical_hash")
+        s._conn.execute("CREATE UNIQUE INDEX idx_pages_url_hash ON pages(url, content_hash)")
+        for url in ("https://ex.com/a?utm_source=x", "https://www.ex.com/a/"):
+            s._conn.execute(
+                "INSERT INTO pages (url, canonical_url, content_hash, crawled_at) VALUES (?, ?, 'h', '2026-01-01')",
+                (url, url),
+            )
+        s._conn.commit()
+        s.close()
+
+        s = SpiderStorage(tmp_path / "x.db", tmp_path / "pages")
+        rows = s.get_by_url("https://ex.com/a")
+        assert [(r["url"], r["canonical_url"]) for r in rows] == [("https://ex.com/a?utm_source=x", "https://ex.com/a")]
+        indexes = {r[0] for r in s._conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert "idx_pages_canonical_hash" in indexes and "idx_pages_url_hash" not in indexes
+        s.close()
+
+class TestFullText:
+    def test_ranked_snippets(self, storage):
+        storage.save(_make_result(
+            url="https://a.com/1", title="Async guide",
+            markdown="Intro text. " * 20 + "asyncio event loop explained in depth. " + "More text. " * 20,
+        ))
+        storage.save(_make_result(url="https://a.com/2", title="Other", markdown="asyncio mentioned once"))
+        storage.save(_make_result(url="https://b.com/3", title="Unrelated", markdown="nothing here"))
+
+        hits = storage.search_content("asyncio loop")
+        assert [h["url"] for h in hits] == ["https://a.com/1"]
+        assert "**" in hits[0]["snippet"]
+        assert len(hits[0]["snippet"]) < 400
+
+        hits = storage.search_content("asyncio")
+        assert {h["url"] for h in hits} == {"https://a.com/1", "https://a.com/2"}
+        assert hits[0]["score"] >= hits[1]["score"]
+
+    def test_domain_filter_and_cjk(self, storage):
+        storage.save(_make_result(url="https://zhihu.com/q/1", markdown="关于异步编程的讨论"))
+        storage.save(_make_result(url="https://www.reddit.com/r/1", markdown="异步编程 in Chinese"))
+        assert len(storage.search_content("异步编程")) == 2
+        hits = storage.search_content("异步编程", domain="reddit.com")
+        assert [h["url"] for h in hits] == ["https://www.reddit.com/r/1"]
+        # 短于 3 个字的词走 LIKE 回退
+        hits = storage.search_content("异步", domain="zhihu.com")
+        assert hits and "**异步**" in hits[0]["snippet"]
+
+    def test_backfill_existing_pages(self, tmp_path):
+        s = SpiderStorage(tmp_path / "x.db", tmp_path / "pages")
+        s.save(_make_result(url="https://a.com", markdown="backfilled content"))
+        s._conn.execute("DROP TABLE pages_fts")
+        s.close()
+
+        s = SpiderStorage(tmp_path / "x.db", tmp_path / "pages")
+        assert [h["url"] for h in s.search_content("backfilled")] == ["https://a.com"]
+        s.close()
+
+
+class TestWriter:
+    def test_batches_and_ids(self, storage):
+        from spider.storage.writer import StorageWriter
+
+        calls = []
+        save_many = storage.save_many
+        storage.save_many = lambda results: calls.append(len(results)) or save_many(results)
+
+        writer = StorageWriter(storage, batch_size=50)
+        futures = [writer.submit(_make_result(url=f"https://a.com/{i}", markdown=str(i))) for i in range(120)]
+        dup = writer.submit(_make_result(url="https://a.com/0", markdown="0"))
+        writer.flush()
+
+        assert all(f.result() > 0 for f in futures)
+        assert dup.result() == 0
+        assert sum(calls) == 121
+        assert max(calls) <= 50
+        assert len(calls) < 121  # 攒批，不是一条一个事务
+        assert storage.count() == 120
+        writer.close()
+
+    def test_batch_failure_retries_items(self, storage):
+        from spider.storage.writer import StorageWriter
+
+        save_many = storage.save_many
+
+        def flaky(results):
+            if any(r.url.endswith("/bad") for r in results):
+                raise ValueError("bad row")
+            return save_many(results)
+
+        storage.save_many = flaky
+        writer = StorageWriter(storage, batch_size=50)
+        batch = [(_make_result(url=url, markdown=url), Future()) for url in ("https://a.com/1", "https://a.com/bad", "https://a.com/2")]
+        writer._write(batch)
+        futures = [f for _, f in batch]
+
+        assert futures[0].result() > 0 and futures[2].result() > 0
+        with pytest.raises(ValueError):
+            futures[1].result()
+        assert storage.count() == 2
+        writer.close()
+
+    @pytest.mark.asyncio
+    async def test_asubmit_and_close_flushes(self, tmp_path):
+        from spider.storage.writer import StorageWriter
+
+        writer = StorageWriter(SpiderStorage(tmp_path / "w.db", tmp_path / "pages"), max_queue=2)
+        for i in range(10):
+            await writer.asubmit(_make_result(url=f"https://b.com/{i}", markdown=str(i)))
+        writer.close()
+
+        s = SpiderStorage(tmp_path / "w.db", tmp_path / "pages")
+        assert s.count() == 10
+        s.close()
+        with pytest.raises(RuntimeError):
+            writer.submit(_make_result())
+
+
+def _page(prices: list[int], news: str) -> str:
+    rows = "\n".join(f"- item {i}: {p}" for i, p in enumerate(prices))
+    return f"# Markets\n\nIntro paragraph that does not change.\n\n## Prices\n\n{rows}\n\n## News\n\n{news}\n"
+
+
+class TestVersions:
+    def test_deltas_roundtrip(self, tmp_path):
+        s = SpiderStorage(tmp_path / "v.db", tmp_path / "pages", keyframe_interval=5)
+        url = "https://markets.example.com/live"
+        base = datetime.now(UTC) - timedelta(hours=10)
+        texts = []
+        for i in range(8):
+            text = _page([100 + j + (i if j == 3 else 0) for j in range(40)], f"Headline {i}")
+            texts.append(text)
+            s.save(_make_result(url=url, markdown=text, crawled_at=base + timedelta(hours=i)))
+
+        rows = s.get_by_url(url)
+        assert [s.load_content(r) for r in reversed(rows)] == texts
+        assert s.load_contents(rows) == texts[::-1]
+
+        kinds = [r[0] for r in s._conn.execute("SELECT keyframe FROM page_versions ORDER BY id")]
+        assert kinds == [1, 0, 0, 0, 0, 1, 0, 0]  # 每 5 个版本一个关键帧
+        s.close()
+
+        # 重新打开后还原（不靠内存里的最新版本缓存）
+        s = SpiderStorage(tmp_path / "v.db", tmp_path / "pages", keyframe_interval=5)
+        assert s.load_content(s.get_by_url(url, limit=1)[0]) == texts[-1]
+        s.close()
+
+    def test_changes_by_url_and_domain(self, storage):
+        url = "https://markets.example.com/live"
+        t0 = datetime.now(UTC) - timedelta(hours=3)
+        storage.save(_make_result(url=url, markdown=_page([1, 2, 3], "Old story"), crawled_at=t0))
+        storage.save(_make_result(url=url, markdown=_page([1, 5, 3], "Old story"), crawled_at=t0 + timedelta(hours=1)))
+        storage.save(_make_result(url=url, markdown=_page([1, 5, 3], "New story"), crawled_at=t0 + timedelta(hours=2)))
+
+        changes = storage.changes(url)
+        assert len(changes) == 2
+        latest, earlier = changes
+        assert latest["sections"] == [{"section": "## News", "added": ["New story"], "removed": ["Old story"]}]
+        assert earlier["sections"] == [{"section": "## Prices", "added": ["- item 1: 5"], "removed": ["- item 1: 2"]}]
+        assert latest["previous_hash"] == earlier["content_hash"]
+
+        assert storage.changes("markets.example.com") == changes
+        assert len(storage.changes(url, since=t0 + timedelta(minutes=90))) == 1
+        assert storage.changes("https://other.example.com/") == []
+
+    def test_revert_is_a_change(self, storage):
+        url = "https://markets.example.com/live"
+        t0 = datetime.now(UTC) - timedelta(hours=3)
+        a, b, c = (_page([1, 2, 3], "Story A"), _page([1, 2, 3], "Story B"), _page([1, 2, 3], "Story C"))
+        for i, text in enumerate((a, b, a, c)):
+            storage.save(_make_result(url=url, markdown=text, crawled_at=t0 + timedelta(hours=i)))
+
+        changes = storage.changes(url)
+        assert [ch["sections"][0]["added"] for ch in changes] == [["Story C"], ["Story A"], ["Story B"]]
+        assert changes[0]["previous_hash"] == changes[1]["content_hash"]
+        assert storage.count() == 3
+
+    def test_file_mode_has_no_versions(self, tmp_path):
+        s = SpiderStorage(tmp_path / "f.db", tmp_path / "pages", blobs=False)
+        s.save(_make_result(markdown="a"))
+        s.save(_make_result(markdown="b"))
+        assert s.changes("https://example.com") == []
+        s.close()
+
+
+WIRE = " ".join(f"Sentence {i} of the syndicated wire story about the rate decision." for i in range(60))
+
+
+class TestNearDuplicates:
+    def test_link_mode(self, storage):
+        first = storage.save(_make_result(url="https://a.com/story", markdown=WIRE + " Published 09:00."))
+        storage.save(_make_result(url="https://b.com/copy", markdown=WIRE + " Published 09:05. Related: more."))
+        storage.save(_make_result(url="https://c.com/other", markdown="An unrelated page about gardening. " * 20))
+
+        copy = storage.get_by_url("https://b.com/copy")[0]
+        assert copy["metadata"]["near_duplicate_of"]["id"] == first
+        assert copy["metadata"]["near_duplicate_of"]["url"] == "https://a.com/story"
+        assert "near_duplicate_of" not in storage.get_by_url("https://c.com/other")[0]["metadata"]
+
+        similar = storage.near_duplicates_of("https://a.com/story")
+        assert [r["url"] for r in similar] == ["https://b.com/copy"]
+        assert similar[0]["distance"] <= 3
+
+    def test_skip_mode(self, tmp_path):
+        s = SpiderStorage(tmp_path / "n.db", tmp_path / "pages", near_duplicates="skip")
+        assert s.save(_make_result(url="https://a.com/story", markdown=WIRE + " Published 09:00."))
+        assert s.save(_make_result(url="https://b.com/copy", markdown=WIRE + " Published 09:05.")) == 0
+        assert s.count() == 1
+        s.close()
+
+    def test_new_version_of_same_url_not_a_duplicate(self, tmp_path):
+        """同一 URL 的小改动是新版本：skip 模式照样保存，link 模式不指向自己的旧版本，变更流照常有记录。"""
+        for mode in ("skip", "link"):
+            s = SpiderStorage(tmp_path / f"{mode}.db", tmp_path / mode / "pages", near_duplicates=mode)
+            assert s.save(_make_result(url="https://q.com/quote", markdown=WIRE + " Price 101."))
+            assert s.save(_make_result(url="https://q.com/quote", markdown=WIRE + " Price 102."))
+            assert "near_duplicate_of" not in s.get_by_url("https://q.com/quote")[0]["metadata"]
+            assert len(s.changes("https://q.com/quote")) == 1
+            assert s.near_duplicates_of("https://q.com/quote") == []
+            s.close()
+
+    def test_off_and_invalid_mode(self, tmp_path):
+        s = SpiderStorage(tmp_path / "o.db", tmp_path / "pages", near_duplicates="off")
+        s.save(_make_result(url="https://a.com/story", markdown=WIRE))
+        s.save(_make_result(url="https://b.com/copy", markdown=WIRE + " extra"))
+        assert "near_duplicate_of" not in s.get_by_url("https://b.com/copy")[0]["metadata"]
+        s.close()
+        with pytest.raises(ValueError):
+            SpiderStorage(tmp_path / "x.db", tmp_path / "pages", near_duplicates="maybe")
+
+
+ARTICLE_HTML = (
+    "<html><head><title>Rate decision</title></head><body><nav>Home | World</nav><article>"
+    + "".join(f"<p>Paragraph {i}: the central bank held rates steady and signalled patience on cuts.</p>" for i in range(12))
+    + "</article><footer>Copyright</footer></body></html>"
+)
+
+
+class TestReextract:
+    def test_keep_html(self, tmp_path):
+        s = SpiderStorage(tmp_path / "h.db", tmp_path / "pages", keep_html=True)
+        s.save(_make_result(url="https://a.com/1", markdown="old", html=ARTICLE_HTML))
+        s.save(_make_result(url="https://a.com/2", markdown="no html"))
+        assert s.load_html(s.get_by_url("https://a.com/1")[0]) == ARTICLE_HTML
+        assert s.load_html(s.get_by_url("https://a.com/2")[0]) == ""
+        assert [len(batch) for batch in s.iter_html(batch_size=1)] == [1]
+        s.close()
+
+        s = SpiderStorage(tmp_path / "n.db", tmp_path / "pages")  # 默认不存 HTML
+        s.save(_make_result(url="https://a.com/1", markdown="old", html=ARTICLE_HTML))
+        assert s.load_html(s.get_by_url("https://a.com/1")[0]) == ""
+        s.close()
+
+    def test_reextract_rewrites_content(self, tmp_path):
+        from spider.storage.reextract import reextract
+
+        s = SpiderStorage(tmp_path / "r.db", tmp_path / "pages", keep_html=True)
+        for i in range(5):
+            s.save(_make_result(url=f"https://news.example.com/{i}", markdown=f"stale extraction {i}", html=ARTICLE_HTML))
+        s.save(_make_result(url="https://other.example.org/x", markdown="untouched", html=ARTICLE_HTML))
+
+        seen = []
+        stats = reextract(s, domain="news.example.com", workers=2, batch_size=2, progress=lambda st: seen.append(st.pages))
+        assert stats.pages == 5
+        assert stats.updated == 5
+        assert stats.failed == 0
+        assert seen == [2, 4, 5]
+
+        row = s.get_by_url("https://news.example.com/3")[0]
+        content = s.load_content(row)
+        assert "central bank held rates steady" in content
+        assert "stale extraction" not in content
+        assert row["metadata"]["simhash"]
+        assert row["char_count"] == len(content)
+        assert [h["url"] for h in s.search_content("stale extraction")] == []
+        assert s.load_content(s.get_by_url("https://other.example.org/x")[0]) == "untouched"
+
+        # 再跑一遍，结果相同，不再改写
+        assert reextract(s, domain="news.example.com", workers=1).updated == 0
+        s.close()
@@ -0,0 +1,104 @@
+"""结构化元数据提取测试。"""
+
+import json
+
+from spider.core.structured import extract_structured, is_complete
+
+BODY = "First paragraph of the story.\n\nSecond paragraph."
+
+
+def _page(head: str = "", body: str = "") -> str:
+    return f"<html><head>{head}</head><body>{body}</body></html>"
+
+
+def _ld(obj) -> str:
+    return f'<script type="application/ld+json">{json.dumps(obj)}</script>'
+
+
+def test_json_ld_article():
+    html = _page(_ld({
+        "@context": "https://schema.org", "@type": "NewsArticle",
+        "headline": "Fed holds rates", "datePublished": "2026-03-18T14:00:00-04:00",
+        "author": [{"@type": "Person", "name": "Jane Doe"}, {"@type": "Person", "name": "John Roe"}],
+        "publisher": {"@type": "Organization", "name": "Example News"},
+        "articleSection": "Markets", "keywords": "fed, rates", "articleBody": BODY,
+    }))
+    meta = extract_structured(html)
+    assert meta["title"] == "Fed holds rates"
+    assert meta["author"] == "Jane Doe; John Roe"
+    assert meta["date"] == "2026-03-18"
+    assert meta["sitename"] == "Example News"
+    assert meta["categories"] == ["Markets"]
+    assert meta["tags"] == ["fed", "rates"]
+    assert meta["article_body"] == BODY
+    assert meta["sources"] == ["json-ld"]
+    assert is_complete(meta)
+
+
+def test_json_ld_graph_prefers_article():
+    html = _page(_ld({"@graph": [
+        {"@type": "WebSite", "name": "Blog Site"},
+        {"@type": "WebPage", "name": "Page name"},
+        {"@type": ["BlogPosting"], "headline": "Post title", "author": "Ann"},
+    ]}))
+    meta = extract_structured(html)
+    assert meta["title"] == "Post title"
+    assert meta["sitename"] == "Blog Site"  # 文章没写 publisher，取 WebSite 名
+
+
+def test_json_ld_article_body_shapes():
+    paragraphs = {"@type": "Article", "headline": "T", "articleBody": ["First.", " ", "Second."]}
+    assert extract_structured(_page(_ld(paragraphs)))["article_body"] == "First.\n\nSecond."
+    nested = {"@type": "Article", "headline": "T", "articleBody": {"@type": "Text", "text": "x"}}
+    meta = extract_structured(_page(_ld(nested)))
+    assert "article_body" not in meta
+    assert meta["title"] == "T"  # 其他字段照常保留
+
+
+def test_opengraph_and_meta_fallback():
+    html = _page(
+        '<meta property="og:title" content="OG &amp; title">'
+        "<meta property='og:site_name' content='Site'>"
+        '<meta name="author" content="Ann Author">'
+        '<meta property="article:author" content="https://example.com/ann">'
+        '<meta property="article:published_time" content="2025-01-02T03:04:05Z">'
+        '<meta property="article:tag" content="a"><meta property="article:tag" content="b">'
+        '<meta name="description" content="Desc">'
+    )
+    meta = extract_structured(html)
+    assert meta["title"] == "OG & title"
+    assert meta["sitename"] == "Site"
+    assert meta["author"] == "Ann Author"
+    assert meta["date"] == "2025-01-02"
+    assert meta["tags"] == ["a", "b"]
+    assert meta["sources"] == ["meta"]
+
+
+def test_microdata():
+    html = _page(body=(
+        '<article itemscope itemtype="https://schema.org/Article">'
+        '<h1 itemprop="headline">Micro <em>title</em></h1>'
+        '<span itemprop="author" itemscope><span itemprop="name">Ann</span></span>'
+        '<time itemprop="datePublished" datetime="2024-05-06">May 6</time></article>'
+    ))
+    meta = extract_structured(html)
+    assert meta["title"] == "Micro title"
+    assert meta["author"] == "Ann"
+    assert meta["date"] == "2024-05-06"
+
+
+def test_priority_and_invalid_json():
+    html = _page(
+        '<script type="application/ld+json">{not json</script>'
+        + _ld({"@type": "Article", "headline": "LD title"})
+        + '<meta property="og:title" content="OG title"><meta property="og:site_name" content="Site">'
+    )
+    meta = extract_structured(html)
+    assert meta["title"] == "LD title"
+    assert meta["sitename"] == "Site"
+    assert meta["sources"] == ["json-ld", "meta"]
+    assert not is_complete(meta)
+
+
+def test_no_structured_data():
+    assert extract_structured("<html><body><p>hi</p></body></html>") == {}
@@ -0,0 +1,43 @@
+"""URL 规范化测试。"""
+
+import pytest
+
+from spider.core.urls import Canonicalizer, canonicalize_url
+
+
+@pytest.mark.parametrize(("url", "expected"), [
+    ("https://example.com/a", "https://example.com/a"),
+    ("HTTPS://WWW.Example.COM/a/", "https://example.com/a"),
+    ("https://example.com", "https://example.com/"),
+    ("https://example.com:443/a", "https://example.com/a"),
+    ("http://example.com:8080/a", "http://example.com:8080/a"),
+    ("https://example.com/a#comments", "https://example.com/a"),
+    ("https://example.com/a?b=2&a=1", "https://example.com/a?a=1&b=2"),
+    ("https://example.com/a?utm_source=x&utm_medium=y&id=3&fbclid=z", "https://example.com/a?id=3"),
+    ("https://example.com/a?tag=x&tag=a", "https://example.com/a?tag=x&tag=a"),
+    ("https://example.com/app#/inbox", "https://example.com/app#/inbox"),
+])
+def test_canonicalize(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+def test_same_page_variants_collapse():
+    variants = [
+        "https://www.bbc.co.uk/news/world-123?utm_campaign=share#top",
+        "https://bbc.co.uk/news/world-123/",
+        "https://BBC.co.uk/news/world-123?utm_source=twitter&utm_medium=social",
+    ]
+    canon = Canonicalizer()
+    assert {canon(u) for u in variants} == {"https://bbc.co.uk/news/world-123"}
+
+
+def test_allowlist_per_domain():
+    canon = Canonicalizer({"youtube.com": ["v", "list"]})
+    assert canon("https://m.youtube.com/watch?v=abc&t=30s&feature=share") == "https://m.youtube.com/watch?v=abc"
+    # 未配置白名单的域名只去追踪参数
+    assert canon("https://example.com/watch?v=abc&t=30s") == "https://example.com/watch?t=30s&v=abc"
+
+
+def test_non_http_untouched():
+    assert canonicalize_url("data:text/html,<p>hi</p>") == "data:text/html,<p>hi</p>"
+    assert canonicalize_url("https://example.com:notaport/") == "https://example.com:notaport/"